@@ -0,0 +1,325 @@
+"""
+Persistent letter-position index over the answers in words.db.
+
+Distinct answers are grouped into buckets by (category, length). Each bucket stores its words
+(later additions as separate chunks) and, for every (position, letter), a bitset with bit i set when word i has that letter there;
+position ANYWHERE holds "contains the letter" bitsets used to narrow anagram lookups.
+The tables live in words.db next to `word_questions` and are brought up to date incrementally:
+only rows with an id above the last indexed one are read, and only the bitsets of the
+(position, letter) pairs their words use are rewritten.
+"""
+import threading
+from collections import Counter
+from sqlalchemy import (Column, Integer, String, LargeBinary, Text, select, delete, insert, inspect, table, column,
+                        func, tuple_)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+ANYWHERE = -1
+WILDCARDS = "?_."
+
+_word_questions = table('word_questions', column('id'), column('answer'), column('category'))
+
+
+class AnswerBucket(Base):
+    __tablename__ = 'answer_buckets'
+
+    category = Column(String, primary_key=True)
+    length = Column(Integer, primary_key=True)
+    words = Column(Text, nullable=False)
+    size = Column(Integer)
+
+
+class AnswerWordChunk(Base):
+    """Words appended to a bucket after it was created, starting at word number `first`."""
+    __tablename__ = 'answer_word_chunks'
+
+    category = Column(String, primary_key=True)
+    length = Column(Integer, primary_key=True)
+    first = Column(Integer, primary_key=True)
+    words = Column(Text, nullable=False)
+
+
+class AnswerLetterBits(Base):
+    __tablename__ = 'answer_letter_bits'
+
+    category = Column(String, primary_key=True)
+    length = Column(Integer, primary_key=True)
+    position = Column(Integer, primary_key=True)
+    letter = Column(String, primary_key=True)
+    bits = Column(LargeBinary, nullable=False)
+
+
+class AnswerIndexState(Base):
+    __tablename__ = 'answer_index_state'
+
+    id = Column(Integer, primary_key=True)
+    last_id = Column(Integer, nullable=False)
+
+
+def normalize_answer(answer):
+    """Returns the form answers are indexed under: lowercase, surrounding whitespace removed."""
+    return answer.strip().lower()
+
+
+def _to_bytes(bits):
+    return bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+
+def _from_bytes(data):
+    return int.from_bytes(data, 'little')
+
+
+class _Bucket:
+    """Words of one (category, length) bucket and their letter bitsets."""
+    __slots__ = ('words', 'positions', 'bits')
+
+    def __init__(self, words, bits):
+        self.words = words
+        self.positions = {word: i for i, word in enumerate(words)}
+        self.bits = bits
+
+    def extend(self, words):
+        """
+        Appends the words not yet in the bucket; returns how many were added.
+
+        Bitsets for the new words are built one letter column at a time: the column is
+        translated to a string of '0'/'1' digits and parsed with int(..., 2), which keeps
+        the per-word work in C and avoids OR-ing single bits into large ints.
+        """
+        offset = len(self.words)
+        new_words = []
+        for word in words:
+            if word not in self.positions:
+                self.positions[word] = offset + len(new_words)
+                new_words.append(word)
+        if not new_words:
+            return 0
+        self.words.extend(new_words)
+
+        contains = {}
+        for pos in range(len(new_words[0])):
+            column = "".join(word[pos] for word in new_words)
+            letters = set(column)
+            zeros = {ord(letter): "0" for letter in letters}
+            for letter in letters:
+                zeros[ord(letter)] = "1"
+                bits = int(column.translate(zeros)[::-1], 2) << offset
+                zeros[ord(letter)] = "0"
+                self.bits[(pos, letter)] = self.bits.get((pos, letter), 0) | bits
+                contains[letter] = contains.get(letter, 0) | bits
+        for letter, bits in contains.items():
+            self.bits[(ANYWHERE, letter)] = self.bits.get((ANYWHERE, letter), 0) | bits
+        return len(new_words)
+
+    @property
+    def all_bits(self):
+        return (1 << len(self.words)) - 1
+
+
+def _ensure_bucket_sizes(conn):
+    """Adds answer_buckets.size to indexes made before it existed and fills it from the word lists."""
+    columns = {column['name'] for column in inspect(conn).get_columns('answer_buckets')}
+    if 'size' not in columns:
+        conn.exec_driver_sql("ALTER TABLE answer_buckets ADD COLUMN size INTEGER")
+        conn.exec_driver_sql(
+            "UPDATE answer_buckets SET size = length(words) - length(replace(words, char(10), '')) + 1")
+
+
+def _load_bucket(conn, category, length):
+    words = conn.execute(select(AnswerBucket.words).where(
+        AnswerBucket.category == category, AnswerBucket.length == length)).scalar()
+    if words is None:
+        return _Bucket([], {})
+    chunks = conn.execute(select(AnswerWordChunk.words).where(
+        AnswerWordChunk.category == category, AnswerWordChunk.length == length).order_by(AnswerWordChunk.first))
+    words = "\n".join([words, *chunks.scalars()])
+    rows = conn.execute(select(AnswerLetterBits.position, AnswerLetterBits.letter, AnswerLetterBits.bits).where(
+        AnswerLetterBits.category == category, AnswerLetterBits.length == length))
+    return _Bucket(words.split("\n"), {(pos, letter): _from_bytes(bits) for pos, letter, bits in rows})
+
+
+def _append_to_bucket(conn, category, length, words):
+    """
+    Adds the words not yet in a bucket; returns how many were added.
+
+    Only the bitsets of the (position, letter) pairs the words use are read and rewritten.
+    A word is already indexed exactly when the AND of its letters' position bitsets is non-zero,
+    so the bucket's word list is never loaded; new words are stored as a chunk of their own.
+    """
+    size = conn.execute(select(AnswerBucket.size).where(
+        AnswerBucket.category == category, AnswerBucket.length == length)).scalar()
+    keys = {(pos, letter) for word in words for pos, letter in enumerate(word)}
+    keys |= {(ANYWHERE, letter) for _, letter in keys}
+    stored = {}
+    if size is not None:
+        rows = conn.execute(select(AnswerLetterBits.position, AnswerLetterBits.letter, AnswerLetterBits.bits).where(
+            AnswerLetterBits.category == category, AnswerLetterBits.length == length,
+            tuple_(AnswerLetterBits.position, AnswerLetterBits.letter).in_(list(keys))))
+        stored = {(pos, letter): _from_bytes(bits) for pos, letter, bits in rows}
+
+    new_words = []
+    for word in words:
+        mask = -1
+        for pos, letter in enumerate(word):
+            mask &= stored.get((pos, letter), 0)
+            if not mask:
+                new_words.append(word)
+                break
+    if not new_words:
+        return 0
+
+    added = _Bucket([], {})
+    added.extend(new_words)
+    offset = size or 0
+    bits = {key: stored.get(key, 0) | (value << offset) for key, value in added.bits.items()}
+    added_text = "\n".join(new_words)
+    if size is None:
+        conn.execute(insert(AnswerBucket), [{"category": category, "length": length, "words": added_text,
+                                             "size": len(new_words)}])
+    else:
+        conn.execute(insert(AnswerWordChunk), [{"category": category, "length": length, "first": size,
+                                                "words": added_text}])
+        conn.execute(AnswerBucket.__table__.update().where(
+            AnswerBucket.category == category, AnswerBucket.length == length).values(size=size + len(new_words)))
+    statement = sqlite_insert(AnswerLetterBits)
+    conn.execute(statement.on_conflict_do_update(
+        index_elements=[AnswerLetterBits.category, AnswerLetterBits.length, AnswerLetterBits.position,
+                        AnswerLetterBits.letter],
+        set_={"bits": statement.excluded.bits}), [
+        {"category": category, "length": length, "position": pos, "letter": letter, "bits": _to_bytes(value)}
+        for (pos, letter), value in bits.items()])
+    return len(new_words)
+
+
+def update_answer_index(conn):
+    """
+    Indexes the `word_questions` rows added since the last update, inside the caller's transaction.
+
+    Args:
+        conn (Connection): A connection to words.db with an open transaction.
+    Returns:
+        int: Number of new distinct answers added to the index.
+    """
+    Base.metadata.create_all(conn)
+    _ensure_bucket_sizes(conn)
+    state = conn.execute(select(AnswerIndexState.last_id).where(AnswerIndexState.id == 1)).scalar()
+    last_id = state or 0
+    max_id = conn.execute(select(func.max(_word_questions.c.id))).scalar() or 0
+    if max_id <= last_id:
+        return 0
+
+    new_words = {}
+    rows = conn.execute(select(_word_questions.c.category, _word_questions.c.answer).where(
+        _word_questions.c.id > last_id, _word_questions.c.id <= max_id))
+    for category, answer in rows:
+        word = normalize_answer(answer)
+        if word and "\n" not in word:
+            new_words.setdefault((category, len(word)), set()).add(word)
+
+    added = 0
+    for (category, length), words in new_words.items():
+        added += _append_to_bucket(conn, category, length, sorted(words))
+
+    if state is None:
+        conn.execute(insert(AnswerIndexState), [{"id": 1, "last_id": max_id}])
+    else:
+        conn.execute(AnswerIndexState.__table__.update().where(AnswerIndexState.id == 1).values(last_id=max_id))
+    return added
+
+
+def rebuild_answer_index(conn):
+    """Drops the index and builds it again from every `word_questions` row; for removed or edited rows."""
+    Base.metadata.create_all(conn)
+    for model in (AnswerBucket, AnswerWordChunk, AnswerLetterBits, AnswerIndexState):
+        conn.execute(delete(model))
+    return update_answer_index(conn)
+
+
+class AnswerIndex:
+    """
+    In-memory view of the persisted index answering pattern and anagram queries.
+
+    Buckets are read from words.db on first use and kept until `invalidate` is called,
+    so a query costs a few big-int ANDs plus one pass over the matching bits.
+    """
+    def __init__(self, get_bind):
+        """
+        Args:
+            get_bind (callable): Returns the words.db engine; called on the first bucket load.
+        """
+        self._get_bind = get_bind
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Forgets the loaded buckets; called after the question bank changes."""
+        with self._lock:
+            self._buckets.clear()
+
+    def _bucket(self, category, length):
+        key = (category, length)
+        with self._lock:
+            bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._get_bind().connect() as conn:
+                bucket = _load_bucket(conn, category, length)
+            with self._lock:
+                bucket = self._buckets.setdefault(key, bucket)
+        return bucket
+
+    def match(self, pattern, category, limit=None):
+        """
+        Returns answers matching a pattern such as "c?s?le", in index order.
+
+        Args:
+            pattern (str): One character per letter; '?', '_' and '.' match any letter.
+            category (str): Language of the answers, e.g. "en" or "pl".
+            limit (int, optional): Maximum number of answers to return.
+        """
+        pattern = normalize_answer(pattern)
+        bucket = self._bucket(category, len(pattern))
+        mask = bucket.all_bits
+        for pos, letter in enumerate(pattern):
+            if letter not in WILDCARDS:
+                mask &= bucket.bits.get((pos, letter), 0)
+                if not mask:
+                    return []
+        return self._words(bucket, mask, limit)
+
+    def count(self, pattern, category):
+        """Returns the number of answers matching `pattern` without materializing them."""
+        pattern = normalize_answer(pattern)
+        bucket = self._bucket(category, len(pattern))
+        mask = bucket.all_bits
+        for pos, letter in enumerate(pattern):
+            if letter not in WILDCARDS:
+                mask &= bucket.bits.get((pos, letter), 0)
+        return bin(mask).count("1")
+
+    def anagrams(self, letters, category, limit=None):
+        """Returns answers spelled with exactly the given letters, e.g. anagrams("tsalec", "en")."""
+        letters = normalize_answer(letters)
+        bucket = self._bucket(category, len(letters))
+        mask = bucket.all_bits
+        for letter in set(letters):
+            mask &= bucket.bits.get((ANYWHERE, letter), 0)
+            if not mask:
+                return []
+        wanted = Counter(letters)
+        found = [word for word in self._words(bucket, mask) if Counter(word) == wanted]
+        return found[:limit] if limit is not None else found
+
+    @staticmethod
+    def _words(bucket, mask, limit=None):
+        # Scanning the reversed binary string with str.find stays linear in the bucket size,
+        # unlike clearing the lowest set bit of a large int once per hit.
+        digits = bin(mask)[:1:-1]
+        words = []
+        i = digits.find("1")
+        while i >= 0 and (limit is None or len(words) < limit):
+            words.append(bucket.words[i])
+            i = digits.find("1", i + 1)
+        return words
@@ -0,0 +1,67 @@
+"""
+Answer normalization and typo-tolerant comparison.
+
+Answers are compared by key: casefolded, NFKD-decomposed with combining marks removed and
+whitespace collapsed, so "Łódź", "lodz" and " LODZ " all match. Keys of stored questions are
+computed once at import (WordQuestion.answer_key); only the typed answer is normalized per check.
+"""
+import unicodedata
+from functools import lru_cache
+
+# Letters NFKD leaves intact because they are not a base letter plus a combining mark.
+_LETTER_FOLDS = str.maketrans({
+    "ł": "l", "Ł": "l",
+    "đ": "d", "Đ": "d",
+    "ø": "o", "Ø": "o",
+    "ħ": "h", "Ħ": "h",
+    "ı": "i",
+})
+
+
+def normalize_answer_key(text):
+    """Returns the comparison key of an answer: no case, no diacritics, single spaces."""
+    if text.isascii():
+        return " ".join(text.lower().split())
+    decomposed = unicodedata.normalize("NFKD", text.translate(_LETTER_FOLDS).casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.split())
+
+
+@lru_cache(maxsize=4096)
+def cached_answer_key(text):
+    """normalize_answer_key for questions that carry no precomputed key."""
+    return normalize_answer_key(text)
+
+
+def within_edit_distance(a, b, max_distance):
+    """
+    Returns True if the Levenshtein distance between `a` and `b` is at most `max_distance`.
+
+    Only the diagonal band of width 2 * max_distance + 1 is computed, and the scan stops as soon
+    as a whole row exceeds the bound, so a clear mismatch costs O(len * max_distance) or less.
+    """
+    if a == b:
+        return True
+    if max_distance <= 0 or abs(len(a) - len(b)) > max_distance:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    too_far = max_distance + 1
+    width = len(b)
+    previous = [j if j <= max_distance else too_far for j in range(width + 1)]
+    for i, char in enumerate(a, 1):
+        low = max(1, i - max_distance)
+        high = min(width, i + max_distance)
+        current = [too_far] * (width + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_min = current[0]
+        for j in range(low, high + 1):
+            value = min(previous[j - 1] + (char != b[j - 1]), current[j - 1] + 1, previous[j] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return False
+        previous = current
+    return previous[width] <= max_distance
@@ -5,6 +5,9 @@ import string
 from databaseLogic import Session, Player
 import hashlib
 from gameProcess import CrosswordGame
+from questionDraw import get_random_questions
+from dbWorker import run_db_job
+from metrics import timed
 
 FONT_TITLE_AUTH = ("Lucida Console", 30)
 FONT_LABEL_AUTH = ("Lucida Console", 20)
@@ -17,6 +20,34 @@ def hash_password(password):
     """Hashes a given password using SHA256."""
     return hashlib.sha256(password.encode()).hexdigest()
 
+@timed("player_lookup_seconds", "Login and registration lookups")
+def authenticate_player(name, password, login_mode):
+    """
+    Logs a player in or registers a new one. Runs on the DB worker thread.
+
+    Returns:
+        tuple: (player_id, error) where error is a (title, message) pair for an error box, or None on success.
+    """
+    session = Session()
+    try:
+        player = session.query(Player).filter_by(name=name).first()
+        if login_mode:
+            if not player or player.password != hash_password(password):
+                return None, ("Login Failed", "Invalid username or password.")
+            return player.id, None
+
+        if player:
+            return None, ("Error", "Username already taken.")
+        player = Player(name=name, password=hash_password(password))
+        session.add(player)
+        session.commit()
+        return player.id, None
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
 class RegistrationManager:
     """
     Manages player registration/login process for multi-player game setup.
@@ -36,6 +67,8 @@ class RegistrationManager:
         self.pass_entries = [None] * num_players
         self.confirm_entries = [None] * num_players
         self.login_mode = False
+        self.busy = False
+        self.player_ids = {}
 
         self.container = tk.Frame(self.parent, bg=COLOR_BG_AUTH)
         self.container.pack(fill='both', expand=True)
@@ -74,66 +107,79 @@ class RegistrationManager:
     def next_player(self):
         """
         Processes the current player's input (login/registration).
-        Moves to the next player or starts the game if all players are processed.
+        The database check runs on the background DB worker; the result moves to the next player
+        or starts the game once all players are processed.
         """
-        session = Session()
+        if self.busy:
+            return
         name = self.name_entries[self.current_player].get().strip()
         password = self.pass_entries[self.current_player].get().strip()
 
         if not name or not password:
             messagebox.showerror("Error", "Please enter both name and password.")
-            session.close()
             return
 
-        try:
-            if self.login_mode:
-                player = session.query(Player).filter_by(name=name).first()
-                hashed_password = hash_password(password)
-                if not player or player.password != hashed_password:
-                    messagebox.showerror("Login Failed", "Invalid username or password.")
-                    return
-            else:
-                confirm = self.confirm_entries[self.current_player].get().strip()
-                if password != confirm:
-                    messagebox.showerror("Error", "Passwords do not match.")
-                    return
-
-                existing = session.query(Player).filter_by(name=name).first()
-                if existing:
-                    messagebox.showerror("Error", "Username already taken.")
-                    return
-
-                hashed_password = hash_password(password)
-                player = Player(name=name, password=hashed_password)
-                session.add(player)
-                session.commit()
-
-            self.players_data.append((name, password))
-            self.current_player += 1
-
-            if self.current_player < self.num_players:
-                self.show_frame(self.frames[self.current_player])
-            else:
-                messagebox.showinfo("Registration Complete", f"Players: {', '.join(n for n, _ in self.players_data)}")
-                self.finish_registration()
-
-        except Exception as e:
-            messagebox.showerror("Database Error", f"An error occurred: {e}")
-            session.rollback()
-        finally:
-            session.close()
+        if not self.login_mode:
+            confirm = self.confirm_entries[self.current_player].get().strip()
+            if password != confirm:
+                messagebox.showerror("Error", "Passwords do not match.")
+                return
+
+        self.busy = True
+        run_db_job(self.parent, authenticate_player, name, password, self.login_mode,
+                   on_done=lambda checked: self._on_player_checked(name, password, *checked),
+                   on_error=self._on_database_error)
+
+    def _on_player_checked(self, name, password, player_id, error):
+        """Handles the worker's answer for the current player on the Tk thread."""
+        self.busy = False
+        if error:
+            messagebox.showerror(*error)
+            return
+
+        self.players_data.append((name, password))
+        self.player_ids[name] = player_id
+        self.current_player += 1
+
+        if self.current_player < self.num_players:
+            self.show_frame(self.frames[self.current_player])
+        else:
+            messagebox.showinfo("Registration Complete", f"Players: {', '.join(n for n, _ in self.players_data)}")
+            self.finish_registration()
+
+    def _on_database_error(self, e):
+        self.busy = False
+        messagebox.showerror("Database Error", f"An error occurred: {e}")
 
     def finish_registration(self):
-        """Cleans up registration frames and starts the crossword game."""
+        """
+        Draws the questions and then starts the crossword game.
+        Questions are drawn on the DB worker first, so the first draw never blocks the UI,
+        avoiding questions any of the players has already seen. The registration frames stay
+        up until the draw finishes, so a failed draw can still return to the menu.
+        """
+        self.busy = True
+        run_db_job(self.parent, get_random_questions, self.language, self.difficulty,
+                   player_ids=list(self.player_ids.values()), on_done=self._start_game,
+                   on_error=self._on_questions_error)
+
+    def _on_questions_error(self, e):
         self.container.destroy()
+        messagebox.showerror("Database Error", f"Could not load questions: {e}")
+        if self.on_game_finish_callback:
+            self.on_game_finish_callback()
 
+    def _start_game(self, questions):
+        self.container.destroy()
         CrosswordGame(
             self.parent,
             self.players_data,
             self.language,
             self.difficulty,
             self.game_mode,
-            self.on_game_finish_callback
+            self.on_game_finish_callback,
+            questions=questions,
+            player_ids=self.player_ids
         )
 
     def _create_player_frame(self, i, container):
@@ -0,0 +1,270 @@
+"""
+Batch PDF reports for every game and player of a date range, rendered by a process pool.
+
+The parent process only streams report keys (match ids, player ids) out of the games table and
+hands them to the workers in chunks of BATCH_CHUNK, with at most two chunks per worker in flight,
+so memory stays bounded however many games the range holds. Each worker opens its own database
+connection and ReportTemplate once, reads the rows of its chunk with one query, writes every
+report straight to disk and returns only counters.
+
+Run with: python pdfLogic.py batch --since 2026-01-01 --until 2026-02-01 [--match ID ...]
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from sqlalchemy import select, and_, func, literal, or_
+from databaseLogic import Player, Game
+from pdfLogic import PDF, render_game_results
+
+BATCH_CHUNK = 50
+DEFAULT_OUTPUT_DIR = "reports"
+GUEST_NAME = "Guest"
+GAME_KEY = func.coalesce(Game.match_id, literal("row").concat(Game.id))
+
+
+class ReportTemplate:
+    """Header and footer text of one batch plus the settings every document of it shares."""
+    def __init__(self, since=None, until=None):
+        period = f"{since:%Y-%m-%d} - {until:%Y-%m-%d}" if since and until else \
+            f"since {since:%Y-%m-%d}" if since else f"until {until:%Y-%m-%d}" if until else "all games"
+        self.header_text = f"Crossword Game Report ({period})"
+        self.footer_text = f"Generated {datetime.now():%Y-%m-%d %H:%M}"
+
+    def document(self):
+        pdf = _BatchPDF(self)
+        pdf.set_creator("Crossword batch reports")
+        pdf.set_auto_page_break(True, 20)
+        return pdf
+
+
+class _BatchPDF(PDF):
+    def __init__(self, template):
+        super().__init__()
+        self.template = template
+
+    def header(self):
+        self.set_font('Arial', 'B', 15)
+        self.cell(0, 10, self.template.header_text, 0, 1, 'C')
+        self.ln(10)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Arial', 'I', 8)
+        self.cell(0, 10, f'{self.template.footer_text} - Page {self.page_no()}', 0, 0, 'C')
+
+
+def _period_filter(since, until, matches=None):
+    conditions = []
+    if since is not None:
+        conditions.append(Game.played_at >= since)
+    if until is not None:
+        conditions.append(Game.played_at < until)
+    if matches:
+        conditions.append(Game.match_id.in_(matches))
+    return and_(*conditions) if conditions else None
+
+
+def _where(query, condition):
+    return query if condition is None else query.where(condition)
+
+
+def iter_game_keys(conn, since=None, until=None, matches=None):
+    """Yields the key of every game in the range: its match id, or row<id> for games saved before match ids."""
+    query = _where(select(GAME_KEY).group_by(GAME_KEY).order_by(func.min(Game.played_at), GAME_KEY),
+                   _period_filter(since, until, matches))
+    for (key,) in conn.execute(query.execution_options(yield_per=1000)):
+        yield key
+
+
+def iter_player_ids(conn, since=None, until=None, matches=None):
+    """Yields the ids of the players with at least one game in the range."""
+    query = _where(select(Game.player_id).distinct().order_by(Game.player_id), _period_filter(since, until, matches))
+    for (player_id,) in conn.execute(query.execution_options(yield_per=1000)):
+        if player_id is not None:
+            yield player_id
+
+
+_worker = None
+
+
+class _Worker:
+    def __init__(self, db_path, output_dir, since, until, matches):
+        from storage import create_sqlite_engine
+        self.engine = create_sqlite_engine(db_path, pool_size=1, max_overflow=0)
+        self.output_dir = output_dir
+        self.since, self.until, self.matches = since, until, matches
+        self.template = ReportTemplate(since, until)
+
+    def write(self, pdf, *parts):
+        path = os.path.join(self.output_dir, *parts)
+        pdf.output(path)
+        return os.path.getsize(path)
+
+
+def _init_worker(db_path, output_dir, since, until, matches):
+    global _worker
+    _worker = _Worker(db_path, output_dir, since, until, matches)
+
+
+def render_game_chunk(keys):
+    """Writes games/<key>.pdf for every game key, anonymous players shown as guests; returns (reports, bytes)."""
+    worker = _worker
+    match_ids = [key for key in keys if not key.startswith("row")]
+    row_ids = [int(key[3:]) for key in keys if key.startswith("row")]
+    query = select(GAME_KEY, Player.name, Game.score, Game.difficulty, Game.mode, Game.played_at).outerjoin(
+        Player, Player.id == Game.player_id).where(or_(Game.match_id.in_(match_ids), Game.id.in_(row_ids))).order_by(
+        Game.id)
+    games, guests = {}, {}
+    with worker.engine.connect() as conn:
+        for key, name, score, difficulty, mode, played_at in conn.execute(query):
+            game = games.setdefault(key, [{}, difficulty, mode, played_at])
+            if name is None:
+                # Server games are saved without players (see write_game_results); number their seats.
+                guests[key] = guests.get(key, 0) + 1
+                name = f"{GUEST_NAME} {guests[key]}"
+            game[0][name] = score or 0
+    written = 0
+    for key, (scores, difficulty, mode, played_at) in games.items():
+        pdf = worker.template.document()
+        render_game_results(pdf, scores, difficulty, mode, played_at)
+        written += worker.write(pdf, "games", f"game_{key}.pdf")
+    return len(games), written
+
+
+def render_player_chunk(player_ids):
+    """Writes players/player_<id>.pdf with the range's games of every player; returns (reports, bytes)."""
+    worker = _worker
+    condition = Game.player_id.in_(player_ids)
+    period = _period_filter(worker.since, worker.until, worker.matches)
+    if period is not None:
+        condition = and_(condition, period)
+    query = select(Game.player_id, Player.name, Game.played_at, Game.difficulty, Game.mode, Game.score,
+                   Game.match_id).join(Player, Player.id == Game.player_id).where(condition).order_by(
+        Game.player_id, Game.played_at, Game.id)
+    written = reports = 0
+    with worker.engine.connect() as conn:
+        rows = conn.execute(query).all()
+        match_ids = list({row[6] for row in rows if row[6] is not None})
+        top_scores = {}
+        for start in range(0, len(match_ids), 10_000):
+            top_scores.update(conn.execute(select(Game.match_id, func.max(Game.score)).where(
+                Game.match_id.in_(match_ids[start:start + 10_000])).group_by(Game.match_id)).all())
+    start = 0
+    while start < len(rows):
+        end = start
+        while end < len(rows) and rows[end][0] == rows[start][0]:
+            end += 1
+        written += worker.write(_player_report(worker.template, rows[start:end], top_scores),
+                                "players", f"player_{rows[start][0]}.pdf")
+        reports += 1
+        start = end
+    return reports, written
+
+
+def _game_result(score, match_id, top_scores):
+    """Win or Loss by the rule write_game_results uses; unknown for games saved without a match id."""
+    if match_id is None:
+        return None
+    return "Win" if score and score == top_scores.get(match_id) else "Loss"
+
+
+def _player_report(template, rows, top_scores):
+    pdf = template.document()
+    pdf.add_page()
+    name = rows[0][1]
+    results = [_game_result(row[5], row[6], top_scores) for row in rows]
+    wins, losses = results.count("Win"), results.count("Loss")
+    pdf.set_font("Arial", "B", 20)
+    pdf.cell(0, 15, f"Player Report: {name}", 0, 1, "C")
+    pdf.ln(5)
+    pdf.set_font("Arial", "", 12)
+    pdf.cell(0, 8, f"Games: {len(rows)}   Wins: {wins}   Losses: {losses}   "
+                   f"Points: {sum(row[5] or 0 for row in rows)}", 0, 1)
+    pdf.ln(5)
+    widths = [50, 30, 35, 25, 30]
+    pdf.set_font("Arial", "B", 11)
+    for width, title in zip(widths, ("Date", "Difficulty", "Mode", "Score", "Result")):
+        pdf.cell(width, 9, title, 1, 0, "C")
+    pdf.ln()
+    pdf.set_font("Arial", "", 10)
+    for (_, _, played_at, difficulty, mode, score, _), result in zip(rows, results):
+        cells = (f"{played_at:%Y-%m-%d %H:%M}" if played_at else "-", difficulty or "", mode or "",
+                 str(score or 0), result or "-")
+        for width, text in zip(widths, cells):
+            pdf.cell(width, 8, text, 1, 0, "C")
+        pdf.ln()
+    return pdf
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate_batch_reports(db_path, output_dir=DEFAULT_OUTPUT_DIR, since=None, until=None, matches=None,
+                           workers=None, games=True, players=True, progress=None):
+    """
+    Renders per-game and per-player reports for a date range with a process pool.
+
+    Args:
+        db_path (str): players.db file.
+        output_dir (str): Reports go to <output_dir>/games and <output_dir>/players.
+        since (datetime, optional): First played_at included.
+        until (datetime, optional): First played_at excluded.
+        matches (list, optional): Restrict to these match ids, e.g. the games of one tournament.
+        workers (int, optional): Worker processes; defaults to the CPU count.
+        games (bool): Render per-game reports.
+        players (bool): Render per-player reports.
+        progress (callable, optional): Called as progress(reports_done) after each chunk.
+    Returns:
+        dict: reports, bytes, seconds and reports_per_second.
+    """
+    from storage import create_sqlite_engine
+
+    for folder in ("games", "players"):
+        os.makedirs(os.path.join(output_dir, folder), exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    reports = written = 0
+    engine = create_sqlite_engine(db_path, pool_size=1, max_overflow=0)
+    context = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(db_path, output_dir, since, until, matches)) as pool, \
+                engine.connect() as conn:
+            jobs = []
+            if games:
+                jobs.append((render_game_chunk, iter_game_keys(conn, since, until, matches)))
+            if players:
+                jobs.append((render_player_chunk, iter_player_ids(conn, since, until, matches)))
+            in_flight = set()
+            for render, keys in jobs:
+                for chunk in _chunks(keys, BATCH_CHUNK):
+                    if len(in_flight) >= 2 * workers:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            count, size = future.result()
+                            reports += count
+                            written += size
+                        if progress:
+                            progress(reports)
+                    in_flight.add(pool.submit(render, chunk))
+            for future in in_flight:
+                count, size = future.result()
+                reports += count
+                written += size
+    finally:
+        engine.dispose()
+    seconds = time.perf_counter() - started
+    if progress:
+        progress(reports)
+    return {"reports": reports, "bytes": written, "seconds": seconds,
+            "reports_per_second": reports / seconds if seconds else 0.0}
@@ -0,0 +1,1143 @@
+"""
+Performance benchmarks for the crossword game.
+
+Run with: python benchmarks.py <name> [options]
+Each benchmark works on temporary databases and never touches players.db or words.db contents.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.sql.expression import func
+
+
+def _make_question_bank(path, size, ndjson=False):
+    """Writes a synthetic question bank with `size` unique rows."""
+    rng = random.Random(size)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    with open(path, 'w', encoding='utf-8') as file:
+        if not ndjson:
+            file.write("[\n")
+        for i in range(size):
+            item = {
+                "question": f"Synthetic clue number {i}",
+                "answer": ''.join(rng.choice(letters) for _ in range(rng.randint(3, 12))),
+                "difficulty": rng.choice(("Easy", "Medium", "Hard")),
+                "category": rng.choice(("en", "pl")),
+            }
+            separator = "\n" if ndjson else (",\n" if i < size - 1 else "\n")
+            file.write(json.dumps(item, ensure_ascii=False) + separator)
+        if not ndjson:
+            file.write("]\n")
+
+
+def bench_import(sizes, ndjson=False):
+    """Times the bulk JSON importer for growing bank sizes, then re-imports to measure the dedupe path."""
+    from questionsLogic import Base as WordsBase, bulk_import_questions
+
+    print(f"{'rows':>10} {'first s':>9} {'rows/s':>10} {'us/row':>8} {'reimport s':>11} {'inserted':>9}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bank = os.path.join(tmp, "bank.ndjson" if ndjson else "bank.json")
+            _make_question_bank(bank, size, ndjson)
+            bench_engine = create_engine(f"sqlite:///{os.path.join(tmp, 'words.db')}")
+            WordsBase.metadata.create_all(bench_engine)
+
+            first = bulk_import_questions(bank, bind=bench_engine)
+            again = bulk_import_questions(bank, bind=bench_engine)
+            bench_engine.dispose()
+
+        rate = first.read / first.seconds
+        print(f"{size:>10} {first.seconds:>9.3f} {rate:>10.0f} {1e6 / rate:>8.2f} "
+              f"{again.seconds:>11.3f} {first.inserted:>9}")
+
+
+def bench_sync(sizes, changed):
+    """
+    Times the incremental JSON sync: a first sync into an empty database, an unchanged file,
+    a touched but identical file, and `changed` percent of the items edited, removed or added.
+    """
+    from questionsLogic import Base as WordsBase, sync_questions_from_json
+
+    print(f"{'rows':>10} {'first s':>8} {'unchanged ms':>13} {'touched ms':>11} {'edited s':>9} "
+          f"{'ins/upd/del':>18}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bank = os.path.join(tmp, "bank.ndjson")
+            _make_question_bank(bank, size, ndjson=True)
+            bench_engine = create_engine(f"sqlite:///{os.path.join(tmp, 'words.db')}")
+            WordsBase.metadata.create_all(bench_engine)
+
+            first = sync_questions_from_json(bank, bind=bench_engine)
+            unchanged = sync_questions_from_json(bank, bind=bench_engine)
+            os.utime(bank)
+            touched = sync_questions_from_json(bank, bind=bench_engine)
+
+            rng = random.Random(size)
+            with open(bank, encoding="utf-8") as file:
+                lines = file.readlines()
+            edits = max(1, size * changed // 300)
+            for i in rng.sample(range(len(lines)), edits):
+                item = json.loads(lines[i])
+                item["answer"] += "x"
+                lines[i] = json.dumps(item) + "\n"
+            del lines[:edits]
+            lines += [json.dumps({"question": f"Added clue {i}", "answer": "added", "difficulty": "Easy",
+                                  "category": "en"}) + "\n" for i in range(edits)]
+            with open(bank, "w", encoding="utf-8") as file:
+                file.writelines(lines)
+            edited = sync_questions_from_json(bank, bind=bench_engine)
+            bench_engine.dispose()
+
+        print(f"{size:>10} {first.seconds:>8.2f} {unchanged.seconds * 1000:>13.2f} {touched.seconds * 1000:>11.1f} "
+              f"{edited.seconds:>9.2f} {f'{edited.inserted}/{edited.updated}/{edited.deleted}':>18}")
+
+
+def bench_draw(sizes, draws, k):
+    """Compares ORDER BY RANDOM() draws against draws from the in-memory question pool cache."""
+    from sqlalchemy.orm import sessionmaker
+    from questionsLogic import Base as WordsBase, WordQuestion, bulk_import_questions
+    from samplingLogic import QuestionPoolCache
+
+    print(f"{'rows':>10} {'random() ms':>12} {'cached ms':>10} {'first load ms':>14} {'hits':>6} {'misses':>7}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bank = os.path.join(tmp, "bank.json")
+            _make_question_bank(bank, size)
+            bench_engine = create_engine(f"sqlite:///{os.path.join(tmp, 'words.db')}")
+            WordsBase.metadata.create_all(bench_engine)
+            bulk_import_questions(bank, bind=bench_engine)
+            BenchSession = sessionmaker(bind=bench_engine)
+
+            session = BenchSession()
+            started = time.perf_counter()
+            for _ in range(draws):
+                session.query(WordQuestion).filter_by(category="en", difficulty="Easy").order_by(
+                    func.random()).limit(k).all()
+            random_ms = (time.perf_counter() - started) * 1000 / draws
+            session.close()
+
+            def load_pool(language, difficulty):
+                pool_session = BenchSession()
+                try:
+                    return pool_session.query(WordQuestion).filter_by(
+                        category=language, difficulty=difficulty).all()
+                finally:
+                    pool_session.close()
+
+            cache = QuestionPoolCache(load_pool)
+            started = time.perf_counter()
+            cache.pool("en", "Easy")
+            load_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            for _ in range(draws):
+                cache.sample("en", "Easy", k)
+            cached_ms = (time.perf_counter() - started) * 1000 / draws
+            bench_engine.dispose()
+
+        stats = cache.stats()
+        print(f"{size:>10} {random_ms:>12.3f} {cached_ms:>10.4f} {load_ms:>14.2f} "
+              f"{stats['hits']:>6} {stats['misses']:>7}")
+
+
+_PACK_STARTUP_CHILD = """
+import sys, time
+started = time.perf_counter()
+if sys.argv[1] == "bare":
+    from questionPack import QuestionPack
+    QuestionPack(sys.argv[2]).sample("en", "Easy", 10)
+else:
+    import questionDraw
+    questionDraw.get_random_questions("en", "Easy", 10)
+print((time.perf_counter() - started) * 1000, "sqlalchemy" in sys.modules)
+"""
+
+
+def bench_pack(sizes, draws, k, runs):
+    """
+    Compares the binary question pack with the words.db path: cold start to the first draw in a
+    fresh process (JSON sync check plus pool load, versus opening the mapping), and warm draw latency.
+    """
+    import questionsLogic
+    from questionPack import QuestionPack, compile_pack
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=here)
+    env.pop("CROSSWORD_QUESTION_PACK", None)
+
+    def first_draw_ms(cwd, *args, pack=None):
+        child_env = dict(env, CROSSWORD_QUESTION_PACK=pack) if pack else env
+        times = [float(subprocess.run([sys.executable, "-c", _PACK_STARTUP_CHILD, *args], cwd=cwd, env=child_env,
+                                      capture_output=True, text=True, check=True).stdout.split()[-2])
+                 for _ in range(runs)]
+        return sorted(times)[runs // 2]
+
+    print(f"{'rows':>10} {'pack MB':>8} {'db start ms':>12} {'pack start ms':>14} {'bare pack ms':>13} "
+          f"{'db draw us':>11} {'pack draw us':>13}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            _make_question_bank(os.path.join(tmp, questionsLogic.QUESTIONS_JSON_PATH), size)
+            bench_engine = create_engine(f"sqlite:///{os.path.join(tmp, 'words.db')}")
+            questionsLogic.Base.metadata.create_all(bench_engine)
+            questionsLogic.bulk_import_questions(os.path.join(tmp, questionsLogic.QUESTIONS_JSON_PATH),
+                                                 bind=bench_engine)
+            pack_path = os.path.join(tmp, "questions.pack")
+            compile_pack(pack_path, os.path.join(tmp, "words.db"))
+            pack_mb = os.path.getsize(pack_path) / 1e6
+
+            db_start = first_draw_ms(tmp, "db")
+            pack_start = first_draw_ms(tmp, "db", pack=pack_path)
+            bare_start = first_draw_ms(tmp, "bare", pack_path)
+
+            questionsLogic.Session.use_engine(bench_engine)
+            questionsLogic.question_cache.clear()
+            questionsLogic.question_cache.pool("en", "Easy")
+            started = time.perf_counter()
+            for _ in range(draws):
+                questionsLogic.question_cache.sample("en", "Easy", k)
+            db_draw = (time.perf_counter() - started) * 1e6 / draws
+
+            pack = QuestionPack(pack_path)
+            started = time.perf_counter()
+            for _ in range(draws):
+                pack.sample("en", "Easy", k)
+            pack_draw = (time.perf_counter() - started) * 1e6 / draws
+            pack.close()
+            bench_engine.dispose()
+
+        print(f"{size:>10} {pack_mb:>8.1f} {db_start:>12.1f} {pack_start:>14.1f} {bare_start:>13.1f} "
+              f"{db_draw:>11.1f} {pack_draw:>13.1f}")
+
+
+def bench_startup(runs, top):
+    """
+    Launches mainScript with `-X importtime` until the main menu is first drawn (needs a display).
+    Reports wall time, the in-process time to the first menu and the slowest top-level imports.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, CROSSWORD_STARTUP_PROBE="1")
+    walls, probes, cumulative = [], [], {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", "mainScript.py"], cwd=here, env=env,
+                              capture_output=True, text=True, timeout=120)
+        walls.append((time.perf_counter() - started) * 1000)
+        probe = [line for line in proc.stdout.splitlines() if line.startswith("STARTUP_PROBE")]
+        if proc.returncode != 0 or not probe:
+            print(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "mainScript failed")
+            return
+        print(probe[0])
+        probes.append(float(probe[0].split("first_menu_ms=")[1].split()[0]))
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumul_us, name = line[len("import time:"):].split("|")
+            if not name[1:].startswith(" "):
+                cumulative.setdefault(name.strip(), []).append(int(cumul_us))
+
+    print(f"runs: {runs}  wall median: {sorted(walls)[runs // 2]:.1f} ms  "
+          f"first menu median: {sorted(probes)[runs // 2]:.1f} ms")
+    print(f"{'module':<24} {'cumulative ms':>14}")
+    slowest = sorted(cumulative.items(), key=lambda item: -max(item[1]))[:top]
+    for name, values in slowest:
+        print(f"{name:<24} {sorted(values)[len(values) // 2] / 1000:>14.2f}")
+
+
+def _make_players_db(path, size):
+    """Creates a players.db with `size` synthetic players and returns its engine."""
+    from databaseLogic import Base as PlayersBase, Player
+
+    bench_engine = create_engine(f"sqlite:///{path}")
+    PlayersBase.metadata.create_all(bench_engine)
+    rng = random.Random(size)
+    with bench_engine.begin() as conn:
+        batch = []
+        for i in range(size):
+            batch.append({"name": f"{rng.choice('abcdefghijklmnopqrstuvwxyz')}player_{i}", "password": "x",
+                          "games_played": i % 50, "wins": i % 20, "losses": i % 30})
+            if len(batch) == 50_000:
+                conn.execute(Player.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Player.__table__.insert(), batch)
+    return bench_engine
+
+
+def bench_players_list(sizes, pages):
+    """Times what opening and scrolling the virtual players list costs at growing table sizes."""
+    from databaseLogic import Session as PlayersSession
+    from playersLogic import count_players, fetch_players_page
+
+    print(f"{'players':>10} {'first page ms':>14} {'next page ms':>13} {'jump ms':>8} "
+          f"{'search ms':>10} {'count ms':>9}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bench_engine = _make_players_db(os.path.join(tmp, "players.db"), size)
+            PlayersSession.use_engine(bench_engine)
+
+            started = time.perf_counter()
+            rows = fetch_players_page()
+            first_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            for _ in range(pages):
+                if not rows:
+                    break
+                rows = fetch_players_page(after_key=(rows[-1][1], rows[-1][0]))
+            next_ms = (time.perf_counter() - started) * 1000 / pages
+
+            started = time.perf_counter()
+            fetch_players_page(offset=size // 2)
+            jump_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            fetch_players_page(prefix="kplayer_1")
+            search_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            count_players()
+            count_ms = (time.perf_counter() - started) * 1000
+            bench_engine.dispose()
+
+        print(f"{size:>10} {first_ms:>14.2f} {next_ms:>13.2f} {jump_ms:>8.2f} {search_ms:>10.2f} {count_ms:>9.2f}")
+
+
+def bench_players_pdf(sizes, rows_per_volume):
+    """
+    Renders the players list report in a child process (as the UI does) for growing player counts.
+    Reports wall time, rows/s and the child's peak RSS, which stays bounded by the volume size.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    print(f"{'players':>10} {'seconds':>9} {'rows/s':>9} {'files':>6} {'peak RSS MB':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "players.db")
+            _make_players_db(db_path, size).dispose()
+            started = time.perf_counter()
+            proc = subprocess.Popen([sys.executable, os.path.join(here, "pdfLogic.py"), "players", "--db", db_path,
+                                     "--rows-per-volume", str(rows_per_volume)],
+                                    cwd=tmp, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+            output = proc.stdout.read()
+            _, status, usage = os.wait4(proc.pid, 0)
+            seconds = time.perf_counter() - started
+            files = sum(1 for line in output.splitlines() if line.startswith("FILE "))
+        print(f"{size:>10} {seconds:>9.2f} {size / seconds:>9.0f} {files:>6} {usage.ru_maxrss / 1024:>12.1f}")
+
+
+def bench_report_cache(sizes, hits):
+    """
+    Runs the players report as the Players screen does: the first call renders into the report cache,
+    later calls with an unchanged players table return the cached files; one player update forces a re-render.
+    """
+    from databaseLogic import Session as PlayersSession, ensure_change_counters
+    from pdfLogic import cached_players_list_pdf
+    from reportCache import ReportCache, find_players_report
+
+    print(f"{'players':>10} {'render s':>9} {'hit ms':>8} {'after update s':>15} {'cache MB':>9}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bench_engine = _make_players_db(os.path.join(tmp, "players.db"), size)
+            ensure_change_counters(bench_engine)
+            PlayersSession.use_engine(bench_engine)
+            cache = ReportCache(os.path.join(tmp, "report_cache"))
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                cached_players_list_pdf(cache=cache)
+                render_s = time.perf_counter() - started
+
+                started = time.perf_counter()
+                for _ in range(hits):
+                    assert find_players_report(cache=cache)
+                hit_ms = (time.perf_counter() - started) * 1000 / hits
+
+                with bench_engine.begin() as conn:
+                    conn.exec_driver_sql("UPDATE players SET wins = wins + 1 WHERE id = 1")
+                started = time.perf_counter()
+                cached_players_list_pdf(cache=cache)
+                update_s = time.perf_counter() - started
+            cache_mb = sum(entry.stat().st_size for entry in os.scandir(cache.directory)) / 1e6
+            bench_engine.dispose()
+        print(f"{size:>10} {render_s:>9.2f} {hit_ms:>8.2f} {update_s:>15.2f} {cache_mb:>9.1f}")
+
+
+def bench_engine(games, players, questions_per_game):
+    """Plays random headless games through GameEngine and reports games/s and answers/s."""
+    from collections import namedtuple
+    from gameEngine import GameEngine, MODE_FOR_TIME, MODE_TO_MISTAKE
+
+    Question = namedtuple("Question", ["question", "answer"])
+    rng = random.Random(1)
+    bank = [Question(f"clue {i}", f"answer{i}") for i in range(1000)]
+    names = [f"player{i}" for i in range(players)]
+    answers = 0
+    started = time.perf_counter()
+    for game_no in range(games):
+        mode = MODE_FOR_TIME if game_no % 2 else MODE_TO_MISTAKE
+        engine = GameEngine(names, rng.sample(bank, questions_per_game), "Medium", mode)
+        engine.start()
+        while not engine.state.finished:
+            roll = rng.random()
+            if roll < 0.6:
+                engine.submit_answer(engine.current_question.answer)
+            elif roll < 0.9:
+                engine.submit_answer("wrong")
+            else:
+                engine.give_up()
+            engine.tick(5)
+            answers += 1
+    seconds = time.perf_counter() - started
+    print(f"games: {games}  players: {players}  answers: {answers}  seconds: {seconds:.2f}")
+    print(f"games/s: {games / seconds:.0f}  answers/s: {answers / seconds:.0f}")
+
+
+def bench_journal(games, questions_per_game):
+    """Journals headless games: cost per event on the game thread, batching, and replay speed."""
+    from collections import namedtuple
+    from gameEngine import GameEngine, MODE_TO_MISTAKE
+    from gameJournal import EventJournal, GameRecorder, iter_records, player_counters
+
+    Question = namedtuple("Question", ["id", "question", "answer"])
+    rng = random.Random(1)
+    bank = [Question(i, f"clue {i}", f"answer{i}") for i in range(1000)]
+    names = ["ann", "bob"]
+
+    def play(journal):
+        started = time.perf_counter()
+        for _ in range(games):
+            engine = GameEngine(names, rng.sample(bank, questions_per_game), "Medium", MODE_TO_MISTAKE)
+            if journal is not None:
+                GameRecorder(journal, engine, "en", {"ann": 1, "bob": 2})
+            engine.start()
+            while not engine.state.finished:
+                if rng.random() < 0.7:
+                    engine.submit_answer(engine.current_question.answer)
+                else:
+                    engine.give_up()
+        return time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = play(None)
+        journal = EventJournal(tmp)
+        journaled = play(journal)
+        started = time.perf_counter()
+        journal.close()
+        drain = time.perf_counter() - started
+        size = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+        records = journal.records_written
+        print(f"games: {games}  records: {records}  batches: {journal.batches_written}  "
+              f"bytes/record: {size / max(records, 1):.0f}")
+        print(f"game thread: {plain * 1e3 / games:.3f} ms/game plain, {journaled * 1e3 / games:.3f} ms/game "
+              f"journaled ({(journaled - plain) * 1e6 / max(records, 1):.2f} us/record); drain at close {drain * 1e3:.1f} ms")
+        started = time.perf_counter()
+        by_id, _ = player_counters(iter_records(tmp))
+        seconds = time.perf_counter() - started
+        print(f"replay: {records / seconds:.0f} records/s  rebuilt counters: {by_id}")
+
+
+def bench_analytics(outcomes, questions, games):
+    """Per-question analytics: vectorized aggregation at scale, and journal parsing cold vs cached."""
+    import numpy as np
+    from collections import namedtuple
+    from gameEngine import GameEngine, MODE_FOR_TIME
+    from gameJournal import EventJournal, GameRecorder
+    from questionAnalytics import load_outcomes, question_stats
+
+    rng = np.random.default_rng(1)
+    difficulty = rng.random(questions)
+    question_id = rng.integers(1, questions, outcomes)
+    synthetic = {
+        "question_id": question_id,
+        "player_id": rng.integers(1, 100_000, outcomes),
+        "solved": rng.random(outcomes) > difficulty[question_id],
+        "ms": rng.integers(500, 60_000, outcomes).astype(np.int32),
+        "answers": np.ones(outcomes, dtype=np.int16),
+    }
+    started = time.perf_counter()
+    stats = question_stats(synthetic)
+    seconds = time.perf_counter() - started
+    print(f"aggregate: {outcomes} outcomes over {questions} questions in {seconds:.2f} s "
+          f"({outcomes / seconds / 1e6:.1f} M outcomes/s); {int((stats['suggested'] >= 0).sum())} classified")
+
+    Question = namedtuple("Question", ["id", "question", "answer"])
+    bank = [Question(i, f"clue {i}", f"answer{i}") for i in range(2000)]
+    pick = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = EventJournal(tmp)
+        for _ in range(games):
+            engine = GameEngine(["ann", "bob"], pick.sample(bank, 10), "Medium", MODE_FOR_TIME)
+            GameRecorder(journal, engine, "en", {"ann": 1, "bob": 2})
+            engine.start()
+            while not engine.state.finished:
+                roll = pick.random()
+                if roll < 0.6:
+                    engine.submit_answer(engine.current_question.answer)
+                elif roll < 0.8:
+                    engine.submit_answer("wrong")
+                else:
+                    engine.give_up()
+        journal.close()
+        for label in ("cold", "cached"):
+            started = time.perf_counter()
+            loaded = load_outcomes(tmp)
+            seconds = time.perf_counter() - started
+            print(f"journal {label}: {len(loaded['question_id'])} outcomes from {journal.records_written} records "
+                  f"in {seconds * 1000:.0f} ms")
+
+
+def bench_reports(games, players, workers):
+    """Batch per-game and per-player PDF reports with 1 and `workers` processes."""
+    from datetime import datetime, timedelta
+    from databaseLogic import Game
+    from batchReports import generate_batch_reports
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "players.db")
+        bench_engine = _make_players_db(path, players)
+        start = datetime(2026, 1, 1)
+        with bench_engine.begin() as conn:
+            rows = []
+            for game in range(games):
+                for player_id in rng.sample(range(1, players + 1), 2):
+                    rows.append({"player_id": player_id, "score": rng.choice((0, 10, 20, 30)), "difficulty": "Easy",
+                                 "mode": "To mistake", "played_at": start + timedelta(minutes=game),
+                                 "match_id": f"match{game}"})
+            conn.execute(Game.__table__.insert(), rows)
+        bench_engine.dispose()
+        print(f"{'workers':>8} {'reports':>8} {'MB':>6} {'seconds':>8} {'reports/s':>10}")
+        for count in sorted({1, workers}):
+            stats = generate_batch_reports(path, os.path.join(tmp, f"out{count}"), workers=count)
+            print(f"{count:>8} {stats['reports']:>8} {stats['bytes'] / 1e6:>6.1f} {stats['seconds']:>8.2f} "
+                  f"{stats['reports_per_second']:>10.0f}")
+
+
+def bench_grid(banks, sizes, grids):
+    """Generates crosswords from synthetic banks and reports per-grid latency and fill."""
+    from collections import namedtuple
+    from gridLogic import WordIndex, generate_crossword
+
+    Question = namedtuple("Question", ["question", "answer"])
+    letters = "eeeeeeeeeeeetttttttttaaaaaaaaooooooooiiiiiiinnnnnnnsssssshhhhhhrrrrrrddddlllluuucccmmwwffggyypbvk"
+    rng = random.Random(1)
+    for bank_size in banks:
+        bank = [Question(f"clue {i}", "".join(rng.choice(letters) for _ in range(rng.randint(3, 10))))
+                for i in range(bank_size)]
+        started = time.perf_counter()
+        index = WordIndex(bank, max_length=max(sizes))
+        print(f"bank: {bank_size:>8}  index build: {(time.perf_counter() - started) * 1000:.0f} ms")
+        for size in sizes:
+            timings, placed = [], []
+            for seed in range(grids):
+                started = time.perf_counter()
+                crossword = generate_crossword(bank, size=size, seed=seed, index=index)
+                timings.append(time.perf_counter() - started)
+                placed.append(len(crossword.placements))
+            timings.sort()
+            placed.sort()
+            print(f"  {size:>2}x{size:<2}  median: {timings[len(timings) // 2] * 1000:6.1f} ms  "
+                  f"max: {timings[-1] * 1000:6.1f} ms  words: {placed[len(placed) // 2]} (min {placed[0]})")
+
+
+def _pattern_matches(pattern, word):
+    return len(pattern) == len(word) and all(p == "?" or p == c for p, c in zip(pattern, word))
+
+
+def bench_answer_index(sizes, queries):
+    """Compares pattern lookups through the persisted answer index with a full scan of the answers."""
+    from answerIndex import AnswerIndex
+    from questionsLogic import Base as WordsBase, bulk_import_questions
+
+    print(f"{'rows':>10} {'import s':>9} {'+1k rows ms':>12} {'index us':>9} {'scan ms':>9} "
+          f"{'first load ms':>14} {'hits/query':>11}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bank = os.path.join(tmp, "bank.json")
+            _make_question_bank(bank, size)
+            bench_engine = create_engine(f"sqlite:///{os.path.join(tmp, 'words.db')}")
+            WordsBase.metadata.create_all(bench_engine)
+            first = bulk_import_questions(bank, bind=bench_engine)
+
+            extra = os.path.join(tmp, "extra.json")
+            with open(extra, 'w', encoding='utf-8') as file:
+                json.dump([{"question": f"Extra clue {i}", "answer": f"extra{i}", "difficulty": "Easy",
+                            "category": "en"} for i in range(1000)], file)
+            incremental = bulk_import_questions(extra, bind=bench_engine)
+
+            with bench_engine.connect() as conn:
+                answers = sorted({row[0].lower() for row in conn.exec_driver_sql(
+                    "SELECT answer FROM word_questions WHERE category = 'en'")})
+            rng = random.Random(size)
+            patterns = ["".join(c if rng.random() < 0.4 else "?" for c in rng.choice(answers))
+                        for _ in range(queries)]
+
+            index = AnswerIndex(lambda: bench_engine)
+            started = time.perf_counter()
+            index.match("?", "en")
+            for length in range(3, 13):
+                index.match("?" * length, "en", limit=1)
+            load_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            hits = sum(len(index.match(pattern, "en")) for pattern in patterns)
+            index_us = (time.perf_counter() - started) * 1e6 / queries
+
+            scans = max(1, queries // 20)
+            started = time.perf_counter()
+            with bench_engine.connect() as conn:
+                for pattern in patterns[:scans]:
+                    rows = conn.exec_driver_sql("SELECT answer FROM word_questions WHERE category = 'en'")
+                    sum(1 for (answer,) in rows if _pattern_matches(pattern, answer.lower()))
+            scan_ms = (time.perf_counter() - started) * 1000 / scans
+            bench_engine.dispose()
+
+        print(f"{size:>10} {first.seconds:>9.2f} {incremental.seconds * 1000:>12.1f} {index_us:>9.1f} "
+              f"{scan_ms:>9.2f} {load_ms:>14.1f} {hits / queries:>11.1f}")
+
+
+def bench_board(turnovers, grids, size):
+    """Measures AnswerBoard redraws for fast question turnover and full crossword grids; needs a display."""
+    import tkinter as tk
+    from collections import namedtuple
+    from boardView import AnswerBoard
+    from gridLogic import WordIndex, generate_crossword
+
+    root = tk.Tk()
+    root.title("board benchmark")
+    timings = []
+    board = AnswerBoard(root, bg="silver", cell_bg="#E0E0E0", cell_fg="#333333",
+                        on_render=lambda ms, cells: timings.append(ms))
+    board.pack()
+    root.update()
+
+    def report(label, started):
+        frame_ms = (time.perf_counter() - started) * 1000 / max(1, len(timings))
+        ordered = sorted(timings)
+        print(f"{label:<22} renders: {len(ordered):>5}  median: {ordered[len(ordered) // 2]:6.2f} ms  "
+              f"max: {ordered[-1]:6.2f} ms  with Tk update: {frame_ms:6.2f} ms/frame")
+        timings.clear()
+
+    rng = random.Random(1)
+    started = time.perf_counter()
+    for _ in range(turnovers):
+        board.show_word(rng.randint(3, 12))
+        root.update()
+        board.fill_all("?", "#FFD700")
+        root.update()
+    report("question turnover", started)
+
+    Question = namedtuple("Question", ["question", "answer"])
+    bank = [Question(f"clue {i}", "".join(rng.choice("eeettaaoinshrdlcu") for _ in range(rng.randint(3, 10))))
+            for i in range(20_000)]
+    index = WordIndex(bank, max_length=size)
+    crosswords = [generate_crossword(bank, size=size, seed=seed, index=index) for seed in range(grids)]
+    started = time.perf_counter()
+    for crossword in crosswords:
+        board.show_crossword(crossword)
+        root.update()
+    report(f"{size}x{size} layouts", started)
+
+    started = time.perf_counter()
+    for crossword in crosswords:
+        for placement in crossword.placements:
+            board.set_word(placement.row, placement.col, placement.word, placement.direction == 0)
+            root.update()
+    report(f"{size}x{size} word fills", started)
+    root.destroy()
+
+
+def bench_timers(timers, duration, stall_ms):
+    """
+    Runs many concurrent countdowns on one asyncio loop that stalls every 250 ms, comparing the
+    deadline-based TimerService with one call_later(1 s) chain per timer.
+    """
+    import asyncio
+    from timerService import TimerService
+
+    def run(use_service):
+        loop = asyncio.new_event_loop()
+        rng = random.Random(timers)
+        lateness = []
+        callbacks = [0]
+        pending = [timers]
+
+        def finished(expected):
+            lateness.append(loop.time() - expected)
+            pending[0] -= 1
+            if not pending[0]:
+                loop.stop()
+
+        def stall():
+            time.sleep(stall_ms / 1000)
+            if pending[0]:
+                loop.call_later(0.25, stall)
+
+        def tick(state, expected):
+            callbacks[0] += 1
+            if not state["paused"]:
+                state["left"] -= 1
+            if state["left"] <= 0:
+                finished(expected)
+            else:
+                loop.call_later(1, tick, state, expected)
+
+        service = TimerService.for_asyncio(loop)
+        start = loop.time()
+        for _ in range(timers):
+            pause_at, pause_for = rng.uniform(0, duration / 2), rng.uniform(0, 0.5)
+            expected = start + duration + pause_for
+            if use_service:
+                timer = service.start(duration, on_expire=lambda e=expected: finished(e))
+                loop.call_at(start + pause_at, timer.pause)
+                loop.call_at(start + pause_at + pause_for, timer.resume)
+            else:
+                state = {"left": duration, "paused": False}
+                loop.call_later(1, tick, state, expected)
+                loop.call_at(start + pause_at, state.update, {"paused": True})
+                loop.call_at(start + pause_at + pause_for, state.update, {"paused": False})
+        loop.call_later(0.25, stall)
+        loop.run_forever()
+        loop.close()
+        lateness.sort()
+        wakeups = service.wakeups if use_service else callbacks[0]
+        return lateness[len(lateness) // 2], lateness[-1], wakeups
+
+    print(f"timers: {timers}  duration: {duration}s  stall: {stall_ms} ms every 250 ms")
+    for label, use_service in (("after(1s) chains", False), ("TimerService", True)):
+        median, worst, wakeups = run(use_service)
+        print(f"{label:<18} median error: {median * 1000:8.1f} ms  worst: {worst * 1000:8.1f} ms  "
+              f"callbacks: {wakeups}")
+
+
+def bench_server(rooms, players, games, questions_per_game, host=None, port=None):
+    """
+    Load-generates games against the asyncio game server and reports games/s and the latency
+    from sending an answer to receiving its "answer" event. Without --port an in-process server
+    on a temporary players.db is used.
+    """
+    import asyncio
+    from collections import namedtuple
+    from databaseLogic import Session as PlayersSession
+    from gameJournal import EventJournal
+    from gameServer import GameServer, GameClient
+    from samplingLogic import QuestionPoolCache
+
+    Question = namedtuple("Question", ["question", "answer"])
+    bank = [Question(f"clue {i}", f"answer{i}") for i in range(5000)]
+    cache = QuestionPoolCache(lambda language, difficulty: bank)
+    latencies = []
+
+    async def play(client_no, client_host, client_port):
+        room = f"load-{client_no // players}"
+        me = f"{chr(97 + client_no % 26)}player_{client_no}"
+        rng = random.Random(client_no)
+        client = await GameClient.connect(client_host, client_port)
+        finished = 0
+        sent_at = None
+        await client.send("join", player=me, room=room, players=players, mode="To mistake")
+        while finished < games:
+            event = await client.receive()
+            if event is None:
+                break
+            kind = event["event"]
+            if kind == "question" and event["player"] == me:
+                sent_at = time.perf_counter()
+                if rng.random() < 0.8:
+                    await client.send("answer", text="wrong")
+                else:
+                    await client.send("give_up")
+            elif kind == "answer" and event["player"] == me and sent_at is not None:
+                latencies.append(time.perf_counter() - sent_at)
+                sent_at = None
+            elif kind == "game_over":
+                finished += 1
+                if finished < games:
+                    await client.send("join", player=me, room=room, players=players, mode="To mistake")
+            elif kind == "error":
+                await asyncio.sleep(0.001)
+                await client.send("join", player=me, room=room, players=players, mode="To mistake")
+        await client.close()
+        return finished
+
+    async def run(journal):
+        server = None
+        client_host, client_port = host, port
+        if port is None:
+            server = GameServer(draw_questions=lambda language, difficulty: cache.sample(
+                language, difficulty, questions_per_game), journal=journal)
+            client_host, client_port = await server.start("127.0.0.1", 0)
+        started = time.perf_counter()
+        finished = await asyncio.gather(*(play(i, client_host, client_port) for i in range(rooms * players)))
+        seconds = time.perf_counter() - started
+        if server is not None:
+            await server.stop()
+        return sum(finished) / players, seconds
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_engine = _make_players_db(os.path.join(tmp, "players.db"), rooms * players)
+        PlayersSession.use_engine(bench_engine)
+        journal = EventJournal(os.path.join(tmp, "journal"))
+        total_games, seconds = asyncio.run(run(journal))
+        journal.close()
+        bench_engine.dispose()
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    print(f"rooms: {rooms}  players/room: {players}  games: {total_games:.0f}  answers: {len(latencies)}  "
+          f"seconds: {seconds:.2f}")
+    print(f"games/s: {total_games / seconds:.0f}  answer latency p50: {percentile(0.5):.2f} ms  "
+          f"p95: {percentile(0.95):.2f} ms  p99: {percentile(0.99):.2f} ms")
+
+
+def bench_storage(seconds, readers, writers, players, questions):
+    """
+    Mixed-load benchmark of the storage settings: reader threads draw questions from words.db and
+    page through players.db while writer threads save game results, once with SQLite's default
+    rollback journal and once with the tuned WAL settings.
+    """
+    import threading
+    from databaseLogic import Session as PlayersSession
+    from playersLogic import fetch_players_page
+    from questionsLogic import Base as WordsBase, bulk_import_questions
+    from resultsLogic import GameResult, write_game_results
+    from storage import DEFAULT_PRAGMAS, LEGACY_PRAGMAS, create_sqlite_engine
+
+    print(f"{'settings':<9} {'reads/s':>9} {'writes/s':>9} {'read p50 ms':>12} {'read p99 ms':>12} "
+          f"{'write p50 ms':>13} {'write p99 ms':>13} {'errors':>7}")
+    for label, pragmas in (("default", LEGACY_PRAGMAS), ("tuned", DEFAULT_PRAGMAS)):
+        with tempfile.TemporaryDirectory() as tmp:
+            players_path = os.path.join(tmp, "players.db")
+            _make_players_db(players_path, players).dispose()
+            bank = os.path.join(tmp, "bank.json")
+            _make_question_bank(bank, questions)
+            words_engine = create_sqlite_engine(os.path.join(tmp, "words.db"), pragmas)
+            WordsBase.metadata.create_all(words_engine)
+            bulk_import_questions(bank, bind=words_engine)
+            players_engine = create_sqlite_engine(players_path, pragmas)
+            PlayersSession.use_engine(players_engine)
+            with players_engine.connect() as conn:
+                names = [row[0] for row in conn.exec_driver_sql("SELECT name FROM players LIMIT 1000")]
+
+            deadline = time.perf_counter() + seconds
+            read_times, write_times, errors = [], [], []
+
+            def reader(seed):
+                rng = random.Random(seed)
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        with words_engine.connect() as conn:
+                            conn.exec_driver_sql(
+                                "SELECT id, question, answer FROM word_questions WHERE category = ? AND difficulty = ? "
+                                "LIMIT 10 OFFSET ?", ("en", "Easy", rng.randrange(questions // 8))).all()
+                        fetch_players_page(prefix=rng.choice("abcdefghijklmnopqrstuvwxyz"))
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    read_times.append(time.perf_counter() - started)
+
+            def writer(seed):
+                rng = random.Random(seed)
+                while time.perf_counter() < deadline:
+                    scores = {name: rng.randrange(0, 100, 10) for name in rng.sample(names, 2)}
+                    started = time.perf_counter()
+                    try:
+                        write_game_results([GameResult(scores, "Easy", "To mistake")])
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    write_times.append(time.perf_counter() - started)
+
+            threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+            threads += [threading.Thread(target=writer, args=(100 + i,)) for i in range(writers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            words_engine.dispose()
+            players_engine.dispose()
+
+        read_times.sort()
+        write_times.sort()
+
+        def percentile(values, p):
+            return values[min(len(values) - 1, int(len(values) * p))] * 1000 if values else 0.0
+
+        print(f"{label:<9} {len(read_times) / seconds:>9.0f} {len(write_times) / seconds:>9.0f} "
+              f"{percentile(read_times, 0.5):>12.2f} {percentile(read_times, 0.99):>12.2f} "
+              f"{percentile(write_times, 0.5):>13.2f} {percentile(write_times, 0.99):>13.2f} {len(errors):>7}")
+
+
+def _levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j - 1] + (char != other), current[j - 1] + 1, previous[j] + 1))
+        previous = current
+    return previous[-1]
+
+
+def bench_answer_check(checks):
+    """Microbenchmarks the answer check path: old lower() compare, normalized keys, typo tolerance."""
+    from collections import namedtuple
+    from answerMatching import normalize_answer_key, within_edit_distance
+    from gameEngine import is_correct_answer
+
+    Question = namedtuple("Question", ["question", "answer", "answer_key"])
+    rng = random.Random(1)
+    words = ["marchewka", "łódź", "wiśnia", "prędki", "castle", "mountain", "hydrogen", "żółw", "ogórek", "river"]
+    questions = [Question("clue", word, normalize_answer_key(word)) for word in words]
+    typed = []
+    for _ in range(checks):
+        question = rng.choice(questions)
+        roll = rng.random()
+        if roll < 0.4:
+            text = question.answer_key.upper()
+        elif roll < 0.7:
+            text = question.answer_key[:-2] + "xy"
+        else:
+            text = rng.choice(words)[::-1]
+        typed.append((text, question))
+
+    cases = [
+        ("lower() compare", lambda text, q: text.lower() == q.answer.lower()),
+        ("key, precomputed", lambda text, q: is_correct_answer(text, q)),
+        ("key, both per check", lambda text, q: normalize_answer_key(text) == normalize_answer_key(q.answer)),
+        ("key + 1 typo", lambda text, q: is_correct_answer(text, q, 1)),
+        ("key + 2 typos", lambda text, q: is_correct_answer(text, q, 2)),
+        ("bounded edit, k=2", lambda text, q: within_edit_distance(normalize_answer_key(text), q.answer_key, 2)),
+        ("full Levenshtein <= 2", lambda text, q: _levenshtein(normalize_answer_key(text), q.answer_key) <= 2),
+    ]
+    print(f"{'check':<24} {'us/check':>9} {'accepted':>9}")
+    for label, check in cases:
+        started = time.perf_counter()
+        accepted = sum(1 for text, question in typed if check(text, question))
+        elapsed = time.perf_counter() - started
+        print(f"{label:<24} {elapsed * 1e6 / checks:>9.2f} {accepted / checks:>9.1%}")
+
+
+def bench_seen(buckets, games, k):
+    """Repeat rate and draw cost of one player's games with and without the seen-question filter."""
+    from collections import namedtuple
+    from samplingLogic import QuestionPoolCache
+    from seenQuestions import SeenFilter, unseen_by_all
+
+    seen = SeenFilter()
+    seen.update(range(seen.capacity))
+    probes = range(10_000_000, 10_100_000)
+    false_positives = sum(1 for question_id in probes if question_id in seen) / len(probes)
+    print(f"filter: {len(seen.to_bytes())} bytes per full generation, {seen.hashes} hashes, "
+          f"false positives {false_positives:.2%}")
+
+    Question = namedtuple("Question", ["id"])
+    print(f"{'bucket':>8} {'filter':>7} {'repeat %':>9} {'us/draw':>9} {'history':>8}")
+    for size in buckets:
+        questions = [Question(i) for i in range(size)]
+        cache = QuestionPoolCache(lambda language, difficulty: questions)
+        for use_filter in (False, True):
+            history = SeenFilter()
+            shown = set()
+            repeats = drawn = 0
+            elapsed = 0.0
+            for game in range(games):
+                exclude = unseen_by_all([history]) if use_filter else None
+                started = time.perf_counter()
+                draw = cache.sample("en", "Easy", k, seed=game, exclude=exclude)
+                elapsed += time.perf_counter() - started
+                for question in draw:
+                    repeats += question.id in shown
+                    shown.add(question.id)
+                drawn += len(draw)
+                history.update(question.id for question in draw)
+            print(f"{size:>8} {'on' if use_filter else 'off':>7} {repeats / drawn:>9.1%} "
+                  f"{elapsed * 1e6 / games:>9.1f} {len(shown):>8}")
+
+
+def bench_metrics(calls):
+    """Per-call overhead of the metrics decorator and timer, switched off and on."""
+    import metrics
+
+    def work():
+        return None
+
+    print(f"{'instrumentation':<22} {'ns/call':>8}")
+    for enabled in (False, True):
+        metrics.enabled = enabled
+        decorated = metrics.timed("bench_seconds")(work)
+        cases = [("plain call", work), ("timed, " + ("on" if enabled else "off"), decorated)]
+        if enabled:
+            cases = cases[1:]
+        for label, fn in cases:
+            started = time.perf_counter()
+            for _ in range(calls):
+                fn()
+            print(f"{label:<22} {(time.perf_counter() - started) * 1e9 / calls:>8.0f}")
+        started = time.perf_counter()
+        for _ in range(calls):
+            with metrics.timer("bench_block_seconds"):
+                pass
+        print(f"{'timer(), ' + ('on' if enabled else 'off'):<22} {(time.perf_counter() - started) * 1e9 / calls:>8.0f}")
+    metrics.enabled = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="name", required=True)
+
+    p_import = sub.add_parser("import", help="bulk question-bank import scaling")
+    p_import.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000, 500_000])
+    p_import.add_argument("--ndjson", action="store_true", help="use NDJSON input instead of a JSON array")
+
+    p_sync = sub.add_parser("sync", help="incremental JSON bank sync: unchanged, touched and edited files")
+    p_sync.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    p_sync.add_argument("--changed", type=int, default=1, help="percent of items changed in the edited file")
+
+    p_draw = sub.add_parser("draw", help="random question draw latency")
+    p_draw.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 500_000])
+    p_draw.add_argument("--draws", type=int, default=200)
+    p_draw.add_argument("-k", type=int, default=10)
+
+    p_pack = sub.add_parser("pack", help="memory-mapped question pack against words.db: first draw and draw latency")
+    p_pack.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    p_pack.add_argument("--draws", type=int, default=10_000)
+    p_pack.add_argument("--k", type=int, default=10)
+    p_pack.add_argument("--runs", type=int, default=3)
+
+    p_startup = sub.add_parser("startup", help="cold start of mainScript to the first drawn main menu")
+    p_startup.add_argument("--runs", type=int, default=5)
+    p_startup.add_argument("--top", type=int, default=15)
+
+    p_players = sub.add_parser("players", help="virtual players list paging at growing table sizes")
+    p_players.add_argument("--sizes", type=int, nargs="+", default=[100, 100_000, 1_000_000])
+    p_players.add_argument("--pages", type=int, default=20)
+
+    p_pdf = sub.add_parser("players-pdf", help="streaming players PDF report memory and throughput")
+    p_pdf.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p_pdf.add_argument("--rows-per-volume", type=int, default=50_000)
+
+    p_cache = sub.add_parser("report-cache", help="players PDF through the report cache: render, hit, re-render")
+    p_cache.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    p_cache.add_argument("--hits", type=int, default=200)
+
+    p_engine = sub.add_parser("engine", help="headless simulated games through GameEngine")
+    p_engine.add_argument("--games", type=int, default=20_000)
+    p_engine.add_argument("--players", type=int, default=4)
+    p_engine.add_argument("--questions", type=int, default=10)
+
+    p_grid = sub.add_parser("grid", help="crossword grid generation latency")
+    p_grid.add_argument("--banks", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    p_grid.add_argument("--sizes", type=int, nargs="+", default=[9, 15, 21])
+    p_grid.add_argument("--grids", type=int, default=20)
+
+    p_answers = sub.add_parser("answers", help="answer index pattern queries against a full scan")
+    p_answers.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    p_answers.add_argument("--queries", type=int, default=2000)
+
+    p_board = sub.add_parser("board", help="canvas answer board render time (needs a display)")
+    p_board.add_argument("--turnovers", type=int, default=500)
+    p_board.add_argument("--grids", type=int, default=20)
+    p_board.add_argument("--size", type=int, default=25)
+
+    p_timers = sub.add_parser("timers", help="drift of many concurrent game timers on a stalling loop")
+    p_timers.add_argument("--timers", type=int, default=1000)
+    p_timers.add_argument("--duration", type=int, default=5)
+    p_timers.add_argument("--stall-ms", type=int, default=100)
+
+    p_server = sub.add_parser("server", help="load generator for the asyncio game server")
+    p_server.add_argument("--rooms", type=int, default=200)
+    p_server.add_argument("--players", type=int, default=2)
+    p_server.add_argument("--games", type=int, default=10, help="games per room")
+    p_server.add_argument("--questions", type=int, default=10)
+    p_server.add_argument("--host", default="127.0.0.1")
+    p_server.add_argument("--port", type=int, help="load an already running server instead of an in-process one")
+
+    p_storage = sub.add_parser("storage", help="mixed question draws and result saves, default vs tuned SQLite")
+    p_storage.add_argument("--seconds", type=float, default=5)
+    p_storage.add_argument("--readers", type=int, default=4)
+    p_storage.add_argument("--writers", type=int, default=2)
+    p_storage.add_argument("--players", type=int, default=100_000)
+    p_storage.add_argument("--questions", type=int, default=100_000)
+
+    p_check = sub.add_parser("check", help="answer check path: normalization and typo tolerance")
+    p_check.add_argument("--checks", type=int, default=200_000)
+
+    p_seen = sub.add_parser("seen", help="per-player seen-question filter: repeats and draw cost")
+    p_seen.add_argument("--buckets", type=int, nargs="+", default=[200, 2_000, 20_000])
+    p_seen.add_argument("--games", type=int, default=100)
+    p_seen.add_argument("-k", type=int, default=10)
+
+    p_metrics = sub.add_parser("metrics", help="overhead of the timing decorators, off and on")
+    p_metrics.add_argument("--calls", type=int, default=500_000)
+
+    p_journal = sub.add_parser("journal", help="game event journal: append cost, batching and replay")
+    p_journal.add_argument("--games", type=int, default=20_000)
+    p_journal.add_argument("--questions", type=int, default=10)
+
+    p_analytics = sub.add_parser("analytics", help="per-question analytics over answer outcomes (needs numpy)")
+    p_analytics.add_argument("--outcomes", type=int, default=20_000_000)
+    p_analytics.add_argument("--questions", type=int, default=100_000)
+    p_analytics.add_argument("--games", type=int, default=5_000)
+
+    p_reports = sub.add_parser("reports", help="parallel batch PDF reports over a synthetic games table")
+    p_reports.add_argument("--games", type=int, default=5_000)
+    p_reports.add_argument("--players", type=int, default=500)
+    p_reports.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    args = parser.parse_args()
+    if args.name == "import":
+        bench_import(args.sizes, args.ndjson)
+    elif args.name == "sync":
+        bench_sync(args.sizes, args.changed)
+    elif args.name == "draw":
+        bench_draw(args.sizes, args.draws, args.k)
+    elif args.name == "pack":
+        bench_pack(args.sizes, args.draws, args.k, args.runs)
+    elif args.name == "startup":
+        bench_startup(args.runs, args.top)
+    elif args.name == "players":
+        bench_players_list(args.sizes, args.pages)
+    elif args.name == "players-pdf":
+        bench_players_pdf(args.sizes, args.rows_per_volume)
+    elif args.name == "report-cache":
+        bench_report_cache(args.sizes, args.hits)
+    elif args.name == "engine":
+        bench_engine(args.games, args.players, args.questions)
+    elif args.name == "grid":
+        bench_grid(args.banks, args.sizes, args.grids)
+    elif args.name == "answers":
+        bench_answer_index(args.sizes, args.queries)
+    elif args.name == "board":
+        bench_board(args.turnovers, args.grids, args.size)
+    elif args.name == "timers":
+        bench_timers(args.timers, args.duration, args.stall_ms)
+    elif args.name == "server":
+        bench_server(args.rooms, args.players, args.games, args.questions, args.host, args.port)
+    elif args.name == "storage":
+        bench_storage(args.seconds, args.readers, args.writers, args.players, args.questions)
+    elif args.name == "check":
+        bench_answer_check(args.checks)
+    elif args.name == "seen":
+        bench_seen(args.buckets, args.games, args.k)
+    elif args.name == "metrics":
+        bench_metrics(args.calls)
+    elif args.name == "journal":
+        bench_journal(args.games, args.questions)
+    elif args.name == "analytics":
+        bench_analytics(args.outcomes, args.questions, args.games)
+    elif args.name == "reports":
+        bench_reports(args.games, args.players, args.workers)
+
+
+if __name__ == "__main__":
+    main()
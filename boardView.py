@@ -0,0 +1,182 @@
+import time
+import tkinter as tk
+
+CELL_SIZE = 60
+CELL_GAP = 4
+MAX_BOARD_WIDTH = 900
+CELL_FONT = ("Lucida Console", 30, "bold")
+FRAME_BUDGET_MS = 16.7
+
+
+class AnswerBoard(tk.Canvas):
+    """
+    Letter board drawn on a single canvas.
+
+    Every cell is a pooled rectangle + text item pair that is created once and reused for later
+    questions; cells outside the current layout are hidden rather than deleted. Changes only mark
+    cells dirty, and one idle callback applies them, reconfiguring just the items whose fill or
+    text actually changed.
+    """
+    def __init__(self, parent, bg, cell_bg, cell_fg, cell_size=CELL_SIZE, font=CELL_FONT,
+                 max_width=MAX_BOARD_WIDTH, on_render=None):
+        """
+        Args:
+            parent (tk.Misc): Parent widget.
+            bg (str): Canvas background.
+            cell_bg (str): Default fill of a cell.
+            cell_fg (str): Letter color.
+            cell_size (int): Largest cell side in pixels; wide boards shrink cells to fit `max_width`.
+            font (tuple): Letter font at the largest cell size; scaled down with the cells.
+            max_width (int): Maximum canvas width in pixels.
+            on_render (callable, optional): Called as on_render(milliseconds, cells_redrawn) after
+                each redraw; the same numbers are kept in `last_render_ms` and `render_stats`.
+        """
+        super().__init__(parent, bg=bg, highlightthickness=0, width=1, height=1)
+        self.cell_bg = cell_bg
+        self.cell_fg = cell_fg
+        self.max_cell_size = cell_size
+        self.font = font
+        self.max_width = max_width
+        self.on_render = on_render
+
+        self.rows = 0
+        self.cols = 0
+        self.cell_size = cell_size
+        self._pool = []
+        self._shown = []
+        self._slots = {}
+        self._wanted = {}
+        self._dirty = set()
+        self._layout_dirty = False
+        self._redraw_id = None
+
+        self.last_render_ms = 0.0
+        self.render_stats = {"renders": 0, "cells": 0, "total_ms": 0.0, "max_ms": 0.0, "over_frame": 0}
+
+    def show_word(self, length):
+        """Shows one row of `length` empty cells, as used for the current answer."""
+        self.set_layout(1, length, [(0, col) for col in range(length)])
+
+    def show_crossword(self, crossword):
+        """Shows the open cells of a gridLogic.Crossword; blocked cells are left out."""
+        cells = [(row, col) for row in range(crossword.size) for col in range(crossword.size)
+                 if crossword.cells[row][col] is not None]
+        self.set_layout(crossword.size, crossword.size, cells)
+
+    def set_layout(self, rows, cols, cells):
+        """
+        Switches to a rows x cols board with the given (row, col) cells visible and empty.
+        Pooled items are reused; new ones are only created when the board grows.
+        """
+        self.rows, self.cols = rows, cols
+        self.cell_size = max(8, min(self.max_cell_size, self.max_width // max(cols, 1)))
+        self._wanted = {cell: ("", self.cell_bg) for cell in cells}
+        self._layout_dirty = True
+        self._schedule()
+
+    def set_cell(self, row, col, text="", fill=None):
+        """Sets the letter and fill of one visible cell."""
+        cell = (row, col)
+        if cell in self._wanted:
+            self._wanted[cell] = (text, fill or self.cell_bg)
+            self._dirty.add(cell)
+            self._schedule()
+
+    def set_word(self, row, col, text, across=True, fill=None):
+        """Writes `text` into consecutive cells starting at (row, col)."""
+        dr, dc = (0, 1) if across else (1, 0)
+        for i, letter in enumerate(text):
+            self.set_cell(row + dr * i, col + dc * i, letter, fill)
+
+    def fill_all(self, text="", fill=None):
+        """Sets every visible cell to the same letter and fill, e.g. to mask the board while paused."""
+        for cell in self._wanted:
+            self._wanted[cell] = (text, fill or self.cell_bg)
+        self._dirty.update(self._wanted)
+        self._schedule()
+
+    def render_now(self):
+        """Applies pending changes immediately instead of waiting for the idle callback."""
+        if self._redraw_id is not None:
+            self.after_cancel(self._redraw_id)
+            self._redraw_id = None
+        self._redraw()
+
+    def _schedule(self):
+        if self._redraw_id is None:
+            self._redraw_id = self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_id = None
+        started = time.perf_counter()
+        redrawn = self._apply_layout() if self._layout_dirty else self._apply_dirty()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.last_render_ms = elapsed_ms
+        stats = self.render_stats
+        stats["renders"] += 1
+        stats["cells"] += redrawn
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        if elapsed_ms > FRAME_BUDGET_MS:
+            stats["over_frame"] += 1
+        if self.on_render:
+            self.on_render(elapsed_ms, redrawn)
+
+    def _apply_layout(self):
+        self._layout_dirty = False
+        self._dirty.clear()
+        size = self.cell_size
+        pitch = size + CELL_GAP
+        self.config(width=self.cols * pitch, height=self.rows * pitch)
+        family, font_size, *style = self.font
+        font = (family, max(6, font_size * size // self.max_cell_size), *style)
+
+        cells = sorted(self._wanted)
+        while len(self._pool) < len(cells):
+            rect = self.create_rectangle(0, 0, 0, 0, fill=self.cell_bg, outline=self.cell_fg)
+            text = self.create_text(0, 0, text="", fill=self.cell_fg)
+            self._pool.append((rect, text))
+            self._shown.append([None, None, None, None])
+
+        for slot, (rect, text) in enumerate(self._pool):
+            shown = self._shown[slot]
+            if slot >= len(cells):
+                if shown[0] is not None:
+                    self.itemconfig(rect, state="hidden")
+                    self.itemconfig(text, state="hidden")
+                    shown[0] = None
+                continue
+            placed = (cells[slot], size)
+            if shown[0] != placed:
+                (row, col), _ = placed
+                x, y = col * pitch + CELL_GAP // 2, row * pitch + CELL_GAP // 2
+                self.coords(rect, x, y, x + size, y + size)
+                self.coords(text, x + size // 2, y + size // 2)
+                if shown[0] is None:
+                    self.itemconfig(rect, state="normal")
+                    self.itemconfig(text, state="normal")
+                shown[0] = placed
+            if shown[3] != font:
+                self.itemconfig(text, font=font)
+                shown[3] = font
+            self._update_slot(slot, self._wanted[cells[slot]])
+        self._slots = {cell: slot for slot, cell in enumerate(cells)}
+        return len(cells)
+
+    def _apply_dirty(self):
+        dirty, self._dirty = self._dirty, set()
+        for cell in dirty:
+            self._update_slot(self._slots[cell], self._wanted[cell])
+        return len(dirty)
+
+    def _update_slot(self, slot, wanted):
+        rect, text = self._pool[slot]
+        shown = self._shown[slot]
+        letter, fill = wanted
+        if shown[1] != letter:
+            self.itemconfig(text, text=letter)
+            shown[1] = letter
+        if shown[2] != fill:
+            self.itemconfig(rect, fill=fill)
+            shown[2] = fill
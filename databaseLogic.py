@@ -1,5 +1,6 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy import collate, inspect, select, Column, DateTime, Integer, String, ForeignKey, Index, LargeBinary
+from sqlalchemy.orm import declarative_base, relationship
+from storage import LazySessionFactory, PLAYERS_DB_PATH, create_sqlite_engine
 
 Base = declarative_base()
 
@@ -25,10 +26,91 @@ class Game(Base):
     score = Column(Integer)
     difficulty = Column(String)
     mode = Column(String)
+    played_at = Column(DateTime)
+    match_id = Column(String)  # shared by the rows of one game; NULL for games saved before it existed
 
     player = relationship("Player", back_populates="games")
 
 
-engine = create_engine('sqlite:///players.db')
-Base.metadata.create_all(engine)
-Session = sessionmaker(bind=engine)
+class TableVersion(Base):
+    """Change counter of a table, bumped by triggers on every inserted, updated or deleted row."""
+    __tablename__ = 'table_versions'
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class PlayerSeenQuestions(Base):
+    __tablename__ = 'player_seen_questions'
+
+    player_id = Column(Integer, ForeignKey('players.id'), primary_key=True)
+    data = Column(LargeBinary, nullable=False)  # serialized seenQuestions.SeenFilter
+
+
+PLAYER_SORT_KEY = collate(Player.name, 'NOCASE')
+Index('ix_players_name_nocase', PLAYER_SORT_KEY)
+Index('ix_games_played_at', Game.played_at)
+Index('ix_games_match_id', Game.match_id)
+Index('ix_games_player_id', Game.player_id)
+
+
+def ensure_game_columns(bind):
+    """Adds the played_at and match_id columns and the games indexes to databases made before they existed."""
+    with bind.begin() as conn:
+        columns = {column['name'] for column in inspect(conn).get_columns('games')}
+        if 'played_at' not in columns:
+            conn.exec_driver_sql("ALTER TABLE games ADD COLUMN played_at DATETIME")
+        if 'match_id' not in columns:
+            conn.exec_driver_sql("ALTER TABLE games ADD COLUMN match_id VARCHAR")
+        for index in Game.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+VERSIONED_TABLES = ('players', 'games')
+DATABASE_EPOCH = '__epoch__'
+
+
+def ensure_change_counters(bind):
+    """
+    Creates the table_versions rows and the triggers keeping them current.
+    The __epoch__ row holds a random number fixed at creation, so counters of a replaced
+    database file never match those of the old one.
+    """
+    TableVersion.__table__.create(bind, checkfirst=True)
+    with bind.begin() as conn:
+        conn.exec_driver_sql("INSERT OR IGNORE INTO table_versions (name, version) VALUES (?, abs(random()))",
+                             (DATABASE_EPOCH,))
+        for table in VERSIONED_TABLES:
+            conn.exec_driver_sql("INSERT OR IGNORE INTO table_versions (name, version) VALUES (?, 0)", (table,))
+            for operation in ("INSERT", "UPDATE", "DELETE"):
+                conn.exec_driver_sql(
+                    f"CREATE TRIGGER IF NOT EXISTS {table}_{operation.lower()}_version AFTER {operation} ON {table} "
+                    f"BEGIN UPDATE table_versions SET version = version + 1 WHERE name = '{table}'; END")
+
+
+def table_versions(conn, names=VERSIONED_TABLES):
+    """Returns {table name: change counter}, plus the database epoch."""
+    rows = conn.execute(select(TableVersion.name, TableVersion.version).where(
+        TableVersion.name.in_([*names, DATABASE_EPOCH])))
+    return dict(rows.all())
+
+
+def _create_players_engine():
+    engine = create_sqlite_engine(PLAYERS_DB_PATH)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for index in Player.__table__.indexes:
+            index.create(conn, checkfirst=True)
+    ensure_game_columns(engine)
+    ensure_change_counters(engine)
+    return engine
+
+
+Session = LazySessionFactory(_create_players_engine)
+
+
+def __getattr__(name):
+    if name == 'engine':
+        return Session.engine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
@@ -0,0 +1,135 @@
+import queue
+import threading
+from concurrent.futures import Future
+
+POLL_INTERVAL_MS = 30
+
+
+class DatabaseWorker:
+    """
+    Runs database jobs one at a time on a dedicated background thread.
+    Jobs are queued in submission order and each returns a concurrent.futures.Future,
+    so SQLite work never blocks the Tk main loop.
+    """
+    def __init__(self, name="db-worker"):
+        self.name = name
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queues fn(*args, **kwargs) for the worker thread.
+
+        Returns:
+            Future: Resolves to the job's return value or exception.
+        """
+        self._ensure_started()
+        future = Future()
+        self._jobs.put((future, fn, args, kwargs))
+        return future
+
+    def shutdown(self, wait=True):
+        """Stops the worker after the already queued jobs have run."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._jobs.put(None)
+        if wait:
+            thread.join()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            future, fn, args, kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+class TkFutureDispatcher:
+    """
+    Delivers finished futures back to the Tk thread.
+    One `after` poll chain per Tk root is active only while futures are pending.
+    """
+    def __init__(self, root, interval_ms=POLL_INTERVAL_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._pending = []
+        self._after_id = None
+
+    def watch(self, future, on_done=None, on_error=None):
+        """
+        Calls on_done(result) or on_error(exception) on the Tk thread once the future finishes.
+        Must be called from the Tk thread.
+        """
+        self._pending.append((future, on_done, on_error))
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._poll)
+
+    def _poll(self):
+        self._after_id = None
+        ready, pending = [], []
+        for entry in self._pending:
+            (ready if entry[0].done() else pending).append(entry)
+        self._pending = pending
+        for future, on_done, on_error in ready:
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+                else:
+                    print(f"Background database job failed: {error}")
+            elif on_done:
+                on_done(future.result())
+        if self._pending:
+            self._after_id = self.root.after(self.interval_ms, self._poll)
+
+
+_worker = DatabaseWorker()
+
+
+def get_worker():
+    """Returns the shared database worker."""
+    return _worker
+
+
+def run_db_job(widget, fn, *args, on_done=None, on_error=None, **kwargs):
+    """
+    Runs fn(*args, **kwargs) on the shared database worker and reports back on the Tk thread.
+
+    Args:
+        widget (tk.Misc): Any widget of the Tk application that should receive the result.
+        fn (callable): The database job; it must not touch Tk widgets.
+        on_done (callable, optional): Called with the job's result on the Tk thread.
+        on_error (callable, optional): Called with the raised exception on the Tk thread.
+    Returns:
+        Future: The job's future.
+    """
+    future = _worker.submit(fn, *args, **kwargs)
+    watch_future(widget, future, on_done, on_error)
+    return future
+
+
+def watch_future(widget, future, on_done=None, on_error=None):
+    """Calls on_done(result) or on_error(exception) on the Tk thread once `future` finishes."""
+    root = widget.nametowidget('.')
+    dispatcher = getattr(root, '_db_dispatcher', None)
+    if dispatcher is None:
+        dispatcher = root._db_dispatcher = TkFutureDispatcher(root)
+    dispatcher.watch(future, on_done, on_error)
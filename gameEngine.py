@@ -0,0 +1,222 @@
+"""
+Display-independent crossword game rules.
+
+GameEngine owns scoring, turn rotation, pause, the time budget and end-of-game handling.
+Views (the Tk CrosswordGame, simulations, the game server) drive it through its methods
+and react to the events it emits.
+"""
+from answerMatching import cached_answer_key, normalize_answer_key, within_edit_distance
+
+MODE_FOR_TIME = "For Time"
+MODE_TO_MISTAKE = "To mistake"
+
+POINTS_PER_ANSWER = 10
+LETTERS_PER_TYPO = 4
+TIME_LIMITS = {
+    "Hard": 8 * 60,
+    "Medium": 10 * 60,
+    "Easy": 12 * 60
+}
+DEFAULT_TIME_LIMIT = 300
+
+MESSAGE_ALL_ANSWERED = "All questions answered!"
+MESSAGE_TIME_UP = "Time's up!"
+
+EVENT_QUESTION = "question"
+EVENT_ANSWER = "answer"
+EVENT_PAUSE = "pause"
+EVENT_RESUME = "resume"
+EVENT_GAME_OVER = "game_over"
+
+RESULT_CORRECT = "correct"
+RESULT_WRONG = "wrong"
+RESULT_SKIPPED = "skipped"
+RESULT_EMPTY = "empty"
+RESULT_PAUSED = "paused"
+RESULT_NO_QUESTION = "no_question"
+
+
+def is_correct_answer(answer, question, max_typos=0):
+    """
+    Returns True if `answer` matches the question's answer, ignoring case, diacritics and spacing.
+    With `max_typos`, answers up to that many edits away are accepted too, at most one edit
+    per LETTERS_PER_TYPO letters so short answers still need to be exact.
+    """
+    key = getattr(question, 'answer_key', None) or cached_answer_key(question.answer)
+    typed = normalize_answer_key(answer)
+    if typed == key:
+        return True
+    allowed = min(max_typos, len(key) // LETTERS_PER_TYPO)
+    return allowed > 0 and within_edit_distance(typed, key, allowed)
+
+
+class GameState:
+    """Compact, copyable snapshot of a running game."""
+    __slots__ = ('scores', 'current_player', 'question_index', 'paused', 'time_left', 'finished', 'end_message')
+
+    def __init__(self, num_players, time_left):
+        self.scores = [0] * num_players
+        self.current_player = 0
+        self.question_index = -1
+        self.paused = False
+        self.time_left = time_left
+        self.finished = False
+        self.end_message = None
+
+    def copy(self):
+        state = GameState.__new__(GameState)
+        for name in self.__slots__:
+            setattr(state, name, getattr(self, name))
+        state.scores = list(self.scores)
+        return state
+
+
+class GameEngine:
+    """
+    Pure-Python game rules for one crossword game.
+
+    Listeners registered with `subscribe` are called as listener(event, data) for every event;
+    `data` is a dict whose keys depend on the event.
+    """
+    def __init__(self, players, questions, difficulty, mode, max_typos=0):
+        """
+        Args:
+            players (list): Player names in turn order.
+            questions (list): Objects with `question` and `answer` attributes, and optionally
+                a precomputed `answer_key`.
+            difficulty (str): Game difficulty; selects the time budget.
+            mode (str): MODE_FOR_TIME or MODE_TO_MISTAKE.
+            max_typos (int): Edits tolerated in an answer; see is_correct_answer.
+        """
+        self.players = list(players)
+        self.questions = list(questions)
+        self.difficulty = difficulty
+        self.mode = mode
+        self.max_typos = max_typos
+        self.timed = mode == MODE_FOR_TIME
+        time_left = TIME_LIMITS.get(difficulty, DEFAULT_TIME_LIMIT) if self.timed else 0
+        self.state = GameState(len(self.players), time_left)
+        self._listeners = []
+
+    def subscribe(self, listener):
+        """Registers listener(event, data); returns it so it can be passed to `unsubscribe`."""
+        self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _emit(self, event, **data):
+        for listener in self._listeners:
+            listener(event, data)
+
+    @property
+    def current_question(self):
+        index = self.state.question_index
+        if 0 <= index < len(self.questions) and not self.state.finished:
+            return self.questions[index]
+        return None
+
+    @property
+    def current_player_name(self):
+        return self.players[self.state.current_player]
+
+    def scores_by_name(self):
+        """Returns a {player name: score} dict."""
+        return dict(zip(self.players, self.state.scores))
+
+    def shown_question_ids(self):
+        """Returns the ids of the questions asked so far, for the players' seen-question history."""
+        shown = self.questions[:self.state.question_index + 1]
+        return [question.id for question in shown if getattr(question, 'id', None) is not None]
+
+    def winners(self):
+        """Returns the names of players with the top score, or an empty list if nobody scored."""
+        max_score = max(self.state.scores, default=0)
+        if max_score <= 0:
+            return []
+        return [name for name, score in zip(self.players, self.state.scores) if score == max_score]
+
+    def start(self):
+        """Shows the first question, or ends the game straight away if there are none."""
+        if self.state.question_index < 0:
+            self._advance(rotate=False)
+
+    def submit_answer(self, answer):
+        """
+        Checks an answer for the current player.
+
+        Returns:
+            str: One of the RESULT_* constants.
+        """
+        state = self.state
+        if state.paused and self.timed:
+            return RESULT_PAUSED
+        answer = answer.strip()
+        if not answer:
+            return RESULT_EMPTY
+        question = self.current_question
+        if question is None:
+            return RESULT_NO_QUESTION
+
+        player = state.current_player
+        if is_correct_answer(answer, question, self.max_typos):
+            state.scores[player] += POINTS_PER_ANSWER
+            self._emit(EVENT_ANSWER, player=player, question=question, answer=answer, correct=True)
+            self._advance()
+            return RESULT_CORRECT
+
+        self._emit(EVENT_ANSWER, player=player, question=question, answer=answer, correct=False)
+        if self.mode == MODE_TO_MISTAKE:
+            self._advance()
+        return RESULT_WRONG
+
+    def give_up(self):
+        """Skips the current question; returns RESULT_SKIPPED or RESULT_PAUSED."""
+        if self.state.paused and self.timed:
+            return RESULT_PAUSED
+        if self.current_question is not None:
+            self._emit(EVENT_ANSWER, player=self.state.current_player, question=self.current_question,
+                       answer=None, correct=False)
+        self._advance()
+        return RESULT_SKIPPED
+
+    def toggle_pause(self):
+        """Pauses or resumes a timed game; returns the new paused flag."""
+        state = self.state
+        if not self.timed or state.finished:
+            return state.paused
+        state.paused = not state.paused
+        self._emit(EVENT_PAUSE if state.paused else EVENT_RESUME, time_left=state.time_left)
+        return state.paused
+
+    def tick(self, seconds=1):
+        """Consumes `seconds` of a timed game's budget; ends the game when it runs out."""
+        state = self.state
+        if not self.timed or state.paused or state.finished:
+            return
+        state.time_left -= seconds
+        if state.time_left <= 0:
+            state.time_left = 0
+            self.end(MESSAGE_TIME_UP)
+
+    def end(self, message):
+        """Finishes the game once; later calls are ignored."""
+        state = self.state
+        if state.finished:
+            return
+        state.finished = True
+        state.end_message = message
+        self._emit(EVENT_GAME_OVER, message=message, scores=self.scores_by_name(), winners=self.winners())
+
+    def _advance(self, rotate=True):
+        state = self.state
+        if state.finished:
+            return
+        if state.question_index + 1 >= len(self.questions):
+            self.end(MESSAGE_ALL_ANSWERED)
+            return
+        state.question_index += 1
+        if rotate and len(self.players) > 1:
+            state.current_player = (state.current_player + 1) % len(self.players)
+        self._emit(EVENT_QUESTION, question=self.questions[state.question_index], player=state.current_player)
@@ -0,0 +1,374 @@
+"""
+Append-only journal of everything that happens in a game.
+
+GameRecorder turns GameEngine events into compact NDJSON records (start, question, answer,
+pause, resume, game_over), each carrying the game id and a wall-clock timestamp; answers also
+carry the time the player took, excluding pauses. Records are appended to an in-memory batch
+and written by a background thread every FLUSH_INTERVAL_S or FLUSH_BATCH records, into segment
+files events-<time>-<pid>.ndjson that are never rewritten and roll over at SEGMENT_BYTES.
+
+The journal is the full history: `python gameJournal.py show <game>` replays a game turn by turn
+and `python gameJournal.py rebuild [--apply]` recomputes the Player counters from it.
+"""
+import argparse
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from gameEngine import (EVENT_QUESTION, EVENT_ANSWER, EVENT_PAUSE, EVENT_RESUME, EVENT_GAME_OVER,
+                        POINTS_PER_ANSWER)
+
+JOURNAL_DIR = "journal"
+SEGMENT_PATTERN = "events-*.ndjson"
+SEGMENT_BYTES = 8 * 1024 * 1024
+FLUSH_INTERVAL_S = 1.0
+FLUSH_BATCH = 256
+
+RECORD_START = "start"
+
+
+class EventJournal:
+    """
+    Batched, append-only NDJSON writer.
+
+    `append` only queues the record, so it is safe to call from the Tk thread; a daemon thread
+    writes the batches. `flush` blocks until everything appended so far is on disk.
+    """
+    def __init__(self, directory=JOURNAL_DIR, segment_bytes=SEGMENT_BYTES, flush_interval=FLUSH_INTERVAL_S,
+                 flush_batch=FLUSH_BATCH):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.records_written = 0
+        self.batches_written = 0
+        self._pending = []
+        self._appended = 0
+        self._written = 0
+        self._file = None
+        self._closed = False
+        self._flush_wanted = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="game-journal", daemon=True)
+        self._thread.start()
+
+    def append(self, record):
+        """Queues a record; it is serialized on the writer thread, so it must not be changed afterwards."""
+        with self._cond:
+            self._pending.append(record)
+            self._appended += 1
+            if len(self._pending) >= self.flush_batch:
+                self._cond.notify_all()
+
+    def flush(self):
+        """Blocks until every record appended before the call has been written."""
+        with self._cond:
+            target = self._appended
+            self._flush_wanted = True
+            self._cond.notify_all()
+            while self._written < target and self._thread.is_alive():
+                self._cond.wait(0.1)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not (self._closed or self._flush_wanted or len(self._pending) >= self.flush_batch):
+                    self._cond.wait(self.flush_interval)
+                batch, self._pending = self._pending, []
+                self._flush_wanted = False
+                closed = self._closed
+            if batch:
+                try:
+                    self._write(batch)
+                except OSError as e:
+                    print(f"Could not write the game journal: {e}")
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+            if closed and not batch:
+                break
+        if self._file is not None:
+            self._file.close()
+
+    def _write(self, records):
+        if self._file is None or self._file.tell() >= self.segment_bytes:
+            if self._file is not None:
+                self._file.close()
+            os.makedirs(self.directory, exist_ok=True)
+            name = f"events-{time.time_ns()}-{os.getpid()}.ndjson"
+            self._file = open(os.path.join(self.directory, name), "a", encoding="utf-8")
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        self._file.write("".join([encode(record) + "\n" for record in records]))
+        self._file.flush()
+        self.records_written += len(records)
+        self.batches_written += 1
+
+
+class GameRecorder:
+    """Journals the events of one GameEngine under a fresh game id."""
+    def __init__(self, journal, engine, language=None, player_ids=None, anonymous=False):
+        """
+        Args:
+            journal (EventJournal): Where records go.
+            engine (GameEngine): The game to record; subscribe the recorder before the views so
+                its timestamps are taken before any blocking dialog.
+            language (str, optional): Question language, kept for analytics.
+            player_ids (dict, optional): Player name -> players.id.
+            anonymous (bool): The players did not log in (game server); their names are never
+                matched to registered players.
+        """
+        self.journal = journal
+        self.engine = engine
+        self.game_id = uuid.uuid4().hex
+        self._asked_at = None
+        self._paused_at = None
+        player_ids = {} if anonymous else player_ids or {}
+        journal.append({
+            "t": RECORD_START, "game": self.game_id, "ts": time.time(),
+            "players": engine.players,
+            "player_ids": [player_ids.get(name) for name in engine.players],
+            "language": language, "difficulty": engine.difficulty, "mode": engine.mode,
+            "questions": [getattr(question, 'id', None) for question in engine.questions],
+            "time_left": engine.state.time_left,
+            **({"anonymous": True} if anonymous else {}),
+        })
+        engine.subscribe(self._on_event)
+
+    def _on_event(self, event, data):
+        now = time.monotonic()
+        record = {"t": event, "game": self.game_id, "ts": time.time()}
+        if event == EVENT_QUESTION:
+            self._asked_at = now
+            record["i"] = self.engine.state.question_index
+            record["player"] = data["player"]
+            record["q"] = getattr(data["question"], 'id', None)
+        elif event == EVENT_ANSWER:
+            record["player"] = data["player"]
+            record["q"] = getattr(data["question"], 'id', None)
+            record["answer"] = data["answer"]
+            record["correct"] = data["correct"]
+            if self._asked_at is not None:
+                record["ms"] = round((now - self._asked_at) * 1000)
+        elif event == EVENT_PAUSE:
+            self._paused_at = now
+            record["time_left"] = data["time_left"]
+        elif event == EVENT_RESUME:
+            if self._paused_at is not None and self._asked_at is not None:
+                self._asked_at += now - self._paused_at
+            self._paused_at = None
+            record["time_left"] = data["time_left"]
+        elif event == EVENT_GAME_OVER:
+            record["message"] = data["message"]
+            record["scores"] = data["scores"]
+            record["winners"] = data["winners"]
+        self.journal.append(record)
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    """The process-wide journal, started on first use and flushed at exit."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = EventJournal()
+            atexit.register(_journal.close)
+        return _journal
+
+
+def record_game(engine, language=None, player_ids=None, anonymous=False, journal=None):
+    """Starts journaling `engine` into `journal` (the shared one by default); returns the GameRecorder."""
+    return GameRecorder(journal or get_journal(), engine, language, player_ids, anonymous)
+
+
+def segment_paths(directory=JOURNAL_DIR):
+    """Journal segment files in write order."""
+    return sorted(glob.glob(os.path.join(directory, SEGMENT_PATTERN)), key=_segment_order)
+
+
+def _segment_order(path):
+    name = os.path.basename(path)[len("events-"):-len(".ndjson")]
+    started, _, pid = name.partition("-")
+    return int(started), pid
+
+
+def iter_records(directory=JOURNAL_DIR):
+    """Yields every journal record in write order; a torn last line of a segment is skipped."""
+    for path in segment_paths(directory):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def replay_game(game_id, records=None):
+    """
+    Rebuilds one game from its records.
+
+    Returns:
+        dict: start settings, the list of turns (question index, player, answer, correct, ms),
+            the scores recomputed from the answers and the game_over record (None if the game
+            never finished); `consistent` tells whether both score sets agree.
+    """
+    records = records if records is not None else iter_records()
+    start, turns, finish = None, [], None
+    for record in records:
+        if record.get("game") != game_id:
+            continue
+        kind = record["t"]
+        if kind == RECORD_START:
+            start = record
+        elif kind == EVENT_ANSWER:
+            turns.append(record)
+        elif kind == EVENT_GAME_OVER:
+            finish = record
+    if start is None:
+        raise KeyError(f"Game {game_id} is not in the journal")
+    scores = dict.fromkeys(start["players"], 0)
+    for turn in turns:
+        if turn["correct"]:
+            scores[start["players"][turn["player"]]] += POINTS_PER_ANSWER
+    return {
+        "start": start,
+        "turns": turns,
+        "scores": scores,
+        "finish": finish,
+        "consistent": finish is None or finish["scores"] == scores,
+    }
+
+
+def player_counters(records=None):
+    """
+    Recomputes games_played, wins and losses per player from finished games, with the same
+    rule write_game_results applies: a win is a top score above zero. Anonymous games count
+    for nobody, as they do in players.db.
+
+    Returns:
+        tuple: ({player_id: [games, wins, losses]}, {name: [games, wins, losses]}) where the
+            second dict holds players the journal has no id for.
+    """
+    records = records if records is not None else iter_records()
+    starts = {}
+    by_id, by_name = {}, {}
+    for record in records:
+        kind = record["t"]
+        if kind == RECORD_START:
+            starts[record["game"]] = record
+        elif kind == EVENT_GAME_OVER:
+            start = starts.pop(record["game"], None)
+            if start is not None and start.get("anonymous"):
+                continue
+            ids = dict(zip(start["players"], start["player_ids"])) if start else {}
+            max_score = max(record["scores"].values(), default=0)
+            for name, score in record["scores"].items():
+                player_id = ids.get(name)
+                counters = by_id.setdefault(player_id, [0, 0, 0]) if player_id is not None \
+                    else by_name.setdefault(name, [0, 0, 0])
+                counters[0] += 1
+                if score == max_score and max_score > 0:
+                    counters[1] += 1
+                else:
+                    counters[2] += 1
+    return by_id, by_name
+
+
+def rebuild_player_counters(session, records=None, apply=False):
+    """
+    Compares the Player counters with the journal and, with `apply`, overwrites them.
+
+    Only players the journal fully covers are compared: those with journaled games, as many
+    as their rows in the games table. Players absent from the journal, or with games played
+    before it existed, keep their counters.
+
+    Returns:
+        list: (name, stored (games, wins, losses), rebuilt (games, wins, losses)) of every player
+            whose counters differ.
+    """
+    from sqlalchemy import func, select, update
+    from databaseLogic import Game, Player
+
+    by_id, by_name = player_counters(records)
+    changes = []
+    game_rows = select(Game.player_id, func.count().label('games')).group_by(Game.player_id).subquery()
+    rows = session.execute(select(Player.id, Player.name, Player.games_played, Player.wins, Player.losses,
+                                  func.coalesce(game_rows.c.games, 0))
+                           .outerjoin(game_rows, game_rows.c.player_id == Player.id))
+    for player_id, name, games, wins, losses, stored_games in rows:
+        journaled = by_id.get(player_id) or by_name.get(name)
+        if journaled is None or journaled[0] != stored_games:
+            continue
+        stored = (games or 0, wins or 0, losses or 0)
+        rebuilt = tuple(journaled)
+        if stored != rebuilt:
+            changes.append((player_id, name, stored, rebuilt))
+    if apply and changes:
+        session.execute(update(Player), [
+            {"id": player_id, "games_played": rebuilt[0], "wins": rebuilt[1], "losses": rebuilt[2]}
+            for player_id, _, _, rebuilt in changes])
+        session.commit()
+    return [(name, stored, rebuilt) for _, name, stored, rebuilt in changes]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspects and replays the game event journal.")
+    parser.add_argument("--dir", default=JOURNAL_DIR, help="journal directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("games", help="list the journaled games")
+    p_show = sub.add_parser("show", help="replay one game turn by turn")
+    p_show.add_argument("game", help="game id, or a unique prefix of it")
+    p_rebuild = sub.add_parser("rebuild", help="recompute the Player counters from the journal")
+    p_rebuild.add_argument("--apply", action="store_true", help="write the rebuilt counters to players.db")
+    args = parser.parse_args(argv)
+
+    if args.command == "games":
+        finished = {}
+        starts = []
+        for record in iter_records(args.dir):
+            if record["t"] == RECORD_START:
+                starts.append(record)
+            elif record["t"] == EVENT_GAME_OVER:
+                finished[record["game"]] = record
+        for start in starts:
+            finish = finished.get(start["game"])
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(start["ts"]))
+            result = finish["scores"] if finish else "unfinished"
+            print(f"{start['game']}  {when}  {start['difficulty']}/{start['mode']}  {result}")
+    elif args.command == "show":
+        records = list(iter_records(args.dir))
+        matches = {r["game"] for r in records if r["t"] == RECORD_START and r["game"].startswith(args.game)}
+        if len(matches) != 1:
+            parser.error(f"{len(matches)} games match {args.game!r}")
+        game = replay_game(matches.pop(), records)
+        players = game["start"]["players"]
+        for turn in game["turns"]:
+            answer = "gave up" if turn["answer"] is None else repr(turn["answer"])
+            verdict = "correct" if turn["correct"] else "wrong"
+            print(f"{players[turn['player']]:<20} q={turn['q']} {answer} {verdict} {turn.get('ms', '?')} ms")
+        print(f"scores {game['scores']}" + ("" if game["consistent"] else f" (journal says {game['finish']['scores']})"))
+    elif args.command == "rebuild":
+        from databaseLogic import Session
+        session = Session()
+        try:
+            changes = rebuild_player_counters(session, iter_records(args.dir), apply=args.apply)
+        finally:
+            session.close()
+        for name, stored, rebuilt in changes:
+            print(f"{name:<24} {stored} -> {rebuilt}")
+        print(f"{len(changes)} players {'updated' if args.apply else 'differ (use --apply to write)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 import tkinter as tk
+from datetime import datetime
 from tkinter import messagebox
-from questionsLogic import get_random_questions
-from databaseLogic import Session, Player, Game
-from pdfLogic import generate_game_results_pdf
+from boardView import AnswerBoard
+from questionDraw import get_random_questions
+from dbWorker import watch_future
+from gameEngine import (GameEngine, EVENT_QUESTION, EVENT_ANSWER, EVENT_PAUSE, EVENT_RESUME, EVENT_GAME_OVER,
+                        RESULT_PAUSED, RESULT_EMPTY, RESULT_NO_QUESTION)
+from resultsLogic import GameResult, result_writer
+from timerService import TimerService
+from gameJournal import record_game
+import metrics
 
 
 class CrosswordGame:
@@ -30,33 +37,32 @@ class CrosswordGame:
     COLOR_PAUSE_BTN_ACTIVE = "#FBC02D"
     COLOR_HINT_CELL_BG = "#E0E0E0"
     COLOR_HINT_CELL_FG = "#333333"
+    COLOR_HINT_CELL_PAUSED = "#FFD700"
     COLOR_WINNER = "gold"
     COLOR_HINT_TEXT = "#616161"
 
-    def __init__(self, parent, players_data, language, difficulty, mode, on_game_finish_callback):
+    WRITE_BEHIND = True
+    ANSWER_TYPOS = 0
+
+    def __init__(self, parent, players_data, language, difficulty, mode, on_game_finish_callback, questions=None,
+                 player_ids=None):
         self.parent = parent
         self.players = [name for name, _ in players_data]
+        self.player_ids = player_ids
         self.language = language
         self.difficulty = difficulty
         self.mode = mode
         self.on_game_finish_callback = on_game_finish_callback
 
-        self.current_player_index = 0
-        self.scores = {name: 0 for name in self.players}
         self.player_colors = ['blue', 'red', 'green', 'yellow']
 
-        self.timer_id = None
-        self.paused = False
-        self.time_left = 0
-
-        self.time_limits = {
-            "Hard": 8 * 60,
-            "Medium": 10 * 60,
-            "Easy": 12 * 60
-        }
+        self.timer = None
 
-        self.questions = get_random_questions(language, difficulty)
-        self.current_question = None
+        if questions is None:
+            questions = get_random_questions(language, difficulty)
+        self.engine = GameEngine(self.players, questions, difficulty, mode, max_typos=self.ANSWER_TYPOS)
+        self.recorder = record_game(self.engine, language, player_ids)
+        self.engine.subscribe(self._on_engine_event)
         self.original_question_text = ""
 
         self.game_window = None
@@ -64,8 +70,7 @@ class CrosswordGame:
         self.current_player_label = None
         self.scores_label = None
         self.question_label = None
-        self.answer_hint_frame = None
-        self.letter_display_labels = []
+        self.answer_board = None
         self.length_label = None
         self.answer_entry = None
         self.submit_btn = None
@@ -75,6 +80,42 @@ class CrosswordGame:
 
         self.create_game_window()
 
+    @property
+    def scores(self):
+        return self.engine.scores_by_name()
+
+    @property
+    def current_question(self):
+        return self.engine.current_question
+
+    @property
+    def current_player_index(self):
+        return self.engine.state.current_player
+
+    @property
+    def paused(self):
+        return self.engine.state.paused
+
+    @property
+    def time_left(self):
+        return self.engine.state.time_left
+
+    def _on_engine_event(self, event, data):
+        """Updates the widgets for events emitted by the game engine."""
+        if event == EVENT_QUESTION:
+            self._show_question(data["player"])
+        elif event == EVENT_ANSWER and data["answer"] is not None:
+            if data["correct"]:
+                messagebox.showinfo("Correct!", "Your answer is correct!")
+            else:
+                messagebox.showerror("Wrong", f"Incorrect answer")
+        elif event == EVENT_PAUSE:
+            self._show_paused()
+        elif event == EVENT_RESUME:
+            self._show_resumed()
+        elif event == EVENT_GAME_OVER:
+            self._end_game(data["message"])
+
     def create_game_window(self):
         """Sets up the main game UI frame and widgets."""
         self.game_window = tk.Frame(self.parent, bg=self.COLOR_BG_GAME)
@@ -83,8 +124,7 @@ class CrosswordGame:
         self.info_frame = tk.Frame(self.game_window, bg=self.COLOR_BG_GAME, bd=2, relief="groove")
         self.info_frame.pack(fill=tk.X, padx=20, pady=20)
 
-        if self.mode == "For Time":
-            self.time_left = self.time_limits.get(self.difficulty, 300)
+        if self.engine.timed:
             self.timer_label = tk.Label(self.info_frame,
                                         text=f"Time: {self.time_left // 60}:{self.time_left % 60:02d}",
                                         font=self.FONT_INFO, bg=self.COLOR_BG_GAME, fg=self.COLOR_INFO_TIME)
@@ -113,8 +153,11 @@ class CrosswordGame:
                                        wraplength=self.parent.winfo_screenwidth() * 0.7)
         self.question_label.pack(pady=40)
 
-        self.answer_hint_frame = tk.Frame(self.game_display_frame, bg=self.COLOR_BG_GAME)
-        self.answer_hint_frame.pack(pady=20)
+        self.answer_board = AnswerBoard(self.game_display_frame, bg=self.COLOR_BG_GAME,
+                                        cell_bg=self.COLOR_HINT_CELL_BG, cell_fg=self.COLOR_HINT_CELL_FG,
+                                        font=self.FONT_CELL,
+                                        max_width=int(self.parent.winfo_screenwidth() * 0.7))
+        self.answer_board.pack(pady=20)
 
         self.length_label = tk.Label(self.game_display_frame, text="",
                                      font=self.FONT_HINT, bg=self.COLOR_BG_GAME, fg=self.COLOR_HINT_TEXT)
@@ -142,7 +185,7 @@ class CrosswordGame:
                                      activebackground=self.COLOR_GIVEUP_BTN_ACTIVE)
         self.give_up_btn.pack(side=tk.RIGHT, padx=20)
 
-        if self.mode == "For Time":
+        if self.engine.timed:
             self.pause_btn = tk.Button(self.input_control_frame, text="Pause", font=self.FONT_BUTTON_GAME,
                                        command=self._toggle_pause, bg=self.COLOR_PAUSE_BTN, fg="black",
                                        activebackground=self.COLOR_PAUSE_BTN_ACTIVE)
@@ -153,45 +196,27 @@ class CrosswordGame:
         self._init_game_board()
 
     def _init_game_board(self):
-        """Clears previous question UI and loads the next question."""
-        for label in self.letter_display_labels:
-            label.destroy()
-        self.letter_display_labels = []
-
-        if self.questions:
-            self.current_question = self.questions.pop(0)
-            self.original_question_text = self.current_question.question
-            self.question_label.config(text=f"Question: {self.original_question_text}")
-            self._display_answer_hint()
-            self._enable_input()
-        else:
-            self._end_game("All questions answered!")
+        """Asks the engine for the first question."""
+        self.engine.start()
+
+    def _show_question(self, player_index):
+        """Shows the engine's current question and whose turn it is."""
+        self.original_question_text = self.current_question.question
+        self.question_label.config(text=f"Question: {self.original_question_text}")
+        self._display_answer_hint()
+        self.current_player_label.config(
+            text=f"Current: {self.players[player_index]}",
+            fg=self.player_colors[player_index]
+        )
+        self._enable_input()
 
     def _display_answer_hint(self):
-        """
-        Creates/updates the visual hint for the answer length using individual labels.
-        """
-        for label in self.letter_display_labels:
-            label.destroy()
-        self.letter_display_labels = []
-
+        """Shows one empty board cell per letter of the current answer."""
         if not self.current_question:
             return
 
         answer_length = len(self.current_question.answer)
-
-        if not hasattr(self, 'answer_hint_frame') or not self.answer_hint_frame.winfo_exists():
-            self.answer_hint_frame = tk.Frame(self.game_display_frame, bg=self.COLOR_BG_GAME)
-            self.answer_hint_frame.pack(pady=20)
-
-        for i in range(answer_length):
-            label = tk.Label(self.answer_hint_frame, text='',
-                             font=self.FONT_CELL,
-                             bg=self.COLOR_HINT_CELL_BG, fg=self.COLOR_HINT_CELL_FG,
-                             relief="solid", bd=1, width=3, height=1)
-            label.grid(row=0, column=i, padx=2, pady=2)
-            self.letter_display_labels.append(label)
-
+        self.answer_board.show_word(answer_length)
         self.length_label.config(text=f"Answer has {answer_length} letters")
 
     def _get_scores_text(self):
@@ -199,20 +224,33 @@ class CrosswordGame:
         return " | ".join(f"{name}: {self.scores[name]}" for name in self.players)
 
     def start_timer(self):
-        """Starts or resumes the game timer."""
-        if self.paused:
+        """
+        Starts or resumes the game timer.
+        The countdown runs on the application's shared TimerService, which derives the time left
+        from monotonic deadlines, so stalls of the Tk loop do not make the clock drift.
+        """
+        if self.paused or self.engine.state.finished:
             return
-        if self.timer_id:
-            self.game_window.after_cancel(self.timer_id)
+        if self.timer is None:
+            self.timer = TimerService.for_tk(self.parent).start(self.time_left, on_tick=self._on_timer_tick)
+        else:
+            self.timer.resume()
+        self._update_timer_label()
+
+    def _on_timer_tick(self, seconds_left):
+        """Charges the engine for the whole seconds that passed since the last tick."""
+        elapsed = self.time_left - seconds_left
+        if elapsed > 0:
+            self.engine.tick(elapsed)
+        self._update_timer_label()
 
-        self.time_left -= 1
+    def _update_timer_label(self):
         mins, secs = divmod(self.time_left, 60)
         self.timer_label.config(text=f"Time: {mins:02d}:{secs:02d}")
 
-        if self.time_left <= 0:
-            self._end_game("Time's up!")
-        else:
-            self.timer_id = self.game_window.after(1000, self.start_timer)
+    def _stop_timer(self):
+        if self.timer is not None:
+            self.timer.cancel()
 
     def _check_answer_event(self, event=None):
         """Wrapper for check_answer called by Return key."""
@@ -222,61 +260,29 @@ class CrosswordGame:
         """Wrapper for check_answer called by Submit button click."""
         self._check_answer_logic()
 
+    @metrics.timed("answer_submit_seconds", "Checking an answer in the game engine")
+    def _submit_answer(self, text):
+        return self.engine.submit_answer(text)
+
     def _check_answer_logic(self):
-        """Performs the answer check logic."""
-        if self.paused and self.mode == "For Time":
+        """Passes the typed answer to the game engine and reports what it decided."""
+        result = self._submit_answer(self.answer_entry.get())
+        if result == RESULT_PAUSED:
             messagebox.showinfo("Game Paused", "Cannot enter answer while game is paused.")
             return
-
-        answer = self.answer_entry.get().strip()
-        if not answer:
+        if result == RESULT_EMPTY:
             return
-
-        if not self.current_question:
+        if result == RESULT_NO_QUESTION:
             messagebox.showerror("Error", "No active question.")
             return
 
-        if answer.lower() == self.current_question.answer.lower():
-            self.scores[self.players[self.current_player_index]] += 10
-            messagebox.showinfo("Correct!", "Your answer is correct!")
-            self._next_question()
-        else:
-            messagebox.showerror("Wrong", f"Incorrect answer")
-            if self.mode == "To mistake":
-                self._next_question()
-
         self.answer_entry.delete(0, tk.END)
         self.scores_label.config(text=self._get_scores_text())
 
     def _give_up(self):
         """Handles the 'Give Up' action."""
-        if self.paused and self.mode == "For Time":
+        if self.engine.give_up() == RESULT_PAUSED:
             messagebox.showinfo("Game Paused", "Cannot give up while game is paused.")
-            return
-        self._next_question()
-
-    def _next_question(self):
-        """Advances to the next question or ends the game if no more questions."""
-        for label in self.letter_display_labels:
-            label.destroy()
-        self.letter_display_labels = []
-
-        if self.questions:
-            self.current_question = self.questions.pop(0)
-            self.original_question_text = self.current_question.question
-            self.question_label.config(text=f"Question: {self.original_question_text}")
-            self._display_answer_hint()
-
-            if len(self.players) > 1:
-                self.current_player_index = (self.current_player_index + 1) % len(self.players)
-                self.current_player_label.config(
-                    text=f"Current: {self.players[self.current_player_index]}",
-                    fg=self.player_colors[self.current_player_index]
-                )
-            self._enable_input()
-        else:
-            self._end_game("All questions answered!")
-
 
     def _disable_input(self):
         """Disables input widgets."""
@@ -293,39 +299,51 @@ class CrosswordGame:
 
     def _toggle_pause(self):
         """Toggles the game's paused state."""
-        if self.mode != "For Time" or self.pause_btn is None:
+        if self.pause_btn is None:
             return
+        self.engine.toggle_pause()
 
-        self.paused = not self.paused
-        if self.paused:
-            self.pause_btn.config(text="Resume", bg=self.COLOR_PAUSE_BTN_ACTIVE)
-            if self.timer_id:
-                self.game_window.after_cancel(self.timer_id)
-                self.timer_id = None
+    def _show_paused(self):
+        self.pause_btn.config(text="Resume", bg=self.COLOR_PAUSE_BTN_ACTIVE)
+        if self.timer is not None:
+            self.timer.pause()
 
-            self._disable_input()
+        self._disable_input()
 
-            self.question_label.config(text="Game Paused. Press Resume to continue.")
-            for label in self.letter_display_labels:
-                label.config(text="?", bg="#FFD700")
-            self.length_label.config(text="Answer hint hidden.")
-        else:
-            self.pause_btn.config(text="Pause", bg=self.COLOR_PAUSE_BTN)
-            self.start_timer()
-            self._enable_input()
+        self.question_label.config(text="Game Paused. Press Resume to continue.")
+        self.answer_board.fill_all("?", self.COLOR_HINT_CELL_PAUSED)
+        self.length_label.config(text="Answer hint hidden.")
+
+    def _show_resumed(self):
+        self.pause_btn.config(text="Pause", bg=self.COLOR_PAUSE_BTN)
+        self.start_timer()
+        self._enable_input()
 
-            self.question_label.config(text=f"Question: {self.original_question_text}")
+        self.question_label.config(text=f"Question: {self.original_question_text}")
 
-            self._display_answer_hint()
+        self._display_answer_hint()
 
     def _end_game(self, message):
-        """Ends the game, stops the timer, and displays results."""
-        if self.timer_id:
-            self.game_window.after_cancel(self.timer_id)
-            self.timer_id = None
+        """
+        Ends the game, stops the timer, and displays results.
+        With WRITE_BEHIND the results screen appears right away while the commit finishes in the
+        background; otherwise it is shown once the results are saved.
+        """
+        self._stop_timer()
 
-        self._show_results_frame(message)
-        self._save_results()
+        saved = self._save_results()
+        if self.WRITE_BEHIND:
+            self._show_results_frame(message)
+            watch_future(self.parent, saved, on_error=self._on_save_error)
+        else:
+            def show_after_error(e):
+                self._on_save_error(e)
+                self._show_results_frame(message)
+
+            self._disable_input()
+            watch_future(self.parent, saved,
+                         on_done=lambda _: self._show_results_frame(message),
+                         on_error=show_after_error)
 
     def _show_results_frame(self, message):
         """Creates and displays the game results UI."""
@@ -338,13 +356,7 @@ class CrosswordGame:
             pady=30)
         tk.Label(self.results_frame, text=message, font=self.FONT_RESULTS_MESSAGE, bg=self.COLOR_BG_GAME).pack(pady=10)
 
-        max_score = 0
-        winners = []
-        if self.scores:
-            max_score = max(self.scores.values())
-            for name, score in self.scores.items():
-                if score == max_score and max_score > 0:
-                    winners.append(name)
+        winners = self.engine.winners()
 
         if winners:
             if len(winners) == 1:
@@ -367,11 +379,7 @@ class CrosswordGame:
                                      font=self.FONT_BUTTON_GAME,
                                      bg=self.COLOR_SUBMIT_BTN, fg="white",
                                      activebackground=self.COLOR_SUBMIT_BTN_ACTIVE,
-                                     command=lambda: generate_game_results_pdf(
-                                         self.scores,
-                                         self.difficulty,
-                                         self.mode
-                                     ))
+                                     command=self._download_results_pdf)
         download_pdf_btn.pack(pady=20)
 
         back_to_menu_btn = tk.Button(self.results_frame, text="Back to Main Menu",
@@ -380,52 +388,35 @@ class CrosswordGame:
                                      command=self._return_to_main_menu)
         back_to_menu_btn.pack(pady=40)
 
+    def _download_results_pdf(self):
+        """Generates the results PDF; pdfLogic (and fpdf) is only imported when first needed."""
+        from pdfLogic import generate_game_results_pdf
+        generate_game_results_pdf(self.scores, self.difficulty, self.mode)
+
     def _return_to_main_menu(self):
         """Cleans up results frame and calls the main menu callback."""
         if self.results_frame:
             self.results_frame.pack_forget()
             self.results_frame.destroy()
 
-        self.questions = []
-        self.current_question = None
-        self.current_player_index = 0
-        self.scores = {}
-        self.paused = False
-        if self.timer_id:
-            self.parent.after_cancel(self.timer_id)
-            self.timer_id = None
+        self._stop_timer()
 
         if self.on_game_finish_callback:
             self.on_game_finish_callback()
 
     def _save_results(self):
-        """Saves game results to the database."""
-        session = Session()
-        try:
-            max_score = 0
-            if self.scores:
-                max_score = max(self.scores.values())
-
-            for name, score in self.scores.items():
-                player = session.query(Player).filter_by(name=name).first()
-                if player:
-                    player.games_played += 1
-                    if score == max_score and max_score > 0:
-                        player.wins += 1
-                    else:
-                        player.losses += 1
-
-                    game = Game(
-                        player_id=player.id,
-                        score=score,
-                        difficulty=self.difficulty,
-                        mode=self.mode
-                    )
-                    session.add(game)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            print(f"Error saving results: {e}")
-            messagebox.showerror("Database Error", f"Failed to save game results: {e}")
-        finally:
-            session.close()
+        """
+        Queues game results on the write-behind result writer.
+
+        Returns:
+            Future: Resolves once the results are committed.
+        """
+        saved = result_writer.submit(GameResult(self.scores, self.difficulty, self.mode, self.player_ids,
+                                                self.engine.shown_question_ids(), datetime.now(),
+                                                self.recorder.game_id))
+        return metrics.time_future("game_results_save_seconds", saved,
+                                   "Game over until the results are committed")
+
+    def _on_save_error(self, e):
+        print(f"Error saving results: {e}")
+        messagebox.showerror("Database Error", f"Failed to save game results: {e}")
@@ -0,0 +1,383 @@
+"""
+Asyncio server hosting many crossword games at once on localhost.
+
+Clients speak newline-delimited JSON. Requests carry an "op":
+    {"op": "join", "player": "ann", "room": "r1", "players": 2,
+     "language": "en", "difficulty": "Easy", "mode": "To mistake"}
+    {"op": "answer", "text": "castle"}
+    {"op": "give_up"}
+    {"op": "pause"}
+The server replies with "event" messages: joined, start, question, answer, rejected, pause,
+resume, time, game_over and error. A room starts its game once `players` players have joined;
+without "room" a player is matched into any waiting room with the same settings.
+Players do not log in, so their games are saved as anonymous results: a name never updates the
+counters of the registered player who happens to share it.
+
+Every room runs a GameEngine, journaled like local games. All rooms share the question pool
+cache (questions are drawn on the DB worker), the write-behind result writer, the game journal
+and one TimerService for timed games.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+from gameEngine import (GameEngine, MODE_TO_MISTAKE, EVENT_QUESTION, EVENT_ANSWER, EVENT_PAUSE, EVENT_RESUME,
+                        EVENT_GAME_OVER, RESULT_CORRECT, RESULT_WRONG, RESULT_SKIPPED)
+from timerService import TimerService
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_PLAYERS_PER_ROOM = 4
+MAX_LINE_BYTES = 64 * 1024
+MAX_WRITE_BUFFER_BYTES = 1 << 20
+MESSAGE_PLAYER_LEFT = "{} left the game."
+
+
+def _draw_from_question_bank(language, difficulty):
+    from questionDraw import get_random_questions
+    return get_random_questions(language, difficulty)
+
+
+def _encode(message):
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def _report_save_error(future):
+    if future.exception() is not None:
+        print(f"Error saving results: {future.exception()}")
+
+
+class ClientConnection:
+    """One connected client; at most one room at a time."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.player = None
+        self.room = None
+
+    def send(self, message):
+        self.send_line(_encode(message))
+
+    def send_line(self, line):
+        """Queues an encoded line; clients that stop reading are disconnected instead of buffered forever."""
+        if self.writer.is_closing():
+            return
+        self.writer.write(line)
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER_BYTES:
+            self.writer.close()
+
+
+class GameRoom:
+    """Players of one game and the GameEngine running it."""
+    def __init__(self, server, name, size, language, difficulty, mode):
+        self.server = server
+        self.name = name
+        self.size = size
+        self.language = language
+        self.difficulty = difficulty
+        self.mode = mode
+        self.members = []
+        self.engine = None
+        self.recorder = None
+        self.timer = None
+        self.closed = False
+
+    @property
+    def settings(self):
+        return self.size, self.language, self.difficulty, self.mode
+
+    def broadcast(self, message):
+        line = _encode(message)
+        for member in self.members:
+            member.send_line(line)
+
+    async def start(self):
+        """Draws the questions and starts the game; called once the room is full."""
+        players = [member.player for member in self.members]
+        questions = await self.server.draw_questions(self.language, self.difficulty)
+        if self.closed:
+            return
+        self.engine = GameEngine(players, questions, self.difficulty, self.mode)
+        self.recorder = self.server.record_game(self.engine, self.language)
+        self.engine.subscribe(self._on_engine_event)
+        self.server.games_started += 1
+        self.broadcast({"event": "start", "room": self.name, "players": players,
+                        "questions": len(self.engine.questions), "time_left": self.engine.state.time_left})
+        if self.engine.timed:
+            self.timer = self.server.timers.start(self.engine.state.time_left, on_tick=self._on_timer_tick)
+        self.engine.start()
+
+    def handle(self, member, message):
+        op = message.get("op")
+        engine = self.engine
+        if engine is None or engine.state.finished:
+            member.send({"event": "error", "message": "The game has not started."})
+            return
+        if op == "pause":
+            engine.toggle_pause()
+            return
+        if engine.current_player_name != member.player:
+            member.send({"event": "rejected", "result": "not_your_turn"})
+            return
+        if op == "answer":
+            result = engine.submit_answer(str(message.get("text", "")))
+        else:
+            result = engine.give_up()
+        if result not in (RESULT_CORRECT, RESULT_WRONG, RESULT_SKIPPED):
+            member.send({"event": "rejected", "result": result})
+
+    def leave(self, member):
+        """Removes a player; a game in progress ends when anyone leaves it."""
+        if member in self.members:
+            self.members.remove(member)
+        member.room = None
+        if self.engine is not None:
+            self.engine.end(MESSAGE_PLAYER_LEFT.format(member.player))
+        elif len(self.members) + 1 == self.size or not self.members:
+            # The game was about to start (or nobody is left); the other players must rejoin.
+            self.broadcast({"event": "error", "message": MESSAGE_PLAYER_LEFT.format(member.player)})
+            self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.timer is not None:
+            self.timer.cancel()
+        self.server.forget_room(self)
+        for member in self.members:
+            member.room = None
+
+    def _on_timer_tick(self, seconds_left):
+        elapsed = self.engine.state.time_left - seconds_left
+        if elapsed > 0:
+            self.engine.tick(elapsed)
+        if not self.engine.state.finished:
+            self.broadcast({"event": "time", "time_left": self.engine.state.time_left})
+
+    def _on_engine_event(self, event, data):
+        engine = self.engine
+        if event == EVENT_QUESTION:
+            question = data["question"]
+            self.broadcast({"event": "question", "question": question.question, "length": len(question.answer),
+                            "player": engine.players[data["player"]]})
+        elif event == EVENT_ANSWER:
+            self.server.answers += 1
+            self.broadcast({"event": "answer", "player": engine.players[data["player"]],
+                            "correct": data["correct"], "skipped": data["answer"] is None,
+                            "scores": engine.scores_by_name()})
+        elif event in (EVENT_PAUSE, EVENT_RESUME):
+            if self.timer is not None and event == EVENT_PAUSE:
+                self.timer.pause()
+            elif self.timer is not None:
+                self.timer.resume()
+            self.broadcast({"event": event, "time_left": data["time_left"]})
+        elif event == EVENT_GAME_OVER:
+            self.server.games_finished += 1
+            self.broadcast({"event": "game_over", "message": data["message"], "scores": data["scores"],
+                            "winners": data["winners"]})
+            self.server.save_results(data["scores"], self.difficulty, self.mode, engine.shown_question_ids(),
+                                     self.recorder.game_id if self.recorder else None)
+            self.close()
+
+
+class GameServer:
+    """
+    Accepts clients and routes their requests to rooms.
+
+    Args:
+        draw_questions (callable, optional): draw_questions(language, difficulty) returning the
+            questions of one game; runs on the DB worker. Defaults to the shared question bank.
+        result_writer (ResultWriter, optional): Where finished games are queued; defaults to the
+            shared write-behind writer. Pass False to keep results in memory only.
+        journal (EventJournal, optional): Where games are journaled; defaults to the shared
+            journal. Pass False to skip journaling.
+    """
+    def __init__(self, draw_questions=None, result_writer=None, journal=None):
+        self._draw = draw_questions or _draw_from_question_bank
+        self._result_writer = result_writer
+        self._journal = journal
+        self.timers = None
+        self._rooms = {}
+        self._waiting = {}
+        self._room_ids = itertools.count(1)
+        self._server = None
+        self.connections = 0
+        self.games_started = 0
+        self.games_finished = 0
+        self.answers = 0
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Starts listening; returns the bound (host, port)."""
+        self.timers = TimerService.for_asyncio(asyncio.get_running_loop())
+        self._server = await asyncio.start_server(self._serve_client, host, port, limit=MAX_LINE_BYTES)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._result_writer:
+            await asyncio.get_running_loop().run_in_executor(None, self._result_writer.flush)
+
+    async def draw_questions(self, language, difficulty):
+        from dbWorker import get_worker
+        return await asyncio.wrap_future(get_worker().submit(self._draw, language, difficulty))
+
+    def record_game(self, engine, language):
+        """Starts journaling a room's game as anonymous; returns the GameRecorder, or None."""
+        if self._journal is False:
+            return None
+        from gameJournal import record_game
+        return record_game(engine, language, anonymous=True, journal=self._journal)
+
+    def save_results(self, scores, difficulty, mode, question_ids=None, match_id=None):
+        if self._result_writer is False:
+            return
+        if self._result_writer is None:
+            from resultsLogic import result_writer
+            self._result_writer = result_writer
+        from datetime import datetime
+        from resultsLogic import GameResult
+        future = self._result_writer.submit(GameResult(scores, difficulty, mode, None, question_ids, datetime.now(),
+                                                       match_id, anonymous=True))
+        future.add_done_callback(_report_save_error)
+
+    def forget_room(self, room):
+        if self._rooms.get(room.name) is room:
+            del self._rooms[room.name]
+        if self._waiting.get(room.settings) is room:
+            del self._waiting[room.settings]
+
+    def _join(self, member, message):
+        if member.room is not None:
+            member.send({"event": "error", "message": "Already in a room."})
+            return
+        player = str(message.get("player", "")).strip()
+        if not player:
+            member.send({"event": "error", "message": "A player name is required."})
+            return
+        try:
+            size = int(message.get("players", 1))
+        except (TypeError, ValueError):
+            size = 0
+        if not 1 <= size <= MAX_PLAYERS_PER_ROOM:
+            member.send({"event": "error", "message": f"Rooms hold 1 to {MAX_PLAYERS_PER_ROOM} players."})
+            return
+        settings = (size, message.get("language", "en"), message.get("difficulty", "Easy"),
+                    message.get("mode", MODE_TO_MISTAKE))
+
+        name = message.get("room")
+        room = self._rooms.get(name) if name else self._waiting.get(settings)
+        if room is not None and (room.engine is not None or room.settings != settings
+                                 or any(other.player == player for other in room.members)):
+            member.send({"event": "error", "message": "That room cannot be joined."})
+            return
+        if room is None:
+            name = name or f"room-{next(self._room_ids)}"
+            room = self._rooms[name] = GameRoom(self, name, *settings)
+            if not message.get("room"):
+                self._waiting[settings] = room
+
+        member.player = player
+        member.room = room
+        room.members.append(member)
+        room.broadcast({"event": "joined", "room": room.name, "players": [m.player for m in room.members],
+                        "waiting_for": room.size - len(room.members)})
+        if len(room.members) == room.size:
+            if self._waiting.get(settings) is room:
+                del self._waiting[settings]
+            asyncio.ensure_future(self._start_room(room))
+
+    async def _start_room(self, room):
+        try:
+            await room.start()
+        except Exception as e:
+            room.broadcast({"event": "error", "message": f"Could not start the game: {e}"})
+            room.close()
+
+    async def _serve_client(self, reader, writer):
+        member = ClientConnection(reader, writer)
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    op = message["op"]
+                except (ValueError, TypeError, KeyError):
+                    member.send({"event": "error", "message": "Expected a JSON object with an \"op\"."})
+                    continue
+                if op == "join":
+                    self._join(member, message)
+                elif op in ("answer", "give_up", "pause") and member.room is not None:
+                    member.room.handle(member, message)
+                else:
+                    member.send({"event": "error", "message": f"Unexpected op {op!r}."})
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            if member.room is not None:
+                member.room.leave(member)
+            writer.close()
+
+
+class GameClient:
+    """Minimal asyncio client of the game server protocol."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+        return cls(reader, writer)
+
+    async def send(self, op, **fields):
+        fields["op"] = op
+        self.writer.write(_encode(fields))
+        await self.writer.drain()
+
+    async def receive(self):
+        """Returns the next event, or None once the server closed the connection."""
+        line = await self.reader.readline()
+        return json.loads(line) if line else None
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hosts crossword games over a JSON line protocol.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    async def serve():
+        server = GameServer()
+        host, port = await server.start(args.host, args.port)
+        print(f"Serving crossword games on {host}:{port}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
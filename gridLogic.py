@@ -0,0 +1,277 @@
+"""
+Crossword grid generator.
+
+Answers are indexed by length and by letter at each position as integer bitsets, so the words
+that fit a partly filled slot are found by AND-ing a few bitsets. Layout is a depth-first
+search that keeps crossing new words through placed letters, propagating the letters already
+on the grid as constraints and backtracking out of dead ends within a node and time budget.
+"""
+import random
+import time
+from collections import namedtuple
+
+DEFAULT_GRID_SIZE = 15
+MIN_WORD_LENGTH = 2
+BRANCHING = 3
+MAX_ANCHORS = 16
+NODE_BUDGET = 200
+TIME_BUDGET_S = 0.05
+
+ACROSS = 0
+DOWN = 1
+
+Placement = namedtuple('Placement', ['row', 'col', 'direction', 'word', 'question'])
+
+
+def normalize_word(answer):
+    """Returns the answer as an uppercase grid word, or None if it cannot be placed."""
+    word = answer.strip().upper()
+    return word if len(word) >= MIN_WORD_LENGTH and word.isalpha() else None
+
+
+class WordIndex:
+    """
+    Letter-at-position index over a question bank.
+
+    For every answer length it keeps the words of that length and, per (position, letter),
+    an int bitset with bit i set when word i has that letter there.
+    """
+    def __init__(self, questions, max_length=None):
+        self.words = {}
+        self.questions = {}
+        self.bits = {}
+        self.all_bits = {}
+        seen = set()
+        for question in questions:
+            word = normalize_word(question.answer)
+            if word is None or word in seen or (max_length and len(word) > max_length):
+                continue
+            seen.add(word)
+            length = len(word)
+            index = len(self.words.setdefault(length, []))
+            self.words[length].append(word)
+            self.questions.setdefault(length, []).append(question)
+            positions = self.bits.setdefault(length, [{} for _ in range(length)])
+            bit = 1 << index
+            for pos, letter in enumerate(word):
+                positions[pos][letter] = positions[pos].get(letter, 0) | bit
+        for length, words in self.words.items():
+            self.all_bits[length] = (1 << len(words)) - 1
+        self.lengths = sorted(self.words)
+
+    def matching(self, length, fixed, exclude=0):
+        """
+        Returns the bitset of words of `length` with the given letters fixed.
+
+        Args:
+            length (int): Word length.
+            fixed (list): (position, letter) pairs.
+            exclude (int): Bitset of words to leave out, e.g. words already on the grid.
+        """
+        mask = self.all_bits.get(length, 0) & ~exclude
+        positions = self.bits.get(length)
+        for pos, letter in fixed:
+            if not mask:
+                break
+            mask &= positions[pos].get(letter, 0)
+        return mask
+
+
+def iter_bits(mask, start=0):
+    """Yields the indexes of set bits, beginning at bit `start` and wrapping around."""
+    high = mask >> start << start
+    for part in (high, mask ^ high):
+        while part:
+            low = part & -part
+            yield low.bit_length() - 1
+            part ^= low
+
+
+class Crossword:
+    """A generated grid: placed words with their clues and the letters per cell."""
+    def __init__(self, size, placements):
+        self.size = size
+        self.placements = list(placements)
+        self.cells = [[None] * size for _ in range(size)]
+        for placement in self.placements:
+            for i, letter in enumerate(placement.word):
+                row, col = _cell(placement, i)
+                self.cells[row][col] = letter
+
+    def numbered_clues(self):
+        """Returns [(number, direction, placement)] numbered in reading order, as printed crosswords do."""
+        starts = sorted({(p.row, p.col) for p in self.placements})
+        numbers = {start: n for n, start in enumerate(starts, 1)}
+        return sorted(((numbers[(p.row, p.col)], p.direction, p) for p in self.placements),
+                      key=lambda item: (item[1], item[0]))
+
+    def to_text(self):
+        """Renders the grid as text, with '.' for blocked cells."""
+        return "\n".join("".join(letter or "." for letter in row) for row in self.cells)
+
+
+def _cell(placement, i):
+    if placement.direction == ACROSS:
+        return placement.row, placement.col + i
+    return placement.row + i, placement.col
+
+
+class _Layout:
+    """Mutable search state of one grid generation."""
+    def __init__(self, index, size, rng, deadline, node_budget):
+        self.index = index
+        self.size = size
+        self.rng = rng
+        self.deadline = deadline
+        self.nodes_left = node_budget
+        self.letters = [None] * (size * size)
+        self.directions = [0] * (size * size)
+        self.used = {length: 0 for length in index.lengths}
+        self.placements = []
+        self.best = []
+
+    def free(self, row, col):
+        return not (0 <= row < self.size and 0 <= col < self.size) or self.letters[row * self.size + col] is None
+
+    def place(self, row, col, direction, length, word_index):
+        word = self.index.words[length][word_index]
+        dr, dc = (0, 1) if direction == ACROSS else (1, 0)
+        written = []
+        for i, letter in enumerate(word):
+            cell = (row + dr * i) * self.size + col + dc * i
+            if self.letters[cell] is None:
+                self.letters[cell] = letter
+                written.append(cell)
+            self.directions[cell] |= 1 << direction
+        self.used[length] |= 1 << word_index
+        question = self.index.questions[length][word_index]
+        self.placements.append((Placement(row, col, direction, word, question), word_index, written))
+        if len(self.placements) > len(self.best):
+            self.best = [entry[0] for entry in self.placements]
+
+    def undo(self):
+        placement, word_index, written = self.placements.pop()
+        dr, dc = (0, 1) if placement.direction == ACROSS else (1, 0)
+        for i in range(len(placement.word)):
+            self.directions[(placement.row + dr * i) * self.size + placement.col + dc * i] &= \
+                ~(1 << placement.direction)
+        for cell in written:
+            self.letters[cell] = None
+        self.used[len(placement.word)] &= ~(1 << word_index)
+
+    def _open_cell(self, row, col, direction):
+        """True if a new word in `direction` may cover this cell."""
+        cell = row * self.size + col
+        if self.letters[cell] is not None:
+            return not self.directions[cell] & (1 << direction)
+        if direction == ACROSS:
+            return self.free(row - 1, col) and self.free(row + 1, col)
+        return self.free(row, col - 1) and self.free(row, col + 1)
+
+    def candidates(self):
+        """
+        Lists possible placements crossing the grid, best first.
+        Spans are derived from the cells around an anchor letter; their fixed letters are
+        intersected through the index, so only words that fit are ever considered.
+        """
+        size = self.size
+        max_length = self.index.lengths[-1]
+        anchors = [cell for cell in range(size * size)
+                   if self.letters[cell] is not None and self.directions[cell] != 3]
+        anchors = self.rng.sample(anchors, min(len(anchors), MAX_ANCHORS))
+        offsets = {}
+        found = []
+        for cell in anchors:
+            row, col = divmod(cell, size)
+            direction = DOWN if self.directions[cell] & (1 << ACROSS) else ACROSS
+            dr, dc = (0, 1) if direction == ACROSS else (1, 0)
+            along = col if direction == ACROSS else row
+
+            low = along
+            while low - 1 >= 0 and self._open_cell(row - dr * (along - low + 1), col - dc * (along - low + 1),
+                                                   direction):
+                low -= 1
+            high = along
+            while high + 1 < size and self._open_cell(row + dr * (high + 1 - along), col + dc * (high + 1 - along),
+                                                      direction):
+                high += 1
+
+            for start in range(max(low, along - max_length + 1), along + 1):
+                start_row, start_col = (row, start) if direction == ACROSS else (start, col)
+                if not self.free(start_row - dr, start_col - dc):
+                    continue
+                for end in range(max(along, start + MIN_WORD_LENGTH - 1), min(high, start + max_length - 1) + 1):
+                    length = end - start + 1
+                    if length not in self.used or not self.free(start_row + dr * length, start_col + dc * length):
+                        continue
+                    fixed = []
+                    for i in range(length):
+                        letter = self.letters[(start_row + dr * i) * size + start_col + dc * i]
+                        if letter is not None:
+                            fixed.append((i, letter))
+                    mask = self.index.matching(length, fixed, self.used[length])
+                    if not mask:
+                        continue
+                    if length not in offsets:
+                        offsets[length] = self.rng.randrange(len(self.index.words[length]))
+                    word_index = next(iter_bits(mask, offsets[length]))
+                    found.append((len(fixed), length, (start_row, start_col, direction, length, word_index)))
+        found.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+        return [entry[2] for entry in found]
+
+    def search(self, target_words):
+        """Depth-first placement with backtracking; returns True once `target_words` are placed."""
+        if len(self.placements) >= target_words:
+            return True
+        if self.nodes_left <= 0 or time.perf_counter() > self.deadline:
+            return False
+        self.nodes_left -= 1
+        tried = set()
+        for row, col, direction, length, word_index in self.candidates():
+            if (length, word_index) in tried:
+                continue
+            tried.add((length, word_index))
+            self.place(row, col, direction, length, word_index)
+            if self.search(target_words):
+                return True
+            self.undo()
+            if len(tried) >= BRANCHING:
+                break
+        return False
+
+
+def generate_crossword(questions, size=DEFAULT_GRID_SIZE, target_words=None, seed=None,
+                       time_budget=TIME_BUDGET_S, node_budget=NODE_BUDGET, index=None):
+    """
+    Lays out an interlocking crossword from a question bank.
+
+    Args:
+        questions (list): Objects with `question` and `answer` attributes.
+        size (int): Grid width and height.
+        target_words (int, optional): Stop once this many words are placed; defaults to size * size // 8.
+        seed (optional): Seed for a reproducible layout.
+        time_budget (float): Seconds after which the best layout found so far is returned.
+        node_budget (int): Maximum number of search steps.
+        index (WordIndex, optional): Prebuilt index of `questions`; pass it to reuse it across grids.
+    Returns:
+        Crossword: The densest layout found; empty if no answer fits.
+    """
+    index = index if index is not None else WordIndex(questions, max_length=size)
+    rng = random.Random(seed)
+    target_words = target_words or size * size // 8
+    layout = _Layout(index, size, rng, time.perf_counter() + time_budget, node_budget)
+
+    lengths = [length for length in index.lengths if length <= size]
+    if not lengths:
+        return Crossword(size, [])
+    length = rng.choice(lengths[len(lengths) // 2:])
+    word_index = rng.randrange(len(index.words[length]))
+    layout.place(size // 2, (size - length) // 2, ACROSS, length, word_index)
+    layout.search(target_words)
+    return Crossword(size, layout.best)
+
+
+def build_crossword(language, difficulty, size=DEFAULT_GRID_SIZE, seed=None):
+    """Generates a crossword from the question pool of a language and difficulty."""
+    from questionDraw import question_pool
+    return generate_crossword(question_pool(language, difficulty), size=size, seed=seed)
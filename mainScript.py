@@ -1,8 +1,11 @@
+import os
+import sys
+import time
 import tkinter as tk
-from auth_module import start_registration
 from tkinter import messagebox
-from databaseLogic import Session, Player
-from pdfLogic import generate_players_list_pdf
+
+STARTUP_STARTED = time.perf_counter()
+STARTUP_PROBE = os.environ.get("CROSSWORD_STARTUP_PROBE") == "1"
 
 selected_players = None
 selected_difficulty = None
@@ -12,6 +15,7 @@ selected_language = None
 label_players_chosen = None
 label_difficulty_chosen = None
 label_mode_chosen = None
+players_report_label = None
 
 FONT_TITLE = ("Lucida Console", 70, "bold")
 FONT_BUTTON = ("Lucida Console", 35, "bold")
@@ -28,6 +32,8 @@ BUTTON_NORMAL_BG = 'silver'
 BUTTON_WIDTH = 12
 BUTTON_HEIGHT = 1
 
+REPORT_POLL_MS = 100
+
 
 def on_enter(e):
     """Event handler for button hover (mouse enter)."""
@@ -201,6 +207,7 @@ def check_ready(error_message):
         error_message (str): The message to display if settings are incomplete.
     """
     if selected_players.get() > 0 and selected_difficulty.get() and selected_mode.get():
+        from auth_module import start_registration
         start_registration(
             game_frame,
             num_players=selected_players.get(),
@@ -252,44 +259,107 @@ def settings_menu():
               font=FONT_BUTTON, command=window_settings.destroy).place(x=120, y=480)
 
 
-def show_players():
-    """Displays the list of registered players with their statistics."""
-    clear_frame(players_frame)
+def download_players_pdf():
+    """Shows the cached players PDF if the players table is unchanged, else generates it in a separate process.
 
-    tk.Label(players_frame, text="Players List", font=("Lucida Console", 40), bg=COLOR_BG).pack(pady=40)
+    The cache lookup runs on the database worker; pdfLogic (and fpdf) is only imported when a report is rendered.
+    """
+    from dbWorker import run_db_job
+    from reportCache import find_players_report
+    label = players_report_label
+    label.config(text="Generating PDF...")
+    run_db_job(window, find_players_report,
+               on_done=lambda filenames: _show_cached_players_report(label, filenames),
+               on_error=lambda error: _start_players_report(label))
+
+
+def _show_cached_players_report(label, filenames):
+    if not label.winfo_exists():
+        return
+    if filenames:
+        label.config(text=f"PDF saved: {', '.join(filenames)}")
+    else:
+        _start_players_report(label)
 
-    session = Session()
-    players = session.query(Player).all()
-    session.close()
 
-    if not players:
-        tk.Label(players_frame, text="No players found.", font=FONT_LABEL_MEDIUM, bg=COLOR_BG).pack(pady=20)
-    else:
-        canvas = tk.Canvas(players_frame, bg=COLOR_BG, highlightthickness=0)
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+def _start_players_report(label):
+    from pdfLogic import ReportJob
+    window.after(REPORT_POLL_MS, poll_players_report, ReportJob("players", "--cache"), label)
+
+
+def poll_players_report(job, label):
+    """Updates the report status label from the report process events until it finishes.
+
+    Polling stops once the label is gone, i.e. the Players screen was left; the process still
+    finishes on its own and fills the report cache.
 
-        scrollbar = tk.Scrollbar(players_frame, orient="vertical", command=canvas.yview)
-        scrollbar.pack(side=tk.RIGHT, fill="y")
+    Args:
+        job (ReportJob): The running players report.
+        label (tk.Label): Status label of the Players screen that started the report.
+    """
+    if not label.winfo_exists():
+        return
+    for event in job.poll():
+        if event[0] == "progress":
+            _, done, total = event
+            label.config(text=f"Generating PDF... {done * 100 // max(total, 1)}%")
+        elif event[0] == "done":
+            label.config(text=f"PDF saved: {', '.join(event[1])}")
+            return
+        else:
+            label.config(text=f"PDF failed: {event[1]}")
+            return
+    window.after(REPORT_POLL_MS, poll_players_report, job, label)
+
+
+def report_startup_probe():
+    """Prints the time from module start to the first drawn main menu and closes the window.
+
+    Enabled with CROSSWORD_STARTUP_PROBE=1; used by `python benchmarks.py startup`.
+    """
+    window.update()
+    elapsed_ms = (time.perf_counter() - STARTUP_STARTED) * 1000
+    loaded = sorted(name for name in ("sqlalchemy", "fpdf", "databaseLogic", "questionsLogic")
+                    if name in sys.modules)
+    print(f"STARTUP_PROBE first_menu_ms={elapsed_ms:.1f} loaded={','.join(loaded) or '-'}", flush=True)
+    window.destroy()
 
 
-        inner_frame = tk.Frame(canvas, bg=COLOR_BG)
-        canvas_window = canvas.create_window((0, 0), window=inner_frame, anchor="n")
+def shutdown_background_work():
+    """Commits the game results still queued and stops the database worker once the window is closed.
 
-        def on_canvas_resize(event):
-            canvas.itemconfig(canvas_window, width=event.width)
-            canvas.configure(scrollregion=canvas.bbox("all"))
+    Only modules this session loaded are touched, so closing from the menu imports nothing.
+    """
+    results = sys.modules.get("resultsLogic")
+    if results is not None:
+        try:
+            results.result_writer.close()
+        except Exception as e:
+            print(f"Saving game results failed: {e}")
+    worker = sys.modules.get("dbWorker")
+    if worker is not None:
+        worker.get_worker().shutdown(wait=True)
 
-        canvas.bind("<Configure>", on_canvas_resize)
 
-        for p in players:
-            info = f"Name: {p.name} | Games Played: {p.games_played} | Wins: {p.wins} | Losses: {p.losses}"
-            tk.Label(inner_frame, text=info, font=FONT_PLAYER_INFO, bg=COLOR_BG, anchor="center").pack(pady=5, fill=tk.X, expand=True)
+def show_players():
+    """Displays the list of registered players with their statistics.
 
-        canvas.config(scrollregion=canvas.bbox("all"))
+    The list is virtualized: only visible rows are drawn and pages are loaded on demand.
+    """
+    from playersView import VirtualPlayersList
+    clear_frame(players_frame)
+
+    tk.Label(players_frame, text="Players List", font=("Lucida Console", 40), bg=COLOR_BG).pack(pady=40)
 
+    players_list = VirtualPlayersList(players_frame, font=FONT_PLAYER_INFO, bg=COLOR_BG)
+    players_list.pack(fill=tk.BOTH, expand=True, padx=40, pady=(0, 280))
 
     create_styled_button(players_frame, "Download Players PDF", 100, screen_height - 250,
-                         command=generate_players_list_pdf)
+                         command=download_players_pdf)
+
+    global players_report_label
+    players_report_label = tk.Label(players_frame, text="", font=FONT_PLAYER_INFO, bg=COLOR_BG)
+    players_report_label.place(x=1000, y=screen_height - 230)
 
     create_styled_button(players_frame, "Back to Menu", 100, screen_height - 160, command=show_main_menu)
     show_frame(players_frame)
@@ -341,4 +411,11 @@ BUTTON_POS_Y_SETT = 200
 
 show_main_menu()
 
-window.mainloop()
\ No newline at end of file
+if STARTUP_PROBE:
+    window.after_idle(report_startup_probe)
+else:
+    from stallWatchdog import start_watchdog
+    start_watchdog(window)
+
+window.mainloop()
+shutdown_background_work()
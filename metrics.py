@@ -0,0 +1,236 @@
+"""
+Timing histograms for the game's hot paths.
+
+Metrics are off unless the CROSSWORD_METRICS environment variable names an output file when the
+game starts, e.g. CROSSWORD_METRICS=metrics.prom or CROSSWORD_METRICS=metrics.json. While off,
+`timed` returns the decorated function itself, so decorated code runs exactly as before, and
+`timer` returns a shared no-op context. While on, every observation lands in a fixed-bucket
+histogram and the registry is written to the file at exit (Prometheus text, or JSON for *.json).
+"""
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+METRICS_ENV = "CROSSWORD_METRICS"
+METRIC_PREFIX = "crossword_"
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+clock = time.perf_counter
+
+
+class Histogram:
+    """Counts observations (seconds) into fixed upper-bound buckets, plus their sum and count."""
+    def __init__(self, name, help_text="", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+            if value > self.max:
+                self.max = value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "help": self.help,
+                "count": self.count,
+                "sum": self.sum,
+                "max": self.max,
+                "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+            }
+
+
+class Counter:
+    """Monotonic event counter."""
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        with self._lock:
+            return {"help": self.help, "value": self.value}
+
+
+class MetricsRegistry:
+    """Named histograms and counters, created on first use."""
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, help_text=""):
+        metric = self.histograms.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.histograms.setdefault(name, Histogram(name, help_text))
+        return metric
+
+    def counter(self, name, help_text=""):
+        metric = self.counters.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.counters.setdefault(name, Counter(name, help_text))
+        return metric
+
+    def snapshot(self):
+        """Returns every metric as a JSON-ready dict."""
+        return {
+            "histograms": {name: metric.snapshot() for name, metric in sorted(self.histograms.items())},
+            "counters": {name: metric.snapshot() for name, metric in sorted(self.counters.items())},
+        }
+
+    def to_prometheus(self):
+        """Renders the registry in the Prometheus text exposition format."""
+        lines = []
+        for name, metric in sorted(self.counters.items()):
+            full = METRIC_PREFIX + name
+            snap = metric.snapshot()
+            if snap["help"]:
+                lines.append(f"# HELP {full} {snap['help']}")
+            lines.append(f"# TYPE {full} counter")
+            lines.append(f"{full} {snap['value']}")
+        for name, metric in sorted(self.histograms.items()):
+            full = METRIC_PREFIX + name
+            snap = metric.snapshot()
+            if snap["help"]:
+                lines.append(f"# HELP {full} {snap['help']}")
+            lines.append(f"# TYPE {full} histogram")
+            cumulative = 0
+            for bound, count in snap["buckets"].items():
+                cumulative += count
+                lines.append(f'{full}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{full}_sum {snap['sum']:.6f}")
+            lines.append(f"{full}_count {snap['count']}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Writes the registry to `path`: JSON for *.json, Prometheus text otherwise."""
+        if path.endswith(".json"):
+            text = json.dumps(self.snapshot(), indent=2)
+        else:
+            text = self.to_prometheus()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+registry = MetricsRegistry()
+_output_path = os.environ.get(METRICS_ENV) or None
+enabled = _output_path is not None
+
+
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(clock() - self.started)
+        return False
+
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_TIMER = _NoTimer()
+
+
+def timer(name, help_text=""):
+    """
+    Context manager timing its block into the `name` histogram.
+
+    While metrics are off this still costs a call and a with-block (a few hundred ns), so hot
+    paths such as answer checks use `timed` instead, which costs nothing when off.
+
+    Example:
+        with metrics.timer("pdf_players_list_seconds"):
+            ...
+    """
+    if not enabled:
+        return _NO_TIMER
+    return _Timer(registry.histogram(name, help_text))
+
+
+def timed(name, help_text=""):
+    """Decorator timing every call of a function; returns the function unchanged while metrics are off."""
+    def decorate(fn):
+        if not enabled:
+            return fn
+        histogram = registry.histogram(name, help_text)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(clock() - started)
+        return wrapper
+    return decorate
+
+
+def observe(name, seconds, help_text=""):
+    """Records one duration measured by the caller."""
+    if enabled:
+        registry.histogram(name, help_text).observe(seconds)
+
+
+def count(name, amount=1, help_text=""):
+    """Increments a counter."""
+    if enabled:
+        registry.counter(name, help_text).inc(amount)
+
+
+def time_future(name, future, help_text=""):
+    """Records the time from now until `future` finishes, e.g. a queued database write."""
+    if not enabled:
+        return future
+    histogram = registry.histogram(name, help_text)
+    started = clock()
+    future.add_done_callback(lambda _: histogram.observe(clock() - started))
+    return future
+
+
+def dump(path=None):
+    """Writes the registry to `path`, or to the CROSSWORD_METRICS file."""
+    path = path or _output_path
+    if path:
+        registry.dump(path)
+    return path
+
+
+if enabled:
+    atexit.register(dump)
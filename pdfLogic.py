@@ -1,9 +1,51 @@
+import argparse
+import os
+import queue
+import subprocess
+import sys
+import threading
 from fpdf import FPDF
 from datetime import datetime
-from databaseLogic import Session, Player, Game
+from databaseLogic import Session
+from playersLogic import count_players, iter_players
+from metrics import timed
+from reportCache import ROWS_PER_VOLUME, ReportCache, players_report_key
+
+REPORT_CHUNK_SIZE = 1000
+PLAYERS_COL_WIDTHS = [60, 30, 30, 30]
+
+
+class _ChunkedBuffer:
+    """
+    Append-only stand-in for FPDF's string output buffer.
+    FPDF grows one str with `+=`, which copies the whole document on every line written;
+    collecting the pieces in a list keeps output linear in the document size.
+    """
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+
+    def __iadd__(self, text):
+        self.parts.append(text)
+        self.length += len(text)
+        return self
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        return ''.join(self.parts)
+
+    def encode(self, *args):
+        return str(self).encode(*args)
 
 
 class PDF(FPDF):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if isinstance(self.buffer, str):
+            self.buffer = _ChunkedBuffer()
+
     def header(self):
         self.set_font('Arial', 'B', 15)
         self.cell(0, 10, 'Crossword Game Report', 0, 1, 'C')
@@ -15,18 +57,30 @@ class PDF(FPDF):
         self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
 
 
+@timed("pdf_game_results_seconds", "Rendering one game results PDF")
 def generate_game_results_pdf(players_scores: dict, difficulty: str, mode: str, filename_prefix="game_results"):
     pdf = PDF()
+    render_game_results(pdf, players_scores, difficulty, mode, datetime.now())
+
+    filename = f"{filename_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    pdf.output(filename)
+    print(f"Game results PDF generated: {filename}")
+    return filename
+
+
+def render_game_results(pdf, players_scores, difficulty, mode, played_at, title="Game Summary Report"):
+    """Draws the game summary page (settings, date and the scores table) into `pdf`."""
     pdf.add_page()
 
     pdf.set_font("Arial", "B", 20)
-    pdf.cell(0, 15, "Game Summary Report", 0, 1, "C")
+    pdf.cell(0, 15, title, 0, 1, "C")
     pdf.ln(10)
 
     pdf.set_font("Arial", "", 12)
     pdf.cell(0, 8, f"Difficulty: {difficulty}", 0, 1)
     pdf.cell(0, 8, f"Game Mode: {mode}", 0, 1)
-    pdf.cell(0, 8, f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 0, 1)
+    if played_at is not None:
+        pdf.cell(0, 8, f"Date: {played_at.strftime('%Y-%m-%d %H:%M:%S')}", 0, 1)
     pdf.ln(10)
 
     pdf.set_font("Arial", "B", 14)
@@ -60,53 +114,208 @@ def generate_game_results_pdf(players_scores: dict, difficulty: str, mode: str,
         pdf.cell(col_widths[2], 10, status, 1, 1, "C")
 
 
-    filename = f"{filename_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    pdf.output(filename)
-    print(f"Game results PDF generated: {filename}")
-    return filename
-
-
-def generate_players_list_pdf(filename_prefix="players_list"):
-    session = Session()
-    players = session.query(Player).all()
-    session.close()
-
+def _players_list_pdf(page_title):
+    """Starts a players list document and returns it with its table header drawn."""
     pdf = PDF()
     pdf.add_page()
 
-
     pdf.set_font("Arial", "B", 20)
-    pdf.cell(0, 15, "Registered Players List", 0, 1, "C")
+    pdf.cell(0, 15, page_title, 0, 1, "C")
     pdf.ln(10)
 
     pdf.set_font("Arial", "", 12)
     pdf.cell(0, 8, f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 0, 1)
     pdf.ln(10)
+    return pdf
 
-    if not players:
-        pdf.set_font("Arial", "", 14)
-        pdf.cell(0, 10, "No players registered yet.", 0, 1, "C")
-    else:
-        pdf.set_font("Arial", "B", 10)
 
-        col_widths = [60, 30, 30, 30]
+def _players_table_header(pdf):
+    pdf.set_font("Arial", "B", 10)
+    pdf.cell(PLAYERS_COL_WIDTHS[0], 10, "Name", 1, 0, "C")
+    pdf.cell(PLAYERS_COL_WIDTHS[1], 10, "Games", 1, 0, "C")
+    pdf.cell(PLAYERS_COL_WIDTHS[2], 10, "Wins", 1, 0, "C")
+    pdf.cell(PLAYERS_COL_WIDTHS[3], 10, "Losses", 1, 1, "C")
+    pdf.set_font("Arial", "", 10)
 
-        pdf.cell(col_widths[0], 10, "Name", 1, 0, "C")
-        pdf.cell(col_widths[1], 10, "Games", 1, 0, "C")
-        pdf.cell(col_widths[2], 10, "Wins", 1, 0, "C")
-        pdf.cell(col_widths[3], 10, "Losses", 1, 1, "C")
 
-        pdf.set_font("Arial", "", 10)
+@timed("pdf_players_list_seconds", "Rendering the players list PDF")
+def generate_players_list_pdf(filename_prefix="players_list", progress=None, rows_per_volume=ROWS_PER_VOLUME):
+    """
+    Writes the players list PDF, streaming players from SQL in name order in keyset chunks.
 
-        sorted_players = sorted(players, key=lambda p: p.name.lower())
+    FPDF keeps a whole document in memory until output, so reports longer than `rows_per_volume`
+    rows are split into numbered volumes; each volume is written and released before the next starts,
+    which keeps memory bounded by the volume size rather than by the number of players.
 
-        for p in sorted_players:
-            pdf.cell(col_widths[0], 10, p.name, 1, 0, "L")
-            pdf.cell(col_widths[1], 10, str(p.games_played), 1, 0, "C")
-            pdf.cell(col_widths[2], 10, str(p.wins), 1, 0, "C")
-            pdf.cell(col_widths[3], 10, str(p.losses), 1, 1, "C")
+    Args:
+        filename_prefix (str): Prefix of the output file name.
+        progress (callable, optional): Called as progress(rows_done, rows_total) after every chunk.
+        rows_per_volume (int): Maximum number of players per PDF file.
+    Returns:
+        list: The file names, one per volume.
+    """
+    total = count_players()
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filenames = []
+    pdf = None
+    done = 0
 
-    filename = f"{filename_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    pdf.output(filename)
-    print(f"Players list PDF generated: {filename}")
-    return filename
\ No newline at end of file
+    def finish_volume():
+        filename = f"{filename_prefix}_{stamp}.pdf" if not filenames else \
+            f"{filename_prefix}_{stamp}_part{len(filenames) + 1}.pdf"
+        pdf.output(filename)
+        filenames.append(filename)
+
+    for name, games_played, wins, losses in _iter_player_rows():
+        if pdf is None:
+            title = "Registered Players List"
+            if total > rows_per_volume:
+                title += f" ({len(filenames) + 1}/{-(-total // rows_per_volume)})"
+            pdf = _players_list_pdf(title)
+            _players_table_header(pdf)
+        pdf.cell(PLAYERS_COL_WIDTHS[0], 10, name, 1, 0, "L")
+        pdf.cell(PLAYERS_COL_WIDTHS[1], 10, str(games_played), 1, 0, "C")
+        pdf.cell(PLAYERS_COL_WIDTHS[2], 10, str(wins), 1, 0, "C")
+        pdf.cell(PLAYERS_COL_WIDTHS[3], 10, str(losses), 1, 1, "C")
+        done += 1
+        if progress and done % REPORT_CHUNK_SIZE == 0:
+            progress(done, total)
+        if done % rows_per_volume == 0:
+            finish_volume()
+            pdf = None
+
+    if not filenames or pdf is not None:
+        if pdf is None:
+            pdf = _players_list_pdf("Registered Players List")
+            pdf.set_font("Arial", "", 14)
+            pdf.cell(0, 10, "No players registered yet.", 0, 1, "C")
+        finish_volume()
+    if progress:
+        progress(done, total)
+
+    for filename in filenames:
+        print(f"Players list PDF generated: {filename}")
+    return filenames
+
+
+def _iter_player_rows():
+    for _, name, games_played, wins, losses in iter_players(chunk_size=REPORT_CHUNK_SIZE):
+        yield name, games_played, wins, losses
+
+
+def cached_players_list_pdf(progress=None, rows_per_volume=ROWS_PER_VOLUME, cache=None):
+    """
+    Returns the players list from the report cache, rendering it only when the players table
+    changed since the cached copy was made.
+
+    Args:
+        progress (callable, optional): Passed to generate_players_list_pdf on a miss.
+        rows_per_volume (int): Maximum number of players per PDF file.
+        cache (ReportCache, optional): Defaults to the report_cache directory.
+    Returns:
+        list: Paths of the report files.
+    """
+    cache = cache or ReportCache()
+    key = players_report_key(rows_per_volume)
+    files = cache.lookup(key)
+    if files:
+        return files
+    if key is not None:
+        os.makedirs(cache.directory, exist_ok=True)
+    filenames = generate_players_list_pdf(cache.path(key) if key else "players_list", progress, rows_per_volume)
+    if key is None or players_report_key(rows_per_volume) != key:
+        return filenames
+    return cache.store(key, filenames)
+
+
+class ReportJob:
+    """
+    Runs a report in a separate Python process so rendering never blocks the Tk thread.
+
+    The child reports progress on stdout; a reader thread turns those lines into events
+    that the UI collects with `poll` from an `after` callback.
+    """
+    def __init__(self, *args):
+        """
+        Args:
+            *args: Command line arguments for `python pdfLogic.py`, e.g. ("players",).
+        """
+        self.events = queue.Queue()
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), *args],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            cwd=os.getcwd())
+        threading.Thread(target=self._read_output, daemon=True).start()
+
+    def _read_output(self):
+        filenames = []
+        for line in self.process.stdout:
+            kind, _, payload = line.strip().partition(" ")
+            if kind == "PROGRESS":
+                done, total = payload.split("/")
+                self.events.put(("progress", int(done), int(total)))
+            elif kind == "FILE":
+                filenames.append(payload)
+        error = self.process.stderr.read().strip()
+        if self.process.wait() == 0:
+            self.events.put(("done", filenames))
+        else:
+            self.events.put(("error", error.splitlines()[-1] if error else "report process failed"))
+
+    def poll(self):
+        """Returns the events received since the last call, without blocking."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+def _print_progress(done, total):
+    print(f"PROGRESS {done}/{total}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate crossword PDF reports.")
+    sub = parser.add_subparsers(dest="report", required=True)
+    players = sub.add_parser("players", help="registered players list")
+    players.add_argument("--prefix", default="players_list", help="output file name prefix")
+    players.add_argument("--rows-per-volume", type=int, default=ROWS_PER_VOLUME)
+    players.add_argument("--db", help="players database path (defaults to players.db)")
+    players.add_argument("--cache", action="store_true",
+                         help="reuse the cached report while the players table is unchanged (ignores --prefix)")
+    batch = sub.add_parser("batch", help="per-game and per-player reports of a date range, in parallel")
+    batch.add_argument("--since", type=datetime.fromisoformat, help="first date included, e.g. 2026-01-01")
+    batch.add_argument("--until", type=datetime.fromisoformat, help="first date excluded")
+    batch.add_argument("--match", nargs="+", dest="matches", help="only these match ids, e.g. one tournament")
+    batch.add_argument("--out", default="reports", help="output directory")
+    batch.add_argument("--workers", type=int, help="worker processes (defaults to the CPU count)")
+    batch.add_argument("--no-games", action="store_true", help="skip per-game reports")
+    batch.add_argument("--no-players", action="store_true", help="skip per-player reports")
+    batch.add_argument("--db", help="players database path (defaults to players.db)")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        from storage import create_sqlite_engine
+        Session.use_engine(create_sqlite_engine(args.db))
+        if args.report == "players" and args.cache:
+            from databaseLogic import ensure_change_counters
+            ensure_change_counters(Session.engine)
+    if args.report == "players":
+        if args.cache:
+            filenames = cached_players_list_pdf(_print_progress, args.rows_per_volume)
+        else:
+            filenames = generate_players_list_pdf(args.prefix, _print_progress, args.rows_per_volume)
+        for filename in filenames:
+            print(f"FILE {filename}", flush=True)
+    elif args.report == "batch":
+        from batchReports import generate_batch_reports
+        stats = generate_batch_reports(args.db or Session.engine.url.database, args.out, args.since, args.until,
+                                       args.matches, args.workers, not args.no_games, not args.no_players)
+        print(f"{stats['reports']} reports, {stats['bytes'] / 1e6:.1f} MB in {stats['seconds']:.1f} s "
+              f"({stats['reports_per_second']:.0f} reports/s) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import string
+from sqlalchemy import select, func, and_, or_
+from databaseLogic import Session, Player, PLAYER_SORT_KEY
+
+PAGE_SIZE = 100
+
+PLAYER_COLUMNS = (Player.id, Player.name, Player.games_played, Player.wins, Player.losses)
+
+
+_NOCASE_FOLD = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _prefix_filter(prefix):
+    """
+    Case-insensitive name prefix as an index range on the NOCASE sort key.
+
+    NOCASE compares ASCII letters folded to lower case, so the bounds are computed on the folded
+    prefix; an upper bound landing on an upper-case letter (prefix ending in "@") would itself be
+    folded, so it skips past the letters to "[".
+    """
+    if not prefix:
+        return None
+    lower = prefix.translate(_NOCASE_FOLD)
+    bound = ord(lower[-1]) + 1
+    if ord('A') <= bound <= ord('Z'):
+        bound = ord('Z') + 1
+    return and_(PLAYER_SORT_KEY >= lower, PLAYER_SORT_KEY < lower[:-1] + chr(bound))
+
+
+def count_players(prefix=""):
+    """Counts players whose name starts with `prefix` (case-insensitive). Runs on the DB worker."""
+    query = select(func.count()).select_from(Player)
+    condition = _prefix_filter(prefix)
+    if condition is not None:
+        query = query.where(condition)
+    session = Session()
+    try:
+        return session.execute(query).scalar()
+    finally:
+        session.close()
+
+
+def fetch_players_page(prefix="", after_key=None, offset=0, limit=PAGE_SIZE):
+    """
+    Reads one page of players ordered by (name NOCASE, id). Runs on the DB worker.
+
+    Args:
+        prefix (str): Case-insensitive name prefix filter.
+        after_key (tuple, optional): (name, id) of the last row of the previous page; uses keyset
+            pagination through the name index when given.
+        offset (int): Rows to skip when no `after_key` is known (jumping far with the scrollbar).
+        limit (int): Page size.
+    Returns:
+        list: Rows of (id, name, games played, wins, losses).
+    """
+    query = select(*PLAYER_COLUMNS).order_by(PLAYER_SORT_KEY, Player.id).limit(limit)
+    condition = _prefix_filter(prefix)
+    if condition is not None:
+        query = query.where(condition)
+    if after_key is not None:
+        name, player_id = after_key
+        query = query.where(PLAYER_SORT_KEY >= name,
+                            or_(PLAYER_SORT_KEY > name, Player.id > player_id))
+    elif offset:
+        query = query.offset(offset)
+    session = Session()
+    try:
+        return [tuple(row) for row in session.execute(query)]
+    finally:
+        session.close()
+
+
+def iter_players(prefix="", chunk_size=PAGE_SIZE):
+    """
+    Yields every matching player row in (name NOCASE, id) order, reading keyset chunks of `chunk_size`.
+    Only one chunk is held in memory at a time.
+    """
+    after_key = None
+    while True:
+        rows = fetch_players_page(prefix, after_key, limit=chunk_size)
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        after_key = (rows[-1][1], rows[-1][0])
@@ -0,0 +1,189 @@
+import tkinter as tk
+from collections import OrderedDict
+from dbWorker import run_db_job
+from playersLogic import PAGE_SIZE, count_players, fetch_players_page
+
+MAX_CACHED_PAGES = 40
+ROW_HEIGHT = 34
+SEARCH_DELAY_MS = 200
+PAGE_RETRY_MS = 2000
+PLACEHOLDER_TEXT = "..."
+
+
+class VirtualPlayersList(tk.Frame):
+    """
+    Scrollable players list that only materializes the rows currently visible.
+
+    Rows are drawn as pooled canvas text items and loaded page by page on the DB worker,
+    so opening and scrolling cost the same for a hundred or a million players.
+    Typing in the search box filters by name prefix.
+    """
+    def __init__(self, parent, font, bg, row_height=ROW_HEIGHT):
+        super().__init__(parent, bg=bg)
+        self.font = font
+        self.bg = bg
+        self.row_height = row_height
+
+        self.prefix = ""
+        self.total = 0
+        self.top_row = 0
+        self._generation = 0
+        self._pages = OrderedDict()
+        self._page_end_keys = {}
+        self._loading = set()
+        self._items = []
+        self._search_after_id = None
+
+        search_bar = tk.Frame(self, bg=bg)
+        search_bar.pack(fill=tk.X, pady=10)
+        tk.Label(search_bar, text="Search:", font=font, bg=bg).pack(side=tk.LEFT, padx=10)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self._on_search_changed)
+        tk.Entry(search_bar, textvariable=self.search_var, font=font, width=25).pack(side=tk.LEFT)
+        self.status_label = tk.Label(search_bar, text="", font=font, bg=bg)
+        self.status_label.pack(side=tk.LEFT, padx=20)
+
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill="y")
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", lambda e: self._redraw())
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll_rows(3))
+
+        self.reload()
+
+    def reload(self):
+        """Drops cached pages and starts loading the list for the current search prefix."""
+        self._generation += 1
+        self._pages.clear()
+        self._page_end_keys.clear()
+        self._loading.clear()
+        self.top_row = 0
+        self.total = 0
+        self.status_label.config(text="Loading...")
+        generation = self._generation
+        run_db_job(self, count_players, self.prefix,
+                   on_done=lambda total: self._on_count(generation, total),
+                   on_error=lambda error: self._on_load_error(generation, error))
+        self._request_page(0)
+        self._redraw()
+
+    @property
+    def visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height + 1)
+
+    def scroll_rows(self, delta):
+        self._set_top_row(self.top_row + delta)
+
+    def _set_top_row(self, row):
+        row = max(0, min(row, max(0, self.total - self.visible_rows + 1)))
+        if row != self.top_row:
+            self.top_row = row
+            self._redraw()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._set_top_row(int(float(amount) * self.total))
+        elif action == "scroll":
+            step = self.visible_rows - 1 if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+
+    def _on_mouse_wheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _on_search_changed(self, *_):
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DELAY_MS, self._apply_search)
+
+    def _apply_search(self):
+        self._search_after_id = None
+        prefix = self.search_var.get().strip()
+        if prefix != self.prefix:
+            self.prefix = prefix
+            self.reload()
+
+    def _on_count(self, generation, total):
+        if generation != self._generation or not self.winfo_exists():
+            return
+        self.total = total
+        if total:
+            self.status_label.config(text=f"{total} player{'s' if total != 1 else ''}")
+        else:
+            self.status_label.config(text="No players found.")
+        self._redraw()
+
+    def _request_page(self, page):
+        if page in self._pages or page in self._loading:
+            return
+        self._loading.add(page)
+        after_key = self._page_end_keys.get(page - 1) if page else None
+        generation = self._generation
+        run_db_job(self, fetch_players_page, self.prefix, after_key, page * PAGE_SIZE,
+                   on_done=lambda rows: self._on_page(generation, page, rows),
+                   on_error=lambda error: self._on_page_error(generation, page, error))
+
+    def _on_load_error(self, generation, error):
+        if generation != self._generation or not self.winfo_exists():
+            return
+        self.status_label.config(text=f"Could not load players: {error}")
+
+    def _on_page_error(self, generation, page, error):
+        """Shows the error and lets the page be requested again after PAGE_RETRY_MS."""
+        self._on_load_error(generation, error)
+        if generation == self._generation and self.winfo_exists():
+            self.after(PAGE_RETRY_MS, self._retry_page, generation, page)
+
+    def _retry_page(self, generation, page):
+        if generation != self._generation or not self.winfo_exists():
+            return
+        self._loading.discard(page)
+        self._redraw()
+
+    def _on_page(self, generation, page, rows):
+        if generation != self._generation or not self.winfo_exists():
+            return
+        self._loading.discard(page)
+        self._pages[page] = rows
+        if rows:
+            self._page_end_keys[page] = (rows[-1][1], rows[-1][0])
+        while len(self._pages) > MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+        self._redraw()
+
+    def _row_text(self, row):
+        page = self._pages.get(row // PAGE_SIZE)
+        if page is None:
+            self._request_page(row // PAGE_SIZE)
+            return PLACEHOLDER_TEXT
+        self._pages.move_to_end(row // PAGE_SIZE)
+        index = row % PAGE_SIZE
+        if index >= len(page):
+            return ""
+        _, name, games_played, wins, losses = page[index]
+        return f"Name: {name} | Games Played: {games_played} | Wins: {wins} | Losses: {losses}"
+
+    def _redraw(self):
+        """Updates the pooled row items; only items whose text changed are reconfigured."""
+        visible = self.visible_rows
+        center_x = self.canvas.winfo_width() // 2
+        while len(self._items) < visible:
+            y = len(self._items) * self.row_height + self.row_height // 2
+            item = self.canvas.create_text(center_x, y, text="", font=self.font, anchor="center")
+            self._items.append([item, ""])
+
+        for slot, entry in enumerate(self._items):
+            row = self.top_row + slot
+            text = self._row_text(row) if slot < visible and row < self.total else ""
+            item, shown = entry
+            if text != shown:
+                self.canvas.itemconfig(item, text=text)
+                entry[1] = text
+            self.canvas.coords(item, center_x, slot * self.row_height + self.row_height // 2)
+
+        if self.total:
+            self.scrollbar.set(self.top_row / self.total, min(1.0, (self.top_row + visible) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
@@ -0,0 +1,234 @@
+"""
+Per-question difficulty analytics over the game journal.
+
+Every question a player answered or gave up on is one outcome: solved, or not (given up, or only
+wrong answers). load_outcomes turns the journal into NumPy columns with one row per
+outcome (question id, player id, solved flag, milliseconds until the final answer, answers
+given), and question_stats aggregates them per question with bincount and one sort, so tens of
+millions of outcomes take seconds. Parsed columns are cached next to each journal segment
+(<segment>.outcomes.npz) and reused while the segment is unchanged.
+
+Needs numpy (pip install numpy); the rest of the game does not.
+Run with: python questionAnalytics.py [--dir journal] [--min-attempts 30]
+"""
+import argparse
+import json
+import os
+from gameEngine import EVENT_ANSWER, EVENT_GAME_OVER
+from gameJournal import JOURNAL_DIR, RECORD_START, segment_paths
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+MIN_ATTEMPTS = 30
+EASY_MIN_SOLVE_RATE = 0.8
+HARD_MAX_SOLVE_RATE = 0.4
+
+OUTCOME_COLUMNS = ("question_id", "player_id", "solved", "ms", "answers")
+_DTYPES = ("int64", "int64", "bool", "int32", "int16")
+_CACHE_SUFFIX = ".outcomes.npz"
+_PREFIXES = tuple('{"t":"%s"' % kind for kind in (RECORD_START, EVENT_ANSWER, EVENT_GAME_OVER))
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Question analytics need numpy: pip install numpy")
+
+
+def _parse_segment(path):
+    """
+    Reads one journal segment into outcome columns (plain lists).
+    Consecutive answers to the same question in a game form one outcome, closed by an answer
+    to another question or by game over; question and pause records are skipped unparsed.
+    """
+    columns = tuple([] for _ in OUTCOME_COLUMNS)
+    player_ids = {}
+    pending = {}
+
+    def close(game):
+        last = pending.pop(game, None)
+        if last is None:
+            return
+        record, answers = last
+        ids = player_ids.get(game)
+        player_id = ids[record["player"]] if ids and ids[record["player"]] is not None else -1
+        for column, value in zip(columns, (record["q"], player_id, record["correct"], record.get("ms", 0), answers)):
+            column.append(value)
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.startswith(_PREFIXES):
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            kind, game = record["t"], record["game"]
+            if kind == EVENT_ANSWER:
+                if record.get("q") is None:
+                    continue
+                previous = pending.get(game)
+                answers = previous[1] + 1 if previous and previous[0]["q"] == record["q"] else 1
+                if previous and previous[0]["q"] != record["q"]:
+                    close(game)
+                pending[game] = (record, answers)
+            elif kind == RECORD_START:
+                player_ids[game] = record.get("player_ids")
+            else:
+                close(game)
+                player_ids.pop(game, None)
+    for game in list(pending):
+        close(game)
+    return columns
+
+
+def _load_segment(path):
+    size = os.path.getsize(path)
+    cache = path + _CACHE_SUFFIX
+    if os.path.exists(cache):
+        with np.load(cache) as data:
+            if int(data["source_size"]) == size:
+                return {name: data[name] for name in OUTCOME_COLUMNS}
+    lists = _parse_segment(path)
+    columns = {name: np.array(values, dtype=dtype) for name, values, dtype in zip(OUTCOME_COLUMNS, lists, _DTYPES)}
+    try:
+        np.savez(cache, source_size=np.int64(size), **columns)
+    except OSError:
+        pass
+    return columns
+
+
+def load_outcomes(directory=JOURNAL_DIR):
+    """
+    Returns the answer outcomes of every journaled game as a dict of equally long arrays:
+    question_id, player_id (-1 if unknown), solved, ms and answers.
+
+    A question whose answers straddle a segment boundary counts as two outcomes; segments
+    are 8 MB, so this is rare.
+    """
+    _require_numpy()
+    parts = [_load_segment(path) for path in segment_paths(directory)]
+    if not parts:
+        return {name: np.zeros(0, dtype=dtype) for name, dtype in zip(OUTCOME_COLUMNS, _DTYPES)}
+    return {name: np.concatenate([part[name] for part in parts]) for name in OUTCOME_COLUMNS}
+
+
+def _group_medians(keys, values, counts):
+    """Median of `values` per dense integer key, given each key's count; NaN for empty keys."""
+    ordered = (np.sort((keys.astype(np.int64) << 32) | values.astype(np.int64)) & 0xFFFFFFFF).astype(np.float64)
+    starts = np.cumsum(counts) - counts
+    filled = counts > 0
+    low = starts + np.maximum(counts - 1, 0) // 2
+    high = starts + counts // 2
+    medians = np.full(counts.shape, np.nan)
+    medians[filled] = (ordered[low[filled]] + ordered[high[filled]]) / 2
+    return medians
+
+
+def question_stats(outcomes, min_attempts=MIN_ATTEMPTS):
+    """
+    Aggregates outcomes per question.
+
+    Returns:
+        dict: arrays indexed alike, one entry per question with at least one outcome:
+            question_id, attempts, solved, solve_rate, median_ms (of solved outcomes),
+            players (distinct known players) and suggested (index into DIFFICULTIES,
+            -1 when attempts < min_attempts).
+    """
+    _require_numpy()
+    question_ids = outcomes["question_id"]
+    size = int(question_ids.max()) + 1 if question_ids.size else 0
+    attempts = np.bincount(question_ids, minlength=size)
+    solved_mask = outcomes["solved"]
+    solved = np.bincount(question_ids[solved_mask], minlength=size)
+    medians = _group_medians(question_ids[solved_mask], outcomes["ms"][solved_mask], solved)
+
+    known = outcomes["player_id"] >= 0
+    pairs = np.sort((question_ids[known] << 32) | outcomes["player_id"][known])
+    first = np.ones(pairs.shape, dtype=bool)
+    first[1:] = pairs[1:] != pairs[:-1]
+    players = np.bincount(pairs[first] >> 32, minlength=size)
+
+    present = np.nonzero(attempts)[0]
+    attempts, solved = attempts[present], solved[present]
+    solve_rate = solved / attempts
+    suggested = np.where(solve_rate >= EASY_MIN_SOLVE_RATE, 0, np.where(solve_rate < HARD_MAX_SOLVE_RATE, 2, 1))
+    suggested[attempts < min_attempts] = -1
+    return {
+        "question_id": present,
+        "attempts": attempts,
+        "solved": solved,
+        "solve_rate": solve_rate,
+        "median_ms": medians[present],
+        "players": players[present],
+        "suggested": suggested,
+    }
+
+
+def attach_current_difficulty(stats, bind=None):
+    """Adds `language` and `difficulty` (index into DIFFICULTIES, -1 unknown) from words.db to `stats`."""
+    from sqlalchemy import select
+    from questionsLogic import Session, WordQuestion
+
+    bind = bind if bind is not None else Session.engine
+    ids = stats["question_id"]
+    languages = np.full(ids.shape, "", dtype=object)
+    difficulty = np.full(ids.shape, -1, dtype=np.int8)
+    codes = {name: code for code, name in enumerate(DIFFICULTIES)}
+    with bind.connect() as conn:
+        for start in range(0, len(ids), 10_000):
+            chunk = ids[start:start + 10_000].tolist()
+            rows = conn.execute(select(WordQuestion.id, WordQuestion.category, WordQuestion.difficulty).where(
+                WordQuestion.id.in_(chunk))).all()
+            if not rows:
+                continue
+            row_ids = np.array([row[0] for row in rows], dtype=np.int64)
+            positions = np.searchsorted(ids, row_ids)
+            languages[positions] = [row[1] for row in rows]
+            difficulty[positions] = [codes.get(row[2], -1) for row in rows]
+    stats["language"] = languages
+    stats["difficulty"] = difficulty
+    return stats
+
+
+def reclassifications(stats):
+    """Indices of questions whose suggested difficulty differs from the stored one."""
+    return np.nonzero((stats["suggested"] >= 0) & (stats["difficulty"] >= 0)
+                      & (stats["suggested"] != stats["difficulty"]))[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Finds questions that are too easy or too hard for their difficulty.")
+    parser.add_argument("--dir", default=JOURNAL_DIR, help="journal directory")
+    parser.add_argument("--min-attempts", type=int, default=MIN_ATTEMPTS)
+    parser.add_argument("--limit", type=int, default=30, help="reclassifications to list")
+    args = parser.parse_args(argv)
+
+    outcomes = load_outcomes(args.dir)
+    stats = attach_current_difficulty(question_stats(outcomes, args.min_attempts))
+    print(f"{len(outcomes['question_id'])} outcomes of {len(stats['question_id'])} questions")
+    print(f"{'language':<9} {'difficulty':<10} {'questions':>9} {'solve rate':>10} {'median s':>9}")
+    for language in sorted(set(stats["language"].tolist()) - {""}):
+        for code, name in enumerate(DIFFICULTIES):
+            mask = (stats["language"] == language) & (stats["difficulty"] == code)
+            if not mask.any():
+                continue
+            rate = stats["solved"][mask].sum() / stats["attempts"][mask].sum()
+            median = np.nanmedian(stats["median_ms"][mask]) / 1000 if np.isfinite(stats["median_ms"][mask]).any() \
+                else float("nan")
+            print(f"{language:<9} {name:<10} {int(mask.sum()):>9} {rate:>10.1%} {median:>9.1f}")
+
+    moves = reclassifications(stats)
+    moves = moves[np.argsort(-stats["attempts"][moves], kind="stable")][:args.limit]
+    print(f"\n{'id':>8} {'language':<9} {'now':<7} {'suggested':<9} {'attempts':>8} {'solve rate':>10} {'median s':>9}")
+    for i in moves:
+        print(f"{stats['question_id'][i]:>8} {stats['language'][i]:<9} {DIFFICULTIES[stats['difficulty'][i]]:<7} "
+              f"{DIFFICULTIES[stats['suggested'][i]]:<9} {stats['attempts'][i]:>8} {stats['solve_rate'][i]:>10.1%} "
+              f"{stats['median_ms'][i] / 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
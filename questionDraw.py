@@ -0,0 +1,66 @@
+"""
+Question draws for a game, from the binary question pack or from words.db.
+
+With CROSSWORD_QUESTION_PACK set, questions come from that pack and neither words.db nor
+SQLAlchemy is loaded; otherwise questionsLogic (and with it the database) is imported on the
+first draw. questionsLogic re-exports these functions.
+"""
+import os
+import threading
+from metrics import timed
+
+QUESTION_PACK_ENV = "CROSSWORD_QUESTION_PACK"
+
+_question_pack = None
+_pack_lock = threading.Lock()
+
+
+def get_question_pack():
+    """
+    Returns the QuestionPack named by CROSSWORD_QUESTION_PACK, opened once per process,
+    or None when questions come from words.db.
+    """
+    global _question_pack
+    path = os.environ.get(QUESTION_PACK_ENV)
+    if not path:
+        return None
+    if _question_pack is None:
+        with _pack_lock:
+            if _question_pack is None:
+                from questionPack import QuestionPack
+                _question_pack = QuestionPack(path)
+    return _question_pack
+
+
+def question_pool(language, difficulty):
+    """Returns every question of a language and difficulty, from the question pack or the pool cache."""
+    pack = get_question_pack()
+    if pack is not None:
+        return pack.pool(language, difficulty)
+    from questionsLogic import ensure_question_bank, question_cache
+    ensure_question_bank()
+    return question_cache.pool(language, difficulty)
+
+
+@timed("question_draw_seconds", "Drawing the questions of one game")
+def get_random_questions(language: str, difficulty: str, limit: int = 10, seed=None, player_ids=None):
+    """
+    Returns up to `limit` distinct random questions of the given language and difficulty.
+    Questions come from the in-memory pool cache; the database is only read on a cache miss.
+    Passing the same `seed` reproduces the same questions in the same order for an unchanged bank.
+    With `player_ids`, questions any of those players has already seen are avoided; they are
+    drawn only when a bounded number of re-draws finds too few unseen ones.
+    With CROSSWORD_QUESTION_PACK set, questions are drawn from that pack and words.db is not used.
+    """
+    pack = get_question_pack()
+    exclude = None
+    if player_ids:
+        from seenQuestions import get_seen_filters, unseen_by_all
+        filters = get_seen_filters(player_ids)
+        if filters:
+            exclude = unseen_by_all(filters)
+    if pack is not None:
+        return pack.sample(language, difficulty, limit, seed, exclude)
+    from questionsLogic import ensure_question_bank, question_cache
+    ensure_question_bank()
+    return question_cache.sample(language, difficulty, limit, seed, exclude)
@@ -0,0 +1,270 @@
+"""
+Binary question pack: the question bank as one read-only file opened with mmap.
+
+Kiosk installs ship a pack compiled from words.db and set CROSSWORD_QUESTION_PACK=<path>;
+questionDraw then draws questions from the pack without importing the database layer, syncing
+the JSON file or querying words.db. Packs are built from words.db only, so their question ids
+are the words.db ids that players' seen-question histories refer to. Opening a pack reads only
+its header and bucket directory; a draw decodes just the questions it returns, and decoded
+questions are kept (up to DECODED_CACHE_SIZE) so repeated draws reuse them.
+
+Layout, little-endian, every section 4-byte aligned:
+    header          magic b"XWQP", version u16, flags u16, questions u32, buckets u32
+    bucket table    per (category, difficulty): category offset/length, difficulty offset/length
+                    (into the blob), first question u32, question count u32
+    ids             u32 per question, grouped by bucket and ascending within it; a bucket's ids
+                    are the slice [first, first + count)
+    offsets         u32 per string plus one end offset; question i has its question, answer
+                    and answer key at entries 3i, 3i + 1 and 3i + 2
+    blob            UTF-8 text of every string
+
+Compile with: python questionPack.py build questions.pack [--db words.db]
+"""
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+PACK_MAGIC = b"XWQP"
+PACK_VERSION = 1
+DECODED_CACHE_SIZE = 100_000
+
+_HEADER = struct.Struct("<4sHHII")
+_BUCKET = struct.Struct("<IIIIII")
+_QUESTION_OFFSETS = struct.Struct("<IIII")
+_STRINGS_PER_QUESTION = 3
+
+PackedQuestion = namedtuple('PackedQuestion', ['id', 'question', 'answer', 'answer_key', 'difficulty', 'category'])
+
+
+class QuestionPackError(ValueError):
+    """Raised for files that are not question packs of a supported version."""
+
+
+def _iter_database_rows(db_path=None):
+    from sqlalchemy import select
+    from questionsLogic import Session, WordQuestion
+
+    if db_path is None:
+        bind = Session.engine
+    else:
+        from storage import create_sqlite_engine
+        bind = create_sqlite_engine(db_path, pool_size=1, max_overflow=0)
+    table = WordQuestion.__table__
+    query = select(table.c.id, table.c.category, table.c.difficulty, table.c.question, table.c.answer,
+                   table.c.answer_key).order_by(table.c.category, table.c.difficulty, table.c.id)
+    try:
+        with bind.connect() as conn:
+            for row in conn.execute(query.execution_options(yield_per=10_000)):
+                yield tuple(row)
+    finally:
+        if db_path is not None:
+            bind.dispose()
+
+
+def compile_pack(output_path, db_path=None):
+    """
+    Writes a question pack.
+
+    Args:
+        output_path (str): Pack file to create; replaced atomically.
+        db_path (str, optional): words.db-style database to read; defaults to the game's words.db.
+    Returns:
+        int: Number of questions written.
+    """
+    rows = _iter_database_rows(db_path)
+
+    ids = array('I')
+    offsets = array('I', [0])
+    blob = bytearray()
+    names = {}
+    buckets = []
+
+    def add_string(text):
+        blob.extend(text.encode('utf-8'))
+        offsets.append(len(blob))
+
+    def name(text):
+        if text not in names:
+            encoded = text.encode('utf-8')
+            names[text] = (len(blob), len(encoded))
+            blob.extend(encoded)
+        return names[text]
+
+    for question_id, category, difficulty, question, answer, answer_key in rows:
+        if not buckets or buckets[-1][0] != (category, difficulty):
+            buckets.append([(category, difficulty), len(ids), 0])
+        buckets[-1][2] += 1
+        ids.append(question_id)
+        add_string(question)
+        add_string(answer)
+        add_string(answer_key or "")
+    # Bucket names go after the question strings so each question's offsets stay contiguous.
+    table = [(*name(category), *name(difficulty), first, count) for (category, difficulty), first, count in buckets]
+
+    if sys.byteorder != "little":
+        ids.byteswap()
+        offsets.byteswap()
+    temporary = f"{output_path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, len(ids), len(table)))
+        for entry in table:
+            f.write(_BUCKET.pack(*entry))
+        f.write(ids.tobytes())
+        f.write(offsets.tobytes())
+        f.write(blob)
+    os.replace(temporary, output_path)
+    return len(ids)
+
+
+class _PackBucket:
+    """Read-only sequence of the questions of one bucket; items are decoded on access."""
+    def __init__(self, pack, category, difficulty, first, count):
+        self.pack = pack
+        self.category = category
+        self.difficulty = difficulty
+        self.first = first
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("question index out of range")
+        return self.pack.question(self.first + index, self.category, self.difficulty)
+
+
+class QuestionPack:
+    """
+    A compiled question pack mapped into memory.
+
+    Buckets are views over the mapping, so sampling from a pack costs O(k) and reads only the
+    pages holding the drawn questions; nothing is loaded up front.
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Pack file written by compile_pack.
+        Raises:
+            QuestionPackError: If the file is not a supported pack.
+        """
+        self.path = path
+        self._decoded = {}
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise QuestionPackError(f"{path} is empty") from None
+        try:
+            magic, version, _, questions, bucket_count = _HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            magic, version = None, None
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self._map.close()
+            raise QuestionPackError(f"{path} is not a version {PACK_VERSION} question pack")
+        self.size = questions
+        ids_start = _HEADER.size + bucket_count * _BUCKET.size
+        offsets_start = ids_start + 4 * questions
+        self._blob_start = offsets_start + 4 * (_STRINGS_PER_QUESTION * questions + 1)
+        self._offsets_start = offsets_start
+        self._ids = self._u32_view(ids_start, questions)
+        self.buckets = {}
+        for i in range(bucket_count):
+            category_at, category_len, difficulty_at, difficulty_len, first, count = _BUCKET.unpack_from(
+                self._map, _HEADER.size + i * _BUCKET.size)
+            category, difficulty = self._text(category_at, category_len), self._text(difficulty_at, difficulty_len)
+            self.buckets[(category, difficulty)] = _PackBucket(self, category, difficulty, first, count)
+
+    def _u32_view(self, start, count):
+        view = memoryview(self._map)[start:start + 4 * count]
+        if sys.byteorder == "little":
+            return view.cast('I')
+        values = array('I', view)
+        values.byteswap()
+        return values
+
+    def _text(self, at, length):
+        start = self._blob_start + at
+        return self._map[start:start + length].decode('utf-8')
+
+    def question(self, index, category, difficulty):
+        """Returns question `index` (position in the pack, not its id), decoding it on first use."""
+        decoded = self._decoded.get(index)
+        if decoded is not None:
+            return decoded
+        if len(self._decoded) >= DECODED_CACHE_SIZE:
+            self._decoded.clear()
+        decoded = self._decoded[index] = self._decode(index, category, difficulty)
+        return decoded
+
+    def _decode(self, index, category, difficulty):
+        data = self._map
+        question_at, answer_at, key_at, end = _QUESTION_OFFSETS.unpack_from(
+            data, self._offsets_start + 4 * _STRINGS_PER_QUESTION * index)
+        base = self._blob_start
+        return PackedQuestion(self._ids[index], str(data[base + question_at:base + answer_at], 'utf-8'),
+                              str(data[base + answer_at:base + key_at], 'utf-8'),
+                              str(data[base + key_at:base + end], 'utf-8') or None, difficulty, category)
+
+    def pool(self, language, difficulty):
+        """Returns the questions of a bucket as a lazy sequence (empty if the pack has none)."""
+        return self.buckets.get((language, difficulty)) or _PackBucket(self, language, difficulty, 0, 0)
+
+    def sample(self, language, difficulty, k, seed=None, exclude=None):
+        """
+        Returns up to k distinct questions of a bucket, like QuestionPoolCache.sample.
+        Buckets are in id order as in words.db pools, so the same seed draws the same questions.
+        """
+        from samplingLogic import sample_avoiding
+
+        questions = self.pool(language, difficulty)
+        rng = random.Random(seed) if seed is not None else random
+        k = min(k, len(questions))
+        if exclude is None:
+            question, first = self.question, questions.first
+            return [question(first + i, language, difficulty) for i in rng.sample(range(len(questions)), k)]
+        return sample_avoiding(questions, k, rng, exclude)
+
+    def close(self):
+        """Unmaps the file; questions already returned stay valid."""
+        self._decoded.clear()
+        if isinstance(self._ids, memoryview):
+            self._ids.release()
+        self._map.close()
+
+    def __len__(self):
+        return self.size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compiles or inspects binary question packs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="compile words.db into a pack")
+    build.add_argument("output", help="pack file to write")
+    build.add_argument("--db", help="words.db-style database to read (defaults to words.db)")
+    info = sub.add_parser("info", help="list the buckets of a pack")
+    info.add_argument("pack")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = compile_pack(args.output, args.db)
+        print(f"{count} questions -> {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
+    else:
+        pack = QuestionPack(args.pack)
+        for (category, difficulty), bucket in sorted(pack.buckets.items()):
+            print(f"{category:<6} {difficulty:<8} {len(bucket):>9}")
+        print(f"{len(pack)} questions")
+        pack.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,66 +1,468 @@
+import hashlib
+import itertools
 import json
-from sqlalchemy import create_engine, Column, Integer, String
-from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.sql.expression import func
+import os
+import threading
+import time
+from collections import namedtuple
+from sqlalchemy import inspect, bindparam, select, Column, Integer, String, Index
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import declarative_base
+from answerIndex import AnswerIndex, rebuild_answer_index, update_answer_index
+from answerMatching import normalize_answer_key
+from metrics import timed
+from questionDraw import QUESTION_PACK_ENV, get_question_pack, get_random_questions, question_pool
+from samplingLogic import QuestionPoolCache
+from storage import LazySessionFactory, WORDS_DB_PATH, create_sqlite_engine
 
 Base = declarative_base()
 
+CONTENT_KEY = ('question', 'answer', 'difficulty', 'category')
+IMPORT_BATCH_SIZE = 5000
+READ_CHUNK_SIZE = 1 << 16
+HASH_CHUNK_SIZE = 1 << 20
+QUESTIONS_JSON_PATH = "word_questions.json"
+
 
 class WordQuestion(Base):
     __tablename__ = 'word_questions'
+    __table_args__ = (
+        Index('ux_word_questions_content', *CONTENT_KEY, unique=True),
+        Index('ix_word_questions_category_difficulty', 'category', 'difficulty'),
+        Index('ux_word_questions_source', 'source', 'source_key', unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     question = Column(String, nullable=False)
     answer = Column(String, nullable=False)
     difficulty = Column(String, nullable=False)
     category = Column(String, nullable=False)
+    answer_key = Column(String)
+    source = Column(String)  # absolute path of the JSON bank the row is synced from; NULL for imported rows
+    source_key = Column(String)
 
-engine = create_engine('sqlite:///words.db')
-Base.metadata.create_all(engine)
-Session = sessionmaker(bind=engine)
 
+class QuestionSource(Base):
+    """Size, modification time and hash of a JSON bank as of its last sync into word_questions."""
+    __tablename__ = 'question_sources'
 
-def load_questions_from_json_and_update(json_path):
+    path = Column(String, primary_key=True)
+    size = Column(Integer, nullable=False)
+    mtime_ns = Column(Integer, nullable=False)
+    sha256 = Column(String, nullable=False)
+
+
+ImportResult = namedtuple('ImportResult', ['read', 'inserted', 'seconds'])
+SyncResult = namedtuple('SyncResult', ['read', 'inserted', 'updated', 'deleted', 'unchanged', 'seconds', 'unkeyed'])
+SyncResult.__new__.__defaults__ = (0,)
+
+
+def ensure_source_keys(bind):
+    """
+    Adds the source and source_key columns to databases made before JSON banks were synced by key.
+    Keys written before rows recorded their source all came from the one synced bank, so they are
+    given its path when question_sources names exactly one.
+    """
+    with bind.begin() as conn:
+        columns = {column['name'] for column in inspect(conn).get_columns('word_questions')}
+        if 'source_key' not in columns:
+            conn.exec_driver_sql("ALTER TABLE word_questions ADD COLUMN source_key VARCHAR")
+        if 'source' not in columns:
+            conn.exec_driver_sql("ALTER TABLE word_questions ADD COLUMN source VARCHAR")
+            paths = conn.execute(select(QuestionSource.path)).scalars().all()
+            if len(paths) == 1:
+                table = WordQuestion.__table__
+                conn.execute(table.update().where(table.c.source_key.is_not(None)).values(source=paths[0]))
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ux_word_questions_source_key")
+
+
+def ensure_indexes(bind):
+    """
+    Creates indexes missing from databases made before they existed.
+    Duplicate rows left by the old importer are removed before the unique content index is built,
+    keeping the oldest id.
+    """
+    with bind.begin() as conn:
+        if not inspect(conn).has_index('word_questions', 'ux_word_questions_content'):
+            conn.exec_driver_sql(
+                "DELETE FROM word_questions WHERE id NOT IN "
+                "(SELECT MIN(id) FROM word_questions GROUP BY question, answer, difficulty, category)")
+        for index in WordQuestion.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def ensure_answer_keys(bind, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Adds the answer_key column to databases made before it existed and fills every missing key.
+
+    Returns:
+        int: Number of rows whose key was computed.
+    """
+    filled = 0
+    with bind.begin() as conn:
+        columns = {column['name'] for column in inspect(conn).get_columns('word_questions')}
+        if 'answer_key' not in columns:
+            conn.exec_driver_sql("ALTER TABLE word_questions ADD COLUMN answer_key VARCHAR")
+        table = WordQuestion.__table__
+        statement = table.update().where(table.c.id == bindparam('row_id')).values(answer_key=bindparam('key'))
+        last_id = 0
+        while True:
+            rows = conn.execute(select(table.c.id, table.c.answer).where(
+                table.c.answer_key.is_(None), table.c.id > last_id).order_by(table.c.id).limit(batch_size)).all()
+            if not rows:
+                break
+            conn.execute(statement, [{"row_id": row_id, "key": normalize_answer_key(answer)}
+                                     for row_id, answer in rows])
+            filled += len(rows)
+            last_id = rows[-1][0]
+    return filled
+
+
+def _create_words_engine():
+    engine = create_sqlite_engine(WORDS_DB_PATH)
+    Base.metadata.create_all(engine)
+    ensure_source_keys(engine)
+    ensure_indexes(engine)
+    ensure_answer_keys(engine)
+    with engine.begin() as conn:
+        update_answer_index(conn)
+    return engine
+
+
+Session = LazySessionFactory(_create_words_engine)
+
+
+def __getattr__(name):
+    if name == 'engine':
+        return Session.engine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def iter_question_items(json_path, chunk_size=READ_CHUNK_SIZE):
+    """
+    Yields question dicts one by one from a JSON array or an NDJSON file.
+    The file is read in chunks, so memory use does not depend on the bank size.
+    """
     with open(json_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
+        buffer = file.read(chunk_size).lstrip('\ufeff').lstrip()
+        if not buffer.startswith('['):
+            yield from _iter_ndjson(buffer, file)
+            return
+
+        decoder = json.JSONDecoder()
+        pos = 1
+        eof = False
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield item
+            pos = end
+
+
+def _iter_ndjson(head, file):
+    """Yields one item per non-empty line; `head` is the already consumed start of the file."""
+    head += file.readline()
+    for line in itertools.chain(head.splitlines(), file):
+        if line.strip():
+            yield json.loads(line)
+
+
+def _batched(items, size):
+    batch = []
+    for item in items:
+        row = {key: item[key] for key in CONTENT_KEY}
+        row['answer_key'] = normalize_answer_key(row['answer'])
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_import_questions(json_path, bind=None, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Streams questions from a JSON/NDJSON file into the database in batches.
+    Rows already present (same question, answer, difficulty and category) are skipped
+    by the unique content index, so no per-row lookups are needed.
+    New answers are added to the answer index in the same transaction.
+
+    Args:
+        json_path (str): Path to a JSON array or NDJSON file.
+        bind (Engine, optional): Engine to import into. Defaults to the words.db engine.
+        batch_size (int): Number of rows sent per INSERT statement.
+    Returns:
+        ImportResult: Rows read, rows inserted and elapsed seconds.
+    """
+    bind = bind if bind is not None else Session.engine
+    statement = sqlite_insert(WordQuestion).on_conflict_do_nothing()
+    read = inserted = 0
+    started = time.perf_counter()
+    with bind.begin() as conn:
+        for batch in _batched(iter_question_items(json_path), batch_size):
+            read += len(batch)
+            inserted += conn.execute(statement, batch).rowcount
+        if inserted:
+            update_answer_index(conn)
+    return ImportResult(read, inserted, time.perf_counter() - started)
+
+
+def question_source_key(item):
+    """
+    Identity of a bank item within its file: its "id" field if it has one, else its language and
+    clue text. Give items a stable "id": without one, editing a clue's text makes it a new row
+    with a new question id, which players' seen-question histories and question packs don't know.
+    """
+    if item.get('id') is not None:
+        return f"id:{item['id']}"
+    return f"{item['category']}:{item['question']}"
+
 
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_CONTENT_MATCH = " AND ".join(f"w.{name} = b.{name}" for name in CONTENT_KEY)
+_CONTENT_DIFFERS = " OR ".join(f"w.{name} IS NOT b.{name}" for name in CONTENT_KEY)
+
+
+def _stage_bank(conn, json_path, batch_size):
+    """
+    Streams a JSON bank into the temporary table sync_bank, batch by batch.
+    Repeated content is kept once, as the unique content index requires; a key used by several
+    different items gets #2, #3... appended in file order.
+
+    Returns:
+        tuple: (items read, items without an "id")
+    """
+    conn.exec_driver_sql("DROP TABLE IF EXISTS temp.sync_bank")
+    conn.exec_driver_sql(
+        "CREATE TEMP TABLE sync_bank (seq INTEGER PRIMARY KEY, source_key TEXT NOT NULL, question TEXT NOT NULL, "
+        "answer TEXT NOT NULL, difficulty TEXT NOT NULL, category TEXT NOT NULL, answer_key TEXT)")
+    statement = ("INSERT INTO sync_bank (source_key, question, answer, difficulty, category, answer_key) "
+                 "VALUES (?, ?, ?, ?, ?, ?)")
+    read = unkeyed = 0
+    batch = []
+    for item in iter_question_items(json_path):
+        unkeyed += item.get('id') is None
+        batch.append((question_source_key(item), *(item[name] for name in CONTENT_KEY),
+                      normalize_answer_key(item['answer'])))
+        if len(batch) >= batch_size:
+            conn.exec_driver_sql(statement, batch)
+            read += len(batch)
+            batch = []
+    if batch:
+        conn.exec_driver_sql(statement, batch)
+        read += len(batch)
+    content = ', '.join(CONTENT_KEY)
+    conn.exec_driver_sql(f"CREATE INDEX temp.ix_sync_bank_content ON sync_bank ({content})")
+    conn.exec_driver_sql(
+        f"DELETE FROM sync_bank WHERE EXISTS (SELECT 1 FROM sync_bank b INDEXED BY ix_sync_bank_content "
+        f"WHERE {_CONTENT_MATCH.replace('w.', 'sync_bank.')} AND b.seq < sync_bank.seq)")
+    conn.exec_driver_sql("CREATE INDEX temp.ix_sync_bank_key ON sync_bank (source_key)")
+    conn.exec_driver_sql(
+        "UPDATE sync_bank SET source_key = source_key || '#' || n FROM (SELECT seq AS repeat_seq, "
+        "ROW_NUMBER() OVER (PARTITION BY source_key ORDER BY seq) AS n FROM sync_bank WHERE source_key IN "
+        "(SELECT source_key FROM sync_bank GROUP BY source_key HAVING COUNT(*) > 1)) "
+        "WHERE seq = repeat_seq AND n > 1")
+    conn.exec_driver_sql("DROP INDEX temp.ix_sync_bank_key")
+    conn.exec_driver_sql("CREATE UNIQUE INDEX temp.ux_sync_bank_key ON sync_bank (source_key)")
+    return read, unkeyed
+
+
+def _apply_bank(conn, source):
+    """
+    Brings the rows of `source` in line with sync_bank, set-based so memory does not grow with
+    the bank. Items are matched to rows by key, then by content among rows the file no longer
+    keys and rows without a source, so rows imported before keys existed (or whose key changed)
+    keep their ids. Rows of other sources are never changed or deleted: an item whose content
+    already belongs to one is left to that row.
+
+    Returns:
+        tuple: (inserted, updated, deleted, whether an answer or language changed)
+    """
+    params = {"source": source}
+    conn.exec_driver_sql("DROP TABLE IF EXISTS temp.sync_match")
+    conn.exec_driver_sql("CREATE TEMP TABLE sync_match (row_id INTEGER PRIMARY KEY, source_key TEXT NOT NULL UNIQUE)")
+    conn.exec_driver_sql(
+        "INSERT INTO sync_match SELECT w.id, b.source_key FROM sync_bank b "
+        "JOIN word_questions w ON w.source = :source AND w.source_key = b.source_key", params)
+    conn.exec_driver_sql(
+        f"INSERT OR IGNORE INTO sync_match SELECT w.id, b.source_key FROM sync_bank b "
+        f"JOIN word_questions w ON {_CONTENT_MATCH} "
+        f"WHERE b.source_key NOT IN (SELECT source_key FROM sync_match) AND (w.source IS NULL OR "
+        f"(w.source = :source AND w.source_key NOT IN (SELECT source_key FROM sync_bank)))", params)
+    conn.exec_driver_sql(
+        f"DELETE FROM sync_match WHERE source_key IN (SELECT b.source_key FROM sync_bank b "
+        f"JOIN word_questions w ON {_CONTENT_MATCH} "
+        f"WHERE w.id NOT IN (SELECT row_id FROM sync_match) AND w.source IS NOT :source)", params)
+
+    deleted = conn.exec_driver_sql(
+        "DELETE FROM word_questions WHERE source = :source AND id NOT IN (SELECT row_id FROM sync_match)",
+        params).rowcount
+    conn.exec_driver_sql("DROP TABLE IF EXISTS temp.sync_changed")
+    conn.exec_driver_sql(
+        f"CREATE TEMP TABLE sync_changed AS SELECT m.row_id, m.source_key, ({_CONTENT_DIFFERS}) AS content_changed, "
+        f"(w.answer IS NOT b.answer OR w.category IS NOT b.category) AS answer_changed "
+        f"FROM sync_match m JOIN sync_bank b ON b.source_key = m.source_key JOIN word_questions w ON w.id = m.row_id "
+        f"WHERE {_CONTENT_DIFFERS} OR w.source IS NOT :source OR w.source_key IS NOT b.source_key", params)
+    answers_changed = conn.exec_driver_sql("SELECT EXISTS (SELECT 1 FROM sync_changed WHERE answer_changed)").scalar()
+    # Edited rows first get a unique placeholder, so rows that trade contents never collide
+    # on the unique content index in the final update.
+    conn.exec_driver_sql(
+        "UPDATE word_questions SET question = char(0) || 'sync ' || id "
+        "WHERE id IN (SELECT row_id FROM sync_changed WHERE content_changed)")
+    updated = conn.exec_driver_sql(
+        f"UPDATE word_questions SET {', '.join(f'{name} = b.{name}' for name in (*CONTENT_KEY, 'answer_key'))}, "
+        f"source = :source, source_key = b.source_key FROM sync_changed c JOIN sync_bank b ON b.source_key = "
+        f"c.source_key WHERE word_questions.id = c.row_id", params).rowcount
+    inserted = conn.exec_driver_sql(
+        f"INSERT INTO word_questions ({', '.join(CONTENT_KEY)}, answer_key, source, source_key) "
+        f"SELECT {', '.join(f'b.{name}' for name in CONTENT_KEY)}, b.answer_key, :source, b.source_key "
+        f"FROM sync_bank b WHERE b.source_key NOT IN (SELECT source_key FROM sync_match) "
+        f"AND NOT EXISTS (SELECT 1 FROM word_questions w WHERE {_CONTENT_MATCH}) ORDER BY b.seq", params).rowcount
+    for name in ("sync_changed", "sync_match", "sync_bank"):
+        conn.exec_driver_sql(f"DROP TABLE temp.{name}")
+    return inserted, updated, deleted, bool(answers_changed or deleted)
+
+
+def sync_questions_from_json(json_path, bind=None, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Brings the rows synced from a JSON/NDJSON bank in line with it: new items are inserted,
+    edited ones updated in place (keeping their ids) and rows no longer in the file deleted, all
+    in one transaction. Each row records the bank it came from, so rows of other banks or of
+    bulk_import_questions are left alone. Items are identified by their "id" field, or by their
+    clue text if they have none (see question_source_key).
+
+    The file's size, modification time and SHA-256 are recorded in question_sources. While size
+    and mtime match, the sync is a single row lookup; a touched but identical file costs one hash.
+    Otherwise the file is streamed into a temporary table, spilled to disk, and compared with
+    set-based statements, so memory use does not depend on the bank size.
+
+    Args:
+        json_path (str): Path to a JSON array or NDJSON file.
+        bind (Engine, optional): Engine to sync into. Defaults to the words.db engine.
+        batch_size (int): Number of items staged per statement.
+    Returns:
+        SyncResult: Items read, rows inserted, updated and deleted, whether the file was unchanged,
+            elapsed seconds and the number of items without an "id".
+    """
+    bind = bind if bind is not None else Session.engine
+    started = time.perf_counter()
+    path = os.path.abspath(json_path)
+    stat = os.stat(path)
+    with bind.connect() as conn:
+        source = conn.execute(select(QuestionSource.size, QuestionSource.mtime_ns, QuestionSource.sha256).where(
+            QuestionSource.path == path)).first()
+    if source is not None and (source.size, source.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+        return SyncResult(0, 0, 0, 0, True, time.perf_counter() - started)
+
+    sha256 = _file_sha256(path)
+    record = sqlite_insert(QuestionSource).values(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                                                  sha256=sha256)
+    record = record.on_conflict_do_update(index_elements=[QuestionSource.path], set_={
+        'size': record.excluded.size, 'mtime_ns': record.excluded.mtime_ns, 'sha256': record.excluded.sha256})
+    if source is not None and source.sha256 == sha256:
+        with bind.begin() as conn:
+            conn.execute(record)
+        return SyncResult(0, 0, 0, 0, True, time.perf_counter() - started)
+
+    with bind.connect() as conn:
+        temp_store = conn.exec_driver_sql("PRAGMA temp_store").scalar()
+        conn.exec_driver_sql("PRAGMA temp_store = FILE")
+        conn.commit()
+        try:
+            with conn.begin():
+                read, unkeyed = _stage_bank(conn, path, batch_size)
+                inserted, updated, deleted, answers_changed = _apply_bank(conn, path)
+                if answers_changed:
+                    rebuild_answer_index(conn)
+                elif inserted:
+                    update_answer_index(conn)
+                conn.execute(record)
+        finally:
+            conn.exec_driver_sql(f"PRAGMA temp_store = {int(temp_store)}")
+            conn.commit()
+    return SyncResult(read, inserted, updated, deleted, False, time.perf_counter() - started, unkeyed)
+
+
+def load_questions_from_json_and_update(json_path):
+    """
+    Syncs a JSON bank into words.db and drops the cached pools and answer index if rows changed.
+    Errors propagate, so a failed sync reaches the caller and is retried on the next request.
+    """
+    result = sync_questions_from_json(json_path)
+    if result.unchanged:
+        return
+    session = Session()
+    try:
+        total = session.query(WordQuestion).count()
+    finally:
+        session.close()
+    print(
+        f"Synced questions from JSON in {result.seconds:.2f} s ({result.read} read): {result.inserted} new, "
+        f"{result.updated} updated, {result.deleted} removed. Total questions in DB: {total}")
+    if result.unkeyed:
+        print(f"{result.unkeyed} questions have no \"id\"; editing their text will give them new ids.")
+    if result.inserted or result.updated or result.deleted:
+        question_cache.bump_version()
+        answer_index.invalidate()
+
+
+@timed("question_pool_load_seconds", "Loading one (language, difficulty) pool from words.db")
+def _load_pool(language, difficulty):
     session = Session()
-    new_questions_added = 0
     try:
-        for item in data:
-            existing_question = session.query(WordQuestion).filter_by(
-                question=item['question'],
-                answer=item['answer'],
-                difficulty=item['difficulty'],
-                category=item['category']
-            ).first()
-
-            if not existing_question:
-                question = WordQuestion(
-                    question=item['question'],
-                    answer=item['answer'],
-                    difficulty=item['difficulty'],
-                    category=item['category']
-                )
-                session.add(question)
-                new_questions_added += 1
-
-        session.commit()
-        print(
-            f"Loaded {new_questions_added} new questions from JSON. Total questions in DB: {session.query(WordQuestion).count()}")
-    except Exception as e:
-        session.rollback()
-        print(f"An error occurred during loading questions: {e}")
+        return session.query(WordQuestion).filter_by(category=language, difficulty=difficulty).order_by(
+            WordQuestion.id).all()
     finally:
         session.close()
 
 
-load_questions_from_json_and_update("word_questions.json")
+question_cache = QuestionPoolCache(_load_pool)
+answer_index = AnswerIndex(lambda: Session.engine)
+_bank_synced = False
+_sync_lock = threading.Lock()
 
 
-def get_random_questions(language: str, difficulty: str, limit: int = 10):
-    session = Session()
-    questions = session.query(WordQuestion).filter_by(category=language, difficulty=difficulty).order_by(
-        func.random()).limit(limit).all()
-    session.close()
-    return questions
\ No newline at end of file
+def ensure_question_bank():
+    """Syncs word_questions.json into words.db once per process, on the first question request."""
+    global _bank_synced
+    if _bank_synced:
+        return
+    with _sync_lock:
+        if not _bank_synced:
+            load_questions_from_json_and_update(QUESTIONS_JSON_PATH)
+            _bank_synced = True
+
+
+@timed("answer_pattern_query_seconds", "Answer index pattern queries")
+def find_answers(pattern, language, limit=None):
+    """
+    Returns answers of a language matching a pattern, e.g. find_answers("c?s?le", "en").
+    '?', '_' and '.' stand for any letter; "??????" lists every 6-letter answer.
+    """
+    ensure_question_bank()
+    return answer_index.match(pattern, language, limit)
+
+
+def find_anagrams(letters, language, limit=None):
+    """Returns answers of a language spelled with exactly the given letters, for anagram hints."""
+    ensure_question_bank()
+    return answer_index.anagrams(letters, language, limit)
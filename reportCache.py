@@ -0,0 +1,160 @@
+"""
+Cache of generated PDF reports, keyed by the data they were rendered from.
+
+A report's key is a hash of its kind, its parameters and the change counters of the tables it
+reads (databaseLogic.table_versions, bumped by triggers on every write), so an unchanged players
+table maps to the same key and the existing files are returned without touching the rows.
+
+Each entry is a manifest <key>.json listing its files, written only after the files are
+complete. A hit refreshes the manifest's mtime, which is the entry's last use; after every store,
+entries unused for REPORT_CACHE_MAX_AGE are dropped, then the least recently used ones until the
+directory is under REPORT_CACHE_MAX_BYTES.
+"""
+import hashlib
+import json
+import os
+import time
+
+REPORT_CACHE_DIR = os.environ.get("CROSSWORD_REPORT_CACHE", "report_cache")
+REPORT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+REPORT_CACHE_MAX_AGE = 30 * 24 * 3600
+REPORT_FORMAT_VERSION = 1
+PLAYERS_LIST = "players_list"
+ROWS_PER_VOLUME = 50_000
+
+_MANIFEST_SUFFIX = ".json"
+_ORPHAN_AGE = 3600
+
+
+class ReportCache:
+    """Report files of one directory, looked up by key and evicted by age and total size."""
+    def __init__(self, directory=REPORT_CACHE_DIR, max_bytes=REPORT_CACHE_MAX_BYTES, max_age=REPORT_CACHE_MAX_AGE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @staticmethod
+    def key(kind, params, versions):
+        """
+        Args:
+            kind (str): Report kind, e.g. PLAYERS_LIST.
+            params (dict): Parameters that change the output.
+            versions (dict): Change counters of the tables the report reads.
+        Returns:
+            str: <kind>_<hash> naming the cache entry.
+        """
+        text = json.dumps([REPORT_FORMAT_VERSION, kind, params, versions], sort_keys=True, default=str)
+        return f"{kind}_{hashlib.sha256(text.encode()).hexdigest()[:24]}"
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def lookup(self, key):
+        """Returns the cached file paths for `key`, or None when missing or incomplete."""
+        if key is None:
+            return None
+        manifest = self.path(key + _MANIFEST_SUFFIX)
+        try:
+            with open(manifest, encoding="utf-8") as f:
+                files = [self.path(name) for name in json.load(f)["files"]]
+        except (OSError, ValueError, KeyError):
+            return None
+        if not all(os.path.exists(path) for path in files):
+            return None
+        try:
+            os.utime(manifest)
+        except OSError:
+            pass
+        return files
+
+    def store(self, key, files):
+        """
+        Records `files` (already written inside the cache directory) under `key`, then evicts.
+
+        Returns:
+            list: Paths of the stored files.
+        """
+        names = [os.path.basename(path) for path in files]
+        manifest = self.path(key + _MANIFEST_SUFFIX)
+        temporary = f"{manifest}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"files": names, "created": time.time()}, f)
+        os.replace(temporary, manifest)
+        self.evict()
+        return [self.path(name) for name in names]
+
+    def _entries(self):
+        """Returns ([(last_used, manifest, file names, bytes)], {name: (mtime, bytes)} of the other files)."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            listing = {entry.name: entry.stat() for entry in it if entry.is_file()}
+        for name, stat in listing.items():
+            if not name.endswith(_MANIFEST_SUFFIX):
+                continue
+            try:
+                with open(self.path(name), encoding="utf-8") as f:
+                    files = json.load(f)["files"]
+            except (OSError, ValueError, KeyError):
+                files = []
+            size = stat.st_size + sum(listing[file].st_size for file in files if file in listing)
+            entries.append((stat.st_mtime, name, [file for file in files if file in listing], size))
+        referenced = {file for entry in entries for file in entry[2]} | {entry[1] for entry in entries}
+        others = {name: (stat.st_mtime, stat.st_size) for name, stat in listing.items() if name not in referenced}
+        return entries, others
+
+    def _remove(self, *names):
+        for name in names:
+            try:
+                os.remove(self.path(name))
+            except FileNotFoundError:
+                pass
+
+    def evict(self, now=None):
+        """
+        Drops entries older than max_age, then the least recently used until under max_bytes.
+        Unreferenced files (reports of a failed or superseded run) are dropped after an hour.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        now = time.time() if now is None else now
+        entries, others = self._entries()
+        for name, (mtime, _) in others.items():
+            if now - mtime > _ORPHAN_AGE:
+                self._remove(name)
+        entries.sort()
+        total = sum(entry[3] for entry in entries)
+        removed = 0
+        for last_used, manifest, files, size in entries:
+            if now - last_used <= self.max_age and total <= self.max_bytes:
+                break
+            self._remove(manifest, *files)
+            total -= size
+            removed += 1
+        return removed
+
+
+def players_report_key(rows_per_volume, bind=None):
+    """
+    Cache key of the players list for the current contents of the players table, or None
+    when the database has no change counters (see databaseLogic.ensure_change_counters).
+    """
+    from sqlalchemy.exc import OperationalError
+    from databaseLogic import Session, table_versions
+
+    bind = bind if bind is not None else Session.engine
+    try:
+        with bind.connect() as conn:
+            versions = table_versions(conn, ("players",))
+    except OperationalError:
+        return None
+    if "players" not in versions:
+        return None
+    return ReportCache.key(PLAYERS_LIST, {"rows_per_volume": rows_per_volume}, versions)
+
+
+def find_players_report(rows_per_volume=ROWS_PER_VOLUME, cache=None):
+    """Returns the cached players list files if the players table is unchanged since they were rendered."""
+    return (cache or ReportCache()).lookup(players_report_key(rows_per_volume))
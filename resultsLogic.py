@@ -0,0 +1,152 @@
+import threading
+import uuid
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import select, update, insert
+from databaseLogic import Session, Player, Game
+from dbWorker import get_worker
+from metrics import timed
+from seenQuestions import record_seen_questions
+
+GameResult = namedtuple('GameResult', ['scores', 'difficulty', 'mode', 'player_ids', 'question_ids', 'played_at',
+                                       'match_id', 'anonymous'])
+GameResult.__new__.__defaults__ = (None, None, None, None, False)
+
+
+@timed("results_write_seconds", "Committing one batch of game results")
+def write_game_results(results):
+    """
+    Persists finished games in one transaction with set-based statements.
+
+    Players missing from the cached `player_ids` are resolved with a single IN (...) query,
+    counters are bumped with one UPDATE per distinct (games, wins, losses) increment,
+    and all Game rows are inserted in one executemany. Rows of one game share its match_id
+    (a new one when the result has none) and played_at (the write time when missing). The ids of the questions shown are added
+    to every player's seen-question history in the same transaction.
+
+    Anonymous results (games of players who did not log in, e.g. on the game server) are never
+    matched to players by name: their Game rows have no player_id and no counters change.
+
+    Args:
+        results (list[GameResult]): The games to store.
+    """
+    session = Session()
+    try:
+        ids = {}
+        for result in results:
+            if not result.anonymous:
+                ids.update(result.player_ids or {})
+        unknown = {name for result in results if not result.anonymous for name in result.scores if name not in ids}
+        if unknown:
+            ids.update(session.execute(select(Player.name, Player.id).where(Player.name.in_(unknown))).all())
+
+        increments = {}
+        game_rows = []
+        seen = {}
+        for result in results:
+            max_score = max(result.scores.values()) if result.scores else 0
+            played_at = result.played_at or datetime.now()
+            match_id = result.match_id or uuid.uuid4().hex
+            for name, score in result.scores.items():
+                if result.anonymous:
+                    game_rows.append({"player_id": None, "score": score, "difficulty": result.difficulty,
+                                      "mode": result.mode, "played_at": played_at, "match_id": match_id})
+                    continue
+                player_id = ids.get(name)
+                if player_id is None:
+                    continue
+                delta = increments.setdefault(player_id, [0, 0, 0])
+                delta[0] += 1
+                if score == max_score and max_score > 0:
+                    delta[1] += 1
+                else:
+                    delta[2] += 1
+                game_rows.append({
+                    "player_id": player_id,
+                    "score": score,
+                    "difficulty": result.difficulty,
+                    "mode": result.mode,
+                    "played_at": played_at,
+                    "match_id": match_id,
+                })
+                if result.question_ids:
+                    seen.setdefault(player_id, []).extend(result.question_ids)
+
+        players_by_delta = {}
+        for player_id, delta in increments.items():
+            players_by_delta.setdefault(tuple(delta), []).append(player_id)
+        for (games, wins, losses), player_ids in players_by_delta.items():
+            session.execute(
+                update(Player).where(Player.id.in_(player_ids)).values(
+                    games_played=Player.games_played + games,
+                    wins=Player.wins + wins,
+                    losses=Player.losses + losses,
+                ).execution_options(synchronize_session=False))
+        if game_rows:
+            session.execute(insert(Game), game_rows)
+        record_seen_questions(session, seen)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def save_game_results(scores, difficulty, mode, player_ids=None):
+    """Stores a single finished game synchronously."""
+    write_game_results([GameResult(scores, difficulty, mode, player_ids)])
+
+
+class ResultWriter:
+    """
+    Write-behind queue for game results.
+
+    Submitted games are buffered and written by the DB worker; every game submitted before
+    a flush starts is committed in that flush's single transaction.
+    """
+    def __init__(self, worker=None):
+        self._worker = worker if worker is not None else get_worker()
+        self._pending = []
+        self._next_flush = None
+        self._last_flush = None
+        self._lock = threading.Lock()
+
+    def submit(self, result):
+        """
+        Queues a GameResult and returns the Future of the flush that will commit it.
+        """
+        with self._lock:
+            self._pending.append(result)
+            if self._next_flush is None:
+                self._next_flush = self._last_flush = self._worker.submit(self._flush)
+            return self._next_flush
+
+    def flush(self):
+        """Blocks until everything submitted so far is committed."""
+        with self._lock:
+            future = self._last_flush
+        if future is not None:
+            future.result()
+
+    def close(self):
+        """
+        Commits everything submitted so far, then stops the worker once its queued jobs have run.
+        Called on application exit: the worker thread is a daemon and would otherwise be killed
+        with the interpreter, dropping results still waiting for their flush.
+        """
+        try:
+            self.flush()
+        finally:
+            self._worker.shutdown(wait=True)
+
+    def _flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._next_flush = None
+        if batch:
+            write_game_results(batch)
+        return len(batch)
+
+
+result_writer = ResultWriter()
@@ -0,0 +1,148 @@
+import random
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_CACHED_QUESTIONS = 200_000
+SEEN_REDRAWS_PER_QUESTION = 4
+
+
+class QuestionPoolCache:
+    """
+    Memory-resident question pools keyed by (language, difficulty).
+
+    A pool is loaded once through the (category, difficulty) index and kept as a dense list,
+    so drawing k distinct questions costs O(k) and never touches the database.
+    Pools are evicted least-recently-used once the cached question count exceeds `max_questions`,
+    and every pool loaded before the last `bump_version` call is reloaded on its next use.
+    """
+    def __init__(self, load_pool, max_questions=DEFAULT_MAX_CACHED_QUESTIONS):
+        """
+        Args:
+            load_pool (callable): Called as load_pool(language, difficulty) and returns
+                every question of that bucket.
+            max_questions (int): Upper bound on the number of questions kept across all pools.
+        """
+        self._load_pool = load_pool
+        self.max_questions = max_questions
+        self._pools = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def bump_version(self):
+        """Marks every cached pool as stale; called after the question bank changes."""
+        with self._lock:
+            self.version += 1
+
+    def clear(self):
+        """Drops all pools and resets the counters."""
+        with self._lock:
+            self._pools.clear()
+            self._size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def pool(self, language, difficulty):
+        """Returns the question list of a bucket, loading it on a miss or when stale."""
+        key = (language, difficulty)
+        with self._lock:
+            entry = self._pools.get(key)
+            if entry is not None and entry[0] == self.version:
+                self._pools.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            version = self.version
+
+        questions = list(self._load_pool(language, difficulty))
+
+        with self._lock:
+            old = self._pools.pop(key, None)
+            if old is not None:
+                self._size -= len(old[1])
+            self._pools[key] = (version, questions)
+            self._size += len(questions)
+            while self._size > self.max_questions and len(self._pools) > 1:
+                _, (_, evicted) = self._pools.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+        return questions
+
+    def sample(self, language, difficulty, k, seed=None, exclude=None):
+        """
+        Returns up to k distinct questions from a bucket.
+
+        Args:
+            language (str): Question language.
+            difficulty (str): Question difficulty.
+            k (int): Number of questions to draw.
+            seed (optional): Any value accepted by random.Random; the same seed and bank give the same draw.
+            exclude (callable, optional): exclude(question) -> True for questions to avoid, e.g. ones the
+                players have already seen. They are drawn only when a bounded number of re-draws
+                finds too few others, e.g. in a mostly seen bucket.
+        """
+        questions = self.pool(language, difficulty)
+        rng = random.Random(seed) if seed is not None else random
+        k = min(k, len(questions))
+        if exclude is None:
+            return rng.sample(questions, k)
+        return sample_avoiding(questions, k, rng, exclude)
+
+    def stats(self):
+        """Returns the cache counters as a dict."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "pools": len(self._pools),
+                "questions": self._size,
+                "version": self.version,
+            }
+
+
+def sample_avoiding(questions, k, rng, exclude, redraws_per_question=SEEN_REDRAWS_PER_QUESTION):
+    """
+    Draws k questions, preferring ones `exclude` does not reject.
+
+    The plain k-sample is the fast path: only its rejected questions are re-drawn, one random
+    position at a time, so a mostly fresh bucket costs about k exclude checks. Re-draws stop after
+    `redraws_per_question` * k attempts, and the missing questions are then taken from the
+    rejected ones and, if still short, from the rest of the bucket unfiltered, so a fully seen
+    bucket costs O(k) instead of a pass over the whole bucket.
+
+    Args:
+        questions (Sequence): The bucket; only indexed, so a lazily decoded pack bucket works too.
+        k (int): Number of questions to draw, at most len(questions).
+        rng (random.Random): Source of randomness.
+        exclude (callable): Returns True for questions to avoid.
+        redraws_per_question (int): Re-draw attempts allowed per requested question.
+    Returns:
+        list: The drawn questions.
+    """
+    size = len(questions)
+    drawn = rng.sample(range(size), k)
+    taken = set(drawn)
+    chosen, rejected = [], []
+    for index in drawn:
+        (rejected if exclude(questions[index]) else chosen).append(index)
+    attempts = redraws_per_question * k
+    while len(chosen) < k and attempts > 0 and len(taken) < size:
+        attempts -= 1
+        index = rng.randrange(size)
+        if index in taken:
+            continue
+        taken.add(index)
+        if exclude(questions[index]):
+            rejected.append(index)
+        else:
+            chosen.append(index)
+    chosen += rejected[:k - len(chosen)]
+    while len(chosen) < k:
+        index = rng.randrange(size)
+        if index not in taken:
+            taken.add(index)
+            chosen.append(index)
+    return [questions[index] for index in chosen]
@@ -0,0 +1,154 @@
+"""
+Per-player memory of the questions already shown, so draws can avoid repeats.
+
+Each player's history is a SeenFilter: two generations of a fixed-size Bloom filter over
+WordQuestion ids. Its size depends only on SEEN_CAPACITY (about 1.2 KB per generation), not on
+the size of the question bank, and once the current generation is full it replaces the previous
+one, so the oldest history is forgotten instead of the filter saturating. Filters are stored in
+players.db, one row per player, and only loaded for the players of the game being set up.
+"""
+import math
+import struct
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from databaseLogic import Session, PlayerSeenQuestions
+
+SEEN_CAPACITY = 1000
+SEEN_ERROR_RATE = 0.01
+
+_HEADER = struct.Struct('<BBIIIB')
+_FORMAT_VERSION = 1
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(value):
+    """splitmix64 finalizer; spreads consecutive ids over the whole 64-bit range."""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+class SeenFilter:
+    """Two-generation Bloom filter of question ids; false positives only ever skip an unseen question."""
+    def __init__(self, capacity=SEEN_CAPACITY, error_rate=SEEN_ERROR_RATE):
+        self.capacity = capacity
+        self.bits = max(64, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.current = bytearray((self.bits + 7) // 8)
+        self.previous = None
+        self.count = 0
+
+    def _positions(self, question_id):
+        mixed = _mix64(question_id)
+        first, step = mixed & 0xFFFFFFFF, (mixed >> 32) | 1
+        return [(first + i * step) % self.bits for i in range(self.hashes)]
+
+    @staticmethod
+    def _has(array, positions):
+        return all(array[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+
+    def _probe(self, array, first, step):
+        """Like _has over _positions, stopping at the first clear bit (most lookups are misses)."""
+        bits = self.bits
+        pos = first
+        for _ in range(self.hashes):
+            if not array[pos >> 3] & (1 << (pos & 7)):
+                return False
+            pos += step
+            if pos >= bits:
+                pos -= bits
+        return True
+
+    def __contains__(self, question_id):
+        mixed = _mix64(question_id)
+        first, step = (mixed & 0xFFFFFFFF) % self.bits, ((mixed >> 32) | 1) % self.bits
+        return self._probe(self.current, first, step) or (
+            self.previous is not None and self._probe(self.previous, first, step))
+
+    def add(self, question_id):
+        positions = self._positions(question_id)
+        if self._has(self.current, positions):
+            return
+        if self.count >= self.capacity:
+            self.previous, self.current = self.current, bytearray(len(self.current))
+            self.count = 0
+        for pos in positions:
+            self.current[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, question_ids):
+        for question_id in question_ids:
+            self.add(question_id)
+
+    def to_bytes(self):
+        header = _HEADER.pack(_FORMAT_VERSION, self.hashes, self.bits, self.capacity, self.count,
+                              self.previous is not None)
+        return header + bytes(self.current) + (bytes(self.previous) if self.previous is not None else b"")
+
+    @classmethod
+    def from_bytes(cls, data):
+        version, hashes, bits, capacity, count, has_previous = _HEADER.unpack_from(data)
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported seen-filter format {version}")
+        seen = cls.__new__(cls)
+        seen.capacity, seen.bits, seen.hashes, seen.count = capacity, bits, hashes, count
+        size = (bits + 7) // 8
+        start = _HEADER.size
+        seen.current = bytearray(data[start:start + size])
+        seen.previous = bytearray(data[start + size:start + 2 * size]) if has_previous else None
+        return seen
+
+
+def load_seen_filters(session, player_ids):
+    """Returns {player_id: SeenFilter} for the players that have a stored history."""
+    player_ids = [player_id for player_id in player_ids if player_id is not None]
+    if not player_ids:
+        return {}
+    rows = session.execute(select(PlayerSeenQuestions.player_id, PlayerSeenQuestions.data).where(
+        PlayerSeenQuestions.player_id.in_(player_ids)))
+    return {player_id: SeenFilter.from_bytes(data) for player_id, data in rows}
+
+
+def record_seen_questions(session, seen_by_player):
+    """
+    Adds question ids to the players' histories inside the caller's transaction.
+
+    Args:
+        session (Session): Open players.db session.
+        seen_by_player (dict): player_id -> iterable of WordQuestion ids.
+    """
+    seen_by_player = {player_id: ids for player_id, ids in seen_by_player.items() if ids}
+    if not seen_by_player:
+        return
+    filters = load_seen_filters(session, seen_by_player)
+    rows = []
+    for player_id, question_ids in seen_by_player.items():
+        seen = filters.get(player_id) or SeenFilter()
+        seen.update(question_ids)
+        rows.append({"player_id": player_id, "data": seen.to_bytes()})
+    statement = sqlite_insert(PlayerSeenQuestions)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[PlayerSeenQuestions.player_id], set_={"data": statement.excluded.data}), rows)
+
+
+def get_seen_filters(player_ids):
+    """Loads the stored histories of the given players; runs on the DB worker."""
+    session = Session()
+    try:
+        return list(load_seen_filters(session, player_ids).values())
+    finally:
+        session.close()
+
+
+def unseen_by_all(filters):
+    """Returns an `exclude` predicate for QuestionPoolCache.sample that skips questions any player has seen."""
+    def seen(question):
+        question_id = getattr(question, 'id', None)
+        if question_id is None:
+            return False
+        for history in filters:
+            if question_id in history:
+                return True
+        return False
+    return seen
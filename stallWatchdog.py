@@ -0,0 +1,183 @@
+"""
+Detects stalls of the Tk main loop and records what the main thread was doing.
+
+A probe re-arms itself with `after` every PROBE_INTERVAL_MS and notes when it actually ran.
+A daemon thread watches those heartbeats; once none has arrived for `threshold_ms` it grabs the
+main thread's Python stack (sys._current_frames), and when the loop comes back it appends one
+JSON line per stall to the report file: duration, stack and a short signature of the innermost
+project frame. Reports from many sessions can be appended to the same file and summarized with
+`python stallWatchdog.py [report]`.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import tkinter as tk
+import traceback
+import uuid
+import metrics
+
+STALL_REPORT_ENV = "CROSSWORD_STALL_REPORT"
+DEFAULT_REPORT_PATH = "stalls.ndjson"
+PROBE_INTERVAL_MS = 50
+STALL_THRESHOLD_MS = 250
+MAX_STACK_FRAMES = 30
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _where(frame):
+    path = frame.filename
+    if path.startswith(_PROJECT_DIR):
+        path = os.path.relpath(path, _PROJECT_DIR)
+    return f"{path}:{frame.lineno} {frame.name}"
+
+
+def _signature(frames):
+    """The innermost frame in project code, which is usually the call worth fixing."""
+    for frame in reversed(frames):
+        if frame.filename.startswith(_PROJECT_DIR) and not frame.filename.endswith("stallWatchdog.py"):
+            return _where(frame)
+    return _where(frames[-1]) if frames else "?"
+
+
+class StallWatchdog:
+    """
+    Main-loop latency probe plus a watcher thread that captures the stack of long stalls.
+
+    Args:
+        root (tk.Tk): The application's root window.
+        report_path (str): NDJSON file the stall records are appended to.
+        threshold_ms (float): Loop latency above which a stall is recorded.
+        probe_ms (int): Interval of the `after` probe.
+    """
+    def __init__(self, root, report_path=DEFAULT_REPORT_PATH, threshold_ms=STALL_THRESHOLD_MS,
+                 probe_ms=PROBE_INTERVAL_MS):
+        self.root = root
+        self.report_path = report_path
+        self.threshold = threshold_ms / 1000
+        self.probe_interval = probe_ms / 1000
+        self.session = uuid.uuid4().hex[:12]
+        self.stalls = 0
+        self.worst_lag = 0.0
+        self._main_thread_id = threading.get_ident()
+        self._expected = None
+        self._last_beat = time.monotonic()
+        self._beats = 0
+        self._last_lag = 0.0
+        self._after_id = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+
+    def start(self):
+        """Starts probing; must be called on the Tk thread."""
+        self._schedule()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def _schedule(self):
+        self._expected = time.monotonic() + self.probe_interval
+        self._after_id = self.root.after(int(self.probe_interval * 1000), self._probe)
+
+    def _probe(self):
+        now = time.monotonic()
+        lag = max(0.0, now - self._expected)
+        self._last_lag = lag
+        self._last_beat = now
+        self._beats += 1
+        if lag > self.worst_lag:
+            self.worst_lag = lag
+        metrics.observe("main_loop_lag_seconds", lag, "Delay of the main-loop probe past its due time")
+        if not self._stop.is_set():
+            self._schedule()
+
+    def _watch(self):
+        poll = self.probe_interval / 2
+        stall = None
+        while not self._stop.wait(poll):
+            beats = self._beats
+            if stall is not None:
+                if beats != stall["beats"]:
+                    stall["duration_ms"] = round(self._last_lag * 1000, 1)
+                    self._write(stall)
+                    stall = None
+                continue
+            silent = time.monotonic() - self._last_beat - self.probe_interval
+            if silent >= self.threshold:
+                frame = sys._current_frames().get(self._main_thread_id)
+                if frame is None:
+                    continue
+                frames = traceback.extract_stack(frame)[-MAX_STACK_FRAMES:]
+                stall = {
+                    "session": self.session,
+                    "started": time.time() - silent,
+                    "beats": beats,
+                    "signature": _signature(frames),
+                    "stack": [_where(frame) for frame in frames],
+                }
+
+    def _write(self, stall):
+        stall.pop("beats")
+        self.stalls += 1
+        metrics.count("main_loop_stalls", 1, "Main-loop stalls above the watchdog threshold")
+        try:
+            with open(self.report_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(stall, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Could not write stall report: {e}")
+
+
+def start_watchdog(root):
+    """
+    Starts a StallWatchdog for the application window unless disabled.
+    CROSSWORD_STALL_REPORT sets the report file; an empty value turns the watchdog off.
+    """
+    report_path = os.environ.get(STALL_REPORT_ENV, DEFAULT_REPORT_PATH)
+    if not report_path:
+        return None
+    return StallWatchdog(root, report_path).start()
+
+
+def summarize(paths):
+    """Groups stall records by signature; returns rows of (signature, count, total ms, max ms, sessions)."""
+    groups = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    stall = json.loads(line)
+                except ValueError:
+                    continue
+                group = groups.setdefault(stall.get("signature", "?"), [0, 0.0, 0.0, set()])
+                duration = stall.get("duration_ms", 0.0)
+                group[0] += 1
+                group[1] += duration
+                group[2] = max(group[2], duration)
+                group[3].add(stall.get("session"))
+    rows = [(signature, n, total, worst, len(sessions)) for signature, (n, total, worst, sessions) in groups.items()]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarizes main-loop stall reports by the code that caused them.")
+    parser.add_argument("reports", nargs="*", default=[DEFAULT_REPORT_PATH])
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+    rows = summarize(args.reports)
+    print(f"{'stalls':>7} {'total ms':>10} {'max ms':>8} {'sessions':>9}  where")
+    for signature, n, total, worst, sessions in rows[:args.top]:
+        print(f"{n:>7} {total:>10.0f} {worst:>8.0f} {sessions:>9}  {signature}")
+
+
+if __name__ == "__main__":
+    main()
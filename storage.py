@@ -0,0 +1,133 @@
+"""
+SQLite engines for players.db and words.db.
+
+Every engine made here applies the same connection pragmas (WAL journal, relaxed fsync,
+page cache and memory-mapped I/O sizes, busy timeout), keeps connections in a bounded pool and
+can ATTACH further database files under a schema name, so one connection can join tables of
+both databases.
+"""
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+PLAYERS_DB_PATH = "players.db"
+WORDS_DB_PATH = "words.db"
+WORDS_SCHEMA = "words"
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -32_000,
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+LEGACY_PRAGMAS = {
+    "journal_mode": "DELETE",
+    "synchronous": "FULL",
+}
+
+POOL_SIZE = 5
+MAX_OVERFLOW = 5
+POOL_TIMEOUT_S = 30
+
+
+class LazySessionFactory:
+    """
+    Session factory that builds its engine on the first session request.
+    Lets modules import without opening database files or running schema checks.
+    """
+    def __init__(self, make_engine):
+        """
+        Args:
+            make_engine (callable): Returns a ready engine; called once, on first use.
+        """
+        self._make_engine = make_engine
+        self._engine = None
+        self._factory = None
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self):
+        """The engine, created on first access."""
+        self._ensure_engine()
+        return self._engine
+
+    def _ensure_engine(self):
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    engine = self._make_engine()
+                    self._factory = sessionmaker(bind=engine)
+                    self._engine = engine
+
+    def use_engine(self, engine):
+        """Points the factory at another engine, e.g. a temporary database in benchmarks."""
+        with self._lock:
+            self._factory = sessionmaker(bind=engine)
+            self._engine = engine
+
+    def __call__(self, **kwargs):
+        self._ensure_engine()
+        return self._factory(**kwargs)
+
+
+def create_sqlite_engine(path, pragmas=None, attach=None, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW):
+    """
+    Creates a pooled engine for an SQLite file with the storage pragmas applied to every connection.
+
+    Args:
+        path (str): Database file.
+        pragmas (dict, optional): PRAGMA name -> value; defaults to DEFAULT_PRAGMAS.
+            Pass LEGACY_PRAGMAS to get SQLite's own defaults back, e.g. for comparisons.
+        attach (dict, optional): Schema name -> database file to ATTACH on every connection.
+        pool_size (int): Connections kept open in the pool.
+        max_overflow (int): Extra connections allowed under load.
+    Returns:
+        Engine: The configured engine.
+    """
+    engine = create_engine(f"sqlite:///{path}", poolclass=QueuePool, pool_size=pool_size,
+                           max_overflow=max_overflow, pool_timeout=POOL_TIMEOUT_S,
+                           connect_args={"check_same_thread": False})
+    configure_connections(engine, DEFAULT_PRAGMAS if pragmas is None else pragmas, attach)
+    return engine
+
+
+def configure_connections(engine, pragmas, attach=None):
+    """Registers a connect hook that attaches databases and sets pragmas on each new connection."""
+    attach = dict(attach or {})
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for schema, path in attach.items():
+                cursor.execute("ATTACH DATABASE ? AS " + _quote(schema), (path,))
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+                for schema in attach:
+                    if name in ("journal_mode", "synchronous", "cache_size", "mmap_size"):
+                        cursor.execute(f"PRAGMA {_quote(schema)}.{name} = {value}")
+        finally:
+            cursor.close()
+
+    return engine
+
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def connection_pragmas(bind, names=("journal_mode", "synchronous", "cache_size", "mmap_size", "busy_timeout")):
+    """Returns the current value of the given pragmas on one pooled connection, for diagnostics."""
+    with bind.connect() as conn:
+        return {name: conn.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
+
+
+def create_combined_engine(players_path=PLAYERS_DB_PATH, words_path=WORDS_DB_PATH, pragmas=None):
+    """
+    Opens players.db with words.db attached as the `words` schema.
+    Queries can then join both, e.g. "SELECT ... FROM games JOIN words.word_questions ...".
+    """
+    return create_sqlite_engine(players_path, pragmas, attach={WORDS_SCHEMA: words_path})
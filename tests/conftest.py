@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _swap_engine(factory, engine):
+    saved = factory._engine, factory._factory
+    factory.use_engine(engine)
+    return saved
+
+
+@pytest.fixture
+def players_engine(tmp_path):
+    """A temporary players.db, with change counters, used by databaseLogic.Session for the test."""
+    from databaseLogic import Base, Session, ensure_change_counters, ensure_game_columns
+    from storage import create_sqlite_engine
+
+    engine = create_sqlite_engine(str(tmp_path / "players.db"))
+    Base.metadata.create_all(engine)
+    ensure_game_columns(engine)
+    ensure_change_counters(engine)
+    saved = _swap_engine(Session, engine)
+    yield engine
+    Session._engine, Session._factory = saved
+    engine.dispose()
+
+
+@pytest.fixture
+def words_engine(tmp_path):
+    """A temporary, empty words.db used by questionsLogic.Session for the test."""
+    import questionsLogic
+    from storage import create_sqlite_engine
+
+    engine = create_sqlite_engine(str(tmp_path / "words.db"))
+    questionsLogic.Base.metadata.create_all(engine)
+    saved = _swap_engine(questionsLogic.Session, engine)
+    questionsLogic.question_cache.clear()
+    yield engine
+    questionsLogic.Session._engine, questionsLogic.Session._factory = saved
+    questionsLogic.question_cache.clear()
+    engine.dispose()
@@ -0,0 +1,52 @@
+import itertools
+
+from sqlalchemy import create_engine, insert
+
+from answerIndex import AnswerIndex, rebuild_answer_index, update_answer_index
+from questionsLogic import Base, WordQuestion
+
+_clues = itertools.count()
+WORDS = ["castle", "cattle", "carrot", "hassle", "tassel", "dog", "god", "Kreda", "zamek"]
+
+
+def add(engine, *answers, category="en"):
+    with engine.begin() as conn:
+        conn.execute(insert(WordQuestion), [
+            {"question": f"clue {next(_clues)}", "answer": answer, "difficulty": "Easy", "category": category}
+            for answer in answers])
+        update_answer_index(conn)
+
+
+def make_engine(tmp_path, name):
+    engine = create_engine(f"sqlite:///{tmp_path / name}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def test_incremental_updates_match_a_full_rebuild(tmp_path):
+    incremental = make_engine(tmp_path, "incremental.db")
+    for word in WORDS:
+        add(incremental, word)
+    add(incremental, "castle", "dog")
+    rebuilt = make_engine(tmp_path, "rebuilt.db")
+    add(rebuilt, *WORDS)
+    with rebuilt.begin() as conn:
+        rebuild_answer_index(conn)
+
+    for engine in (incremental, rebuilt):
+        index = AnswerIndex(lambda: engine)
+        assert index.match("ca?tle", "en") == ["castle", "cattle"]
+        assert index.count("??????", "en") == 5
+        assert sorted(index.anagrams("tassle", "en")) == ["tassel"]
+        assert sorted(index.anagrams("odg", "en")) == ["dog", "god"]
+        assert index.match("kr?da", "en") == ["kreda"]
+        assert index.match("q??", "en") == []
+
+
+def test_categories_are_indexed_separately(tmp_path):
+    engine = make_engine(tmp_path, "words.db")
+    add(engine, "kreda", category="pl")
+    add(engine, "krema", category="en")
+    index = AnswerIndex(lambda: engine)
+    assert index.match("kr???", "pl") == ["kreda"]
+    assert index.match("kr???", "en") == ["krema"]
@@ -0,0 +1,48 @@
+import random
+from collections import namedtuple
+
+import pytest
+
+from answerMatching import normalize_answer_key, within_edit_distance
+from gameEngine import is_correct_answer
+
+Question = namedtuple("Question", ["question", "answer"])
+
+
+def _levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j - 1] + (char != other), current[j - 1] + 1, previous[j] + 1))
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize("text, key", [
+    ("Łódź", "lodz"),
+    ("  LODZ ", "lodz"),
+    ("Żółw", "zolw"),
+    ("Straße", "strasse"),
+    ("New   York", "new york"),
+    ("Ørsted", "orsted"),
+])
+def test_keys_drop_case_diacritics_and_extra_spaces(text, key):
+    assert normalize_answer_key(text) == key
+
+
+def test_edit_distance_bound_agrees_with_full_levenshtein():
+    rng = random.Random(5)
+    for _ in range(2000):
+        a = "".join(rng.choice("abc") for _ in range(rng.randrange(8)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randrange(8)))
+        bound = rng.randrange(4)
+        assert within_edit_distance(a, b, bound) == (_levenshtein(a, b) <= bound), (a, b, bound)
+
+
+def test_typos_are_tolerated_only_in_long_enough_answers():
+    assert is_correct_answer("Zolw", Question("", "żółw"))
+    assert not is_correct_answer("castlr", Question("", "castle"))
+    assert is_correct_answer("castlr", Question("", "castle"), max_typos=1)
+    assert not is_correct_answer("dax", Question("", "day"), max_typos=1)
+    assert not is_correct_answer("kastlr", Question("", "castle"), max_typos=2)
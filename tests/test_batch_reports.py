@@ -0,0 +1,34 @@
+import os
+
+import batchReports
+from databaseLogic import Player, Session
+from resultsLogic import GameResult, write_game_results
+
+
+def test_anonymous_games_are_rendered_with_guest_seats(players_engine, tmp_path, monkeypatch):
+    session = Session()
+    session.add(Player(name="ann", password="x", games_played=0, wins=0, losses=0))
+    session.commit()
+    session.close()
+    write_game_results([GameResult({"ann": 3}, "Easy", "To mistake", match_id="registered"),
+                        GameResult({"x": 4, "y": 1}, "Hard", "Timed", match_id="server", anonymous=True)])
+    rendered = []
+
+    def render(pdf, scores, *args):
+        rendered.append(scores)
+        pdf.add_page()
+
+    monkeypatch.setattr(batchReports, "render_game_results", render)
+    for folder in ("games", "players"):
+        os.makedirs(tmp_path / "out" / folder)
+    batchReports._init_worker(str(tmp_path / "players.db"), str(tmp_path / "out"), None, None, None)
+    try:
+        with players_engine.connect() as conn:
+            keys = list(batchReports.iter_game_keys(conn))
+            player_ids = list(batchReports.iter_player_ids(conn))
+        assert batchReports.render_game_chunk(keys)[0] == len(keys) == 2
+        assert sorted(rendered, key=len) == [{"ann": 3}, {"Guest 1": 4, "Guest 2": 1}]
+        assert batchReports.render_player_chunk(player_ids)[0] == len(player_ids) == 1
+    finally:
+        batchReports._worker.engine.dispose()
+        batchReports._worker = None
@@ -0,0 +1,84 @@
+from collections import namedtuple
+
+from gameEngine import (GameEngine, MODE_FOR_TIME, MODE_TO_MISTAKE, MESSAGE_ALL_ANSWERED, MESSAGE_TIME_UP,
+                        EVENT_GAME_OVER, EVENT_QUESTION, RESULT_CORRECT, RESULT_EMPTY, RESULT_PAUSED,
+                        RESULT_WRONG, TIME_LIMITS)
+
+Question = namedtuple("Question", ["id", "question", "answer"])
+QUESTIONS = [Question(1, "Large building with strong walls", "castle"),
+             Question(2, "Zwierzę, które szczeka", "pies"),
+             Question(3, "Opposite of night", "day")]
+
+
+def _engine(mode=MODE_TO_MISTAKE, players=("ann", "bob"), questions=QUESTIONS, **kwargs):
+    engine = GameEngine(list(players), questions, "Easy", mode, **kwargs)
+    events = []
+    engine.subscribe(lambda event, data: events.append((event, data)))
+    return engine, events
+
+
+def test_correct_answers_score_and_turns_rotate():
+    engine, events = _engine()
+    engine.start()
+    assert engine.current_player_name == "ann"
+    assert engine.submit_answer(" CASTLE ") == RESULT_CORRECT
+    assert engine.current_player_name == "bob"
+    assert engine.submit_answer("kot") == RESULT_WRONG
+    assert engine.current_player_name == "ann"
+    assert engine.scores_by_name() == {"ann": 10, "bob": 0}
+    assert [event for event, _ in events].count(EVENT_QUESTION) == 3
+
+
+def test_to_mistake_mode_moves_on_after_a_wrong_answer_and_for_time_does_not():
+    engine, _ = _engine(MODE_TO_MISTAKE)
+    engine.start()
+    engine.submit_answer("wrong")
+    assert engine.state.question_index == 1
+
+    engine, _ = _engine(MODE_FOR_TIME)
+    engine.start()
+    engine.submit_answer("wrong")
+    assert engine.state.question_index == 0
+    assert engine.submit_answer("   ") == RESULT_EMPTY
+
+
+def test_the_game_ends_once_every_question_is_answered():
+    engine, events = _engine(players=["ann"])
+    engine.start()
+    for question in QUESTIONS:
+        engine.submit_answer(question.answer)
+    assert engine.state.finished and engine.state.end_message == MESSAGE_ALL_ANSWERED
+    event, data = events[-1]
+    assert event == EVENT_GAME_OVER and data["winners"] == ["ann"] and data["scores"] == {"ann": 30}
+    assert engine.shown_question_ids() == [1, 2, 3]
+
+
+def test_nobody_wins_a_game_without_points():
+    engine, events = _engine()
+    engine.start()
+    engine.end("stopped")
+    engine.end("again")
+    assert [data["winners"] for event, data in events if event == EVENT_GAME_OVER] == [[]]
+
+
+def test_timed_games_pause_and_run_out_of_time():
+    engine, _ = _engine(MODE_FOR_TIME)
+    engine.start()
+    assert engine.state.time_left == TIME_LIMITS["Easy"]
+    assert engine.toggle_pause()
+    assert engine.submit_answer("castle") == RESULT_PAUSED
+    engine.tick(100)
+    assert engine.state.time_left == TIME_LIMITS["Easy"]
+    engine.toggle_pause()
+    engine.tick(TIME_LIMITS["Easy"] + 5)
+    assert engine.state.finished and engine.state.end_message == MESSAGE_TIME_UP
+    assert engine.state.time_left == 0
+
+
+def test_state_copies_are_independent():
+    engine, _ = _engine()
+    engine.start()
+    snapshot = engine.state.copy()
+    engine.submit_answer("castle")
+    assert snapshot.scores == [0, 0] and engine.state.scores == [10, 0]
+
@@ -0,0 +1,140 @@
+import asyncio
+from collections import namedtuple
+
+import pytest
+from sqlalchemy import select
+
+from databaseLogic import Game, Player, Session
+from gameEngine import GameEngine
+from gameJournal import EventJournal, iter_records, rebuild_player_counters, record_game, replay_game
+
+Question = namedtuple("Question", ["id", "question", "answer"])
+QUESTIONS = [Question(i, f"clue {i}", f"word{i}") for i in range(1, 5)]
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = EventJournal(str(tmp_path / "journal"))
+    yield journal
+    journal.close()
+
+
+def _play(journal, players, answers, player_ids=None, anonymous=False):
+    """Plays one game, answering each question right (True) or wrong (False)."""
+    engine = GameEngine(players, QUESTIONS[:len(answers)], "Easy", "To mistake")
+    recorder = record_game(engine, "en", player_ids, anonymous=anonymous, journal=journal)
+    engine.start()
+    for question, correct in zip(engine.questions, answers):
+        engine.submit_answer(question.answer if correct else "nope")
+    engine.end("done")
+    journal.flush()
+    return recorder.game_id, engine.scores_by_name()
+
+
+def _records(journal):
+    return list(iter_records(journal.directory))
+
+
+def test_replay_recomputes_the_scores(journal):
+    game_id, scores = _play(journal, ["ann", "bob"], [True, False, True, True])
+    game = replay_game(game_id, _records(journal))
+    assert game["consistent"]
+    assert game["scores"] == scores
+    assert [turn["correct"] for turn in game["turns"]] == [True, False, True, True]
+
+
+def _add_player(name, games=0, wins=0, losses=0, game_rows=0):
+    session = Session()
+    player = Player(name=name, password="x", games_played=games, wins=wins, losses=losses)
+    session.add(player)
+    session.flush()
+    session.add_all(Game(player_id=player.id, score=0, difficulty="Easy", mode="To mistake")
+                    for _ in range(game_rows))
+    session.commit()
+    player_id = player.id
+    session.close()
+    return player_id
+
+
+def _counters(name):
+    with Session.engine.connect() as conn:
+        return tuple(conn.execute(select(Player.games_played, Player.wins, Player.losses)
+                                  .where(Player.name == name)).one())
+
+
+def test_rebuild_leaves_players_missing_from_the_journal_alone(players_engine, journal):
+    ann = _add_player("ann", games=1, wins=0, losses=1, game_rows=1)
+    _add_player("old", games=7, wins=3, losses=4, game_rows=7)
+    _play(journal, ["ann"], [True], {"ann": ann})
+
+    session = Session()
+    changes = rebuild_player_counters(session, _records(journal), apply=True)
+    session.close()
+
+    assert changes == [("ann", (1, 0, 1), (1, 1, 0))]
+    assert _counters("ann") == (1, 1, 0)
+    assert _counters("old") == (7, 3, 4)
+
+
+def test_rebuild_skips_players_with_games_from_before_the_journal(players_engine, journal):
+    ann = _add_player("ann", games=3, wins=1, losses=2, game_rows=3)
+    _play(journal, ["ann"], [True], {"ann": ann})
+
+    session = Session()
+    assert rebuild_player_counters(session, _records(journal), apply=True) == []
+    session.close()
+    assert _counters("ann") == (3, 1, 2)
+
+
+def test_anonymous_games_count_for_nobody(players_engine, journal):
+    _add_player("ann")
+    _play(journal, ["ann"], [True], anonymous=True)
+
+    start = _records(journal)[0]
+    assert start["anonymous"] and start["player_ids"] == [None]
+    session = Session()
+    assert rebuild_player_counters(session, _records(journal)) == []
+    session.close()
+
+
+def test_server_games_are_journaled(journal):
+    from gameServer import GameClient, GameServer
+
+    class Writer:
+        def __init__(self):
+            self.results = []
+
+        def submit(self, result):
+            from concurrent.futures import Future
+            self.results.append(result)
+            future = Future()
+            future.set_result(1)
+            return future
+
+        def flush(self):
+            pass
+
+    writer = Writer()
+
+    async def play():
+        server = GameServer(draw_questions=lambda language, difficulty: QUESTIONS[:2], result_writer=writer,
+                            journal=journal)
+        host, port = await server.start("127.0.0.1", 0)
+        client = await GameClient.connect(host, port)
+        await client.send("join", player="ann", players=1)
+        while True:
+            event = await client.receive()
+            if event["event"] == "question":
+                await client.send("answer", text="word" + event["question"].split()[-1])
+            elif event["event"] == "game_over":
+                break
+        await client.close()
+        await server.stop()
+
+    asyncio.run(play())
+    journal.flush()
+    records = _records(journal)
+    assert records[0]["t"] == "start" and records[0]["anonymous"]
+    assert records[-1]["t"] == "game_over"
+    assert [result.match_id for result in writer.results] == [records[0]["game"]]
+    assert writer.results[0].anonymous
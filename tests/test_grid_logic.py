@@ -0,0 +1,72 @@
+import random
+from collections import namedtuple
+
+import pytest
+
+from gridLogic import ACROSS, WordIndex, generate_crossword, iter_bits, normalize_word
+
+Question = namedtuple("Question", ["question", "answer"])
+
+
+def _bank(count=400, seed=2):
+    rng = random.Random(seed)
+    words = {"".join(rng.choice("AEIOURSTLNCD") for _ in range(rng.randrange(3, 9))) for _ in range(count)}
+    return [Question(f"clue for {word}", word.lower()) for word in sorted(words)]
+
+
+def _cells(placement):
+    dr, dc = (0, 1) if placement.direction == ACROSS else (1, 0)
+    return [(placement.row + dr * i, placement.col + dc * i) for i in range(len(placement.word))]
+
+
+def test_normalize_word_rejects_what_a_grid_cannot_hold():
+    assert normalize_word(" castle ") == "CASTLE"
+    assert normalize_word("a") is None
+    assert normalize_word("ice cream") is None
+
+
+def test_index_matches_fixed_letters_and_skips_excluded_words():
+    index = WordIndex([Question("", word) for word in ("cat", "car", "cot", "dog", "cat")])
+    cat, car, cot = (index.words[3].index(word) for word in ("CAT", "CAR", "COT"))
+    assert set(iter_bits(index.matching(3, [(0, "C"), (1, "A")]))) == {cat, car}
+    assert set(iter_bits(index.matching(3, [(0, "C")], exclude=1 << car))) == {cat, cot}
+    assert index.matching(3, [(2, "Z")]) == 0
+    assert len(index.words[3]) == 4
+
+
+def test_iter_bits_starts_at_the_offset_and_wraps():
+    assert list(iter_bits(0b101101, 3)) == [3, 5, 0, 2]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_generated_grids_are_valid_crosswords(seed):
+    size = 11
+    crossword = generate_crossword(_bank(), size=size, seed=seed, time_budget=10)
+    placements = crossword.placements
+    assert len(placements) >= 5
+    assert len({p.word for p in placements}) == len(placements)
+
+    owners = {}
+    for placement in placements:
+        cells = _cells(placement)
+        assert all(0 <= row < size and 0 <= col < size for row, col in cells)
+        for (row, col), letter in zip(cells, placement.word):
+            assert crossword.cells[row][col] == letter
+            owners.setdefault((row, col), set()).add(placement.direction)
+        dr, dc = (0, 1) if placement.direction == ACROSS else (1, 0)
+        for row, col in ((placement.row - dr, placement.col - dc), (cells[-1][0] + dr, cells[-1][1] + dc)):
+            assert not (0 <= row < size and 0 <= col < size) or crossword.cells[row][col] is None
+    for placement in placements[1:]:
+        assert any(len(owners[cell]) == 2 for cell in _cells(placement))
+
+
+def test_same_seed_gives_the_same_grid():
+    bank = _bank()
+    first = generate_crossword(bank, size=11, seed=9, time_budget=10)
+    second = generate_crossword(bank, size=11, seed=9, time_budget=10)
+    assert first.to_text() == second.to_text()
+    assert [number for number, _, _ in first.numbered_clues()] == [number for number, _, _ in second.numbered_clues()]
+
+
+def test_an_empty_bank_gives_an_empty_grid():
+    assert generate_crossword([], size=5).placements == []
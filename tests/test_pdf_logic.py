@@ -0,0 +1,16 @@
+from databaseLogic import Player, Session
+from pdfLogic import generate_players_list_pdf
+
+
+def test_players_list_always_returns_a_list_of_volumes(players_engine, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    session = Session()
+    session.add_all(Player(name=f"player{i}", password="x", games_played=i, wins=0, losses=i) for i in range(5))
+    session.commit()
+    session.close()
+
+    single = generate_players_list_pdf("single")
+    assert isinstance(single, list) and len(single) == 1
+    volumes = generate_players_list_pdf("split", rows_per_volume=2)
+    assert len(volumes) == 3 and volumes[1].endswith("_part2.pdf")
+    assert all((tmp_path / name).exists() for name in single + volumes)
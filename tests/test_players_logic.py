@@ -0,0 +1,47 @@
+import pytest
+
+from databaseLogic import Player, Session
+from playersLogic import count_players, fetch_players_page, iter_players
+
+NAMES = ["ann", "Anna", "bob", "Zoe", "zed", "Zygmunt", "[bracket", "@home", "Łukasz", "łucja"]
+
+
+@pytest.fixture
+def players(players_engine):
+    session = Session()
+    session.add_all(Player(name=name, password="x") for name in NAMES)
+    session.commit()
+    session.close()
+    return players_engine
+
+
+def names(prefix):
+    return sorted(row[1] for row in iter_players(prefix, chunk_size=3))
+
+
+@pytest.mark.parametrize("prefix, expected", [
+    ("a", ["Anna", "ann"]),
+    ("ANN", ["Anna", "ann"]),
+    ("Z", ["Zoe", "Zygmunt", "zed"]),
+    ("z", ["Zoe", "Zygmunt", "zed"]),
+    ("zY", ["Zygmunt"]),
+    ("@", ["@home"]),
+    ("[", ["[bracket"]),
+    ("Ł", ["Łukasz"]),
+    ("q", []),
+])
+def test_prefix_search_is_case_insensitive(players, prefix, expected):
+    assert names(prefix) == expected
+    assert count_players(prefix) == len(expected)
+
+
+def test_keyset_pages_cover_every_player_once(players):
+    seen, after_key = [], None
+    while True:
+        rows = fetch_players_page(after_key=after_key, limit=4)
+        seen += [row[1] for row in rows]
+        if len(rows) < 4:
+            break
+        after_key = (rows[-1][1], rows[-1][0])
+    assert sorted(seen) == sorted(NAMES)
+    assert [row[1] for row in fetch_players_page(offset=4, limit=2)] == seen[4:6]
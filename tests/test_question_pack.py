@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import questionsLogic
+from questionPack import QuestionPack, QuestionPackError, compile_pack
+from questionsLogic import WordQuestion
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def pack_path(words_engine, tmp_path):
+    session = questionsLogic.Session()
+    # Ids with gaps, as left by deleted questions, so pack ids cannot just be positions.
+    session.add_all(WordQuestion(id=3 * i + 5, question=f"clue {i}", answer=f"żółw{i}", answer_key=f"zolw{i}",
+                                 difficulty=("Easy", "Hard")[i % 2], category=("en", "pl")[i % 3 == 0])
+                    for i in range(60))
+    session.commit()
+    session.close()
+    path = str(tmp_path / "questions.pack")
+    assert compile_pack(path, str(tmp_path / "words.db")) == 60
+    return path
+
+
+def test_pack_keeps_the_words_db_ids_and_text(pack_path):
+    pack = QuestionPack(pack_path)
+    session = questionsLogic.Session()
+    try:
+        for (category, difficulty), bucket in pack.buckets.items():
+            rows = session.query(WordQuestion).filter_by(category=category, difficulty=difficulty).order_by(
+                WordQuestion.id).all()
+            assert [(q.id, q.question, q.answer, q.answer_key) for q in bucket] == \
+                [(r.id, r.question, r.answer, r.answer_key) for r in rows]
+    finally:
+        session.close()
+        pack.close()
+
+
+def test_seeded_pack_draws_match_the_pool_cache(pack_path):
+    pack = QuestionPack(pack_path)
+    for seed in range(5):
+        from_pack = [q.id for q in pack.sample("en", "Easy", 5, seed=seed)]
+        from_db = [q.id for q in questionsLogic.question_cache.sample("en", "Easy", 5, seed=seed)]
+        assert from_pack == from_db
+    assert pack.sample("de", "Easy", 5) == []
+    pack.close()
+
+
+def test_pack_draws_avoid_excluded_questions(pack_path):
+    pack = QuestionPack(pack_path)
+    bucket = pack.pool("en", "Hard")
+    seen = {q.id for q in bucket[:5]}
+    draw = pack.sample("en", "Hard", 5, seed=1, exclude=lambda q: q.id in seen)
+    assert len({q.id for q in draw}) == 5 and not seen & {q.id for q in draw}
+    pack.close()
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "not.pack"
+    path.write_bytes(b"PK\x03\x04 something else entirely")
+    with pytest.raises(QuestionPackError):
+        QuestionPack(str(path))
+
+
+def test_drawing_from_a_pack_does_not_import_the_database_layer(pack_path):
+    code = ("import sys, questionDraw; questions = questionDraw.get_random_questions('en', 'Easy', 3); "
+            "print(len(questions), 'sqlalchemy' in sys.modules)")
+    env = dict(os.environ, CROSSWORD_QUESTION_PACK=pack_path, PYTHONPATH=REPO)
+    output = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(pack_path), env=env,
+                            capture_output=True, text=True, check=True).stdout.split()
+    assert output == ["3", "False"]
@@ -0,0 +1,129 @@
+import json
+import os
+
+import pytest
+from sqlalchemy import select
+
+import questionsLogic
+from questionsLogic import WordQuestion, bulk_import_questions, sync_questions_from_json
+
+
+def _item(question, answer, item_id=None, category="en", difficulty="Easy"):
+    item = {"question": question, "answer": answer, "difficulty": difficulty, "category": category}
+    if item_id is not None:
+        item["id"] = item_id
+    return item
+
+
+def _write(path, items):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(items, file, ensure_ascii=False)
+    # Force the sync past the size/mtime shortcut even within the filesystem's mtime resolution.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    return str(path)
+
+
+def _rows(engine):
+    with engine.connect() as conn:
+        table = WordQuestion.__table__
+        return {row.question: (row.id, row.answer, row.source_key) for row in conn.execute(
+            select(table.c.id, table.c.question, table.c.answer, table.c.source_key))}
+
+
+def test_items_that_swap_contents_keep_their_ids(words_engine, tmp_path):
+    bank = tmp_path / "bank.json"
+    sync_questions_from_json(_write(bank, [_item("clue a", "apple", 1), _item("clue b", "berry", 2)]),
+                             bind=words_engine)
+    before = _rows(words_engine)
+
+    result = sync_questions_from_json(_write(bank, [_item("clue b", "berry", 1), _item("clue a", "apple", 2)]),
+                                      bind=words_engine)
+
+    assert (result.inserted, result.updated, result.deleted) == (0, 2, 0)
+    after = _rows(words_engine)
+    assert after["clue b"] == (before["clue a"][0], "berry", "id:1")
+    assert after["clue a"] == (before["clue b"][0], "apple", "id:2")
+
+
+def test_rows_of_other_banks_are_left_alone(words_engine, tmp_path):
+    other = tmp_path / "other.json"
+    _write(other, [_item("imported", "thing")])
+    bulk_import_questions(str(other), bind=words_engine)
+    second = tmp_path / "second.json"
+    sync_questions_from_json(_write(second, [_item("second bank", "other", 1)]), bind=words_engine)
+
+    bank = tmp_path / "bank.json"
+    sync_questions_from_json(_write(bank, [_item("mine", "word", 1), _item("gone", "soon", 2)]), bind=words_engine)
+    result = sync_questions_from_json(_write(bank, [_item("mine", "word", 1)]), bind=words_engine)
+
+    assert result.deleted == 1
+    assert set(_rows(words_engine)) == {"imported", "second bank", "mine"}
+
+
+def test_an_item_already_held_by_another_bank_is_left_to_it(words_engine, tmp_path):
+    other = tmp_path / "other.json"
+    sync_questions_from_json(_write(other, [_item("shared", "clue", 7)]), bind=words_engine)
+    bank = tmp_path / "bank.json"
+    sync_questions_from_json(_write(bank, [_item("mine", "word", 1)]), bind=words_engine)
+
+    result = sync_questions_from_json(_write(bank, [_item("shared", "clue", 1), _item("new", "one", 2)]),
+                                      bind=words_engine)
+
+    assert (result.inserted, result.deleted) == (1, 1)
+    rows = _rows(words_engine)
+    assert set(rows) == {"shared", "new"}
+    assert rows["shared"][2] == "id:7"
+
+
+def test_stable_ids_survive_clue_edits_and_text_keys_do_not(words_engine, tmp_path):
+    bank = tmp_path / "bank.json"
+    sync_questions_from_json(_write(bank, [_item("typo clue", "word", 1), _item("other typo", "more")]),
+                             bind=words_engine)
+    before = _rows(words_engine)
+
+    result = sync_questions_from_json(_write(bank, [_item("fixed clue", "word", 1), _item("other fixed", "more")]),
+                                      bind=words_engine)
+
+    after = _rows(words_engine)
+    assert after["fixed clue"][0] == before["typo clue"][0]
+    assert after["other fixed"][2] == "en:other fixed"
+    assert (result.updated, result.inserted, result.deleted, result.unkeyed) == (1, 1, 1, 1)
+
+
+def test_repeated_content_is_stored_once_and_repeated_keys_are_numbered(words_engine, tmp_path):
+    bank = tmp_path / "bank.json"
+    result = sync_questions_from_json(_write(bank, [
+        _item("same", "a", 1), _item("same", "a", 2), _item("first", "b", 3), _item("second", "c", 3), _item("third", "d", 3)]),
+        bind=words_engine)
+
+    assert (result.read, result.inserted) == (5, 4)
+    keys = {question: key for question, (_, _, key) in _rows(words_engine).items()}
+    assert keys == {"same": "id:1", "first": "id:3", "second": "id:3#2", "third": "id:3#3"}
+
+
+def test_unchanged_files_are_not_read_again(words_engine, tmp_path):
+    bank = _write(tmp_path / "bank.json", [_item("clue", "word", 1)])
+    assert not sync_questions_from_json(bank, bind=words_engine).unchanged
+    assert sync_questions_from_json(bank, bind=words_engine).unchanged
+    os.utime(bank)
+    touched = sync_questions_from_json(bank, bind=words_engine)
+    assert touched.unchanged and touched.read == 0
+
+
+def test_rows_imported_without_a_source_are_adopted_by_content(words_engine, tmp_path):
+    bank = _write(tmp_path / "bank.json", [_item("clue", "word", 1)])
+    bulk_import_questions(bank, bind=words_engine)
+    before = _rows(words_engine)
+
+    result = sync_questions_from_json(bank, bind=words_engine)
+
+    assert (result.inserted, result.updated) == (0, 1)
+    assert _rows(words_engine)["clue"] == (before["clue"][0], "word", "id:1")
+
+
+def test_sync_failures_reach_the_caller(words_engine, tmp_path):
+    bank = tmp_path / "bank.json"
+    bank.write_text('[{"question": "clue", "answer": ', encoding="utf-8")
+    with pytest.raises(ValueError):
+        questionsLogic.load_questions_from_json_and_update(str(bank))
@@ -0,0 +1,71 @@
+import os
+
+from databaseLogic import Player, Session
+from reportCache import PLAYERS_LIST, ReportCache, players_report_key
+
+
+def _render(cache, name, size=10):
+    os.makedirs(cache.directory, exist_ok=True)
+    path = cache.path(name)
+    with open(path, "wb") as file:
+        file.write(b"x" * size)
+    return path
+
+
+def test_keys_follow_parameters_and_table_versions():
+    key = ReportCache.key(PLAYERS_LIST, {"rows_per_volume": 10}, {"players": 1})
+    assert key.startswith(PLAYERS_LIST + "_")
+    assert key == ReportCache.key(PLAYERS_LIST, {"rows_per_volume": 10}, {"players": 1})
+    assert key != ReportCache.key(PLAYERS_LIST, {"rows_per_volume": 20}, {"players": 1})
+    assert key != ReportCache.key(PLAYERS_LIST, {"rows_per_volume": 10}, {"players": 2})
+
+
+def test_stored_reports_are_found_until_a_file_goes_missing(tmp_path):
+    cache = ReportCache(str(tmp_path / "cache"))
+    assert cache.lookup("missing") is None and cache.lookup(None) is None
+    files = [_render(cache, "a.pdf"), _render(cache, "b.pdf")]
+    assert cache.store("entry", files) == files
+    assert cache.lookup("entry") == files
+    os.remove(files[1])
+    assert cache.lookup("entry") is None
+
+
+def test_eviction_drops_stale_then_least_recently_used_entries(tmp_path):
+    cache = ReportCache(str(tmp_path / "cache"), max_bytes=10_000, max_age=100)
+    for name in ("old", "used", "fresh"):
+        cache.store(name, [_render(cache, name + ".pdf", 1000)])
+    now = os.path.getmtime(cache.path("fresh.json"))
+    os.utime(cache.path("old.json"), (now - 200, now - 200))
+    os.utime(cache.path("used.json"), (now - 50, now - 50))
+    _render(cache, "orphan.pdf")
+    os.utime(cache.path("orphan.pdf"), (now - 7200, now - 7200))
+
+    assert cache.evict(now) == 1
+    assert cache.lookup("old") is None and not os.path.exists(cache.path("old.pdf"))
+    assert not os.path.exists(cache.path("orphan.pdf"))
+
+    cache.max_bytes = 1500
+    assert cache.evict(now) == 1
+    assert cache.lookup("used") is None and cache.lookup("fresh") is not None
+
+
+def test_players_key_changes_only_when_the_players_table_does(players_engine):
+    key = players_report_key(10)
+    assert key is not None and key == players_report_key(10)
+    session = Session()
+    session.add(Player(name="ann", password="x"))
+    session.commit()
+    session.close()
+    changed = players_report_key(10)
+    assert changed != key and changed == players_report_key(10)
+    assert players_report_key(20) != changed
+
+
+def test_databases_without_change_counters_have_no_key(tmp_path):
+    from databaseLogic import Base
+    from storage import create_sqlite_engine
+
+    engine = create_sqlite_engine(str(tmp_path / "plain.db"))
+    Base.metadata.create_all(engine)
+    assert players_report_key(10, bind=engine) is None
+    engine.dispose()
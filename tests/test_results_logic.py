@@ -0,0 +1,76 @@
+import time
+
+from sqlalchemy import func, select
+
+from databaseLogic import Game, Player, Session
+from dbWorker import DatabaseWorker
+from resultsLogic import GameResult, ResultWriter, write_game_results
+
+
+def _add_player(name):
+    session = Session()
+    player = Player(name=name, password="x", games_played=0, wins=0, losses=0)
+    session.add(player)
+    session.commit()
+    player_id = player.id
+    session.close()
+    return player_id
+
+
+def _counters(player_id):
+    with Session.engine.connect() as conn:
+        return tuple(conn.execute(select(Player.games_played, Player.wins, Player.losses)
+                                  .where(Player.id == player_id)).one())
+
+
+def test_results_resolve_names_and_count_wins(players_engine):
+    ann, bob = _add_player("ann"), _add_player("bob")
+    write_game_results([GameResult({"ann": 3, "bob": 1}, "Easy", "To mistake"),
+                        GameResult({"ann": 0, "bob": 0}, "Easy", "To mistake", {"ann": ann, "bob": bob})])
+
+    assert _counters(ann) == (2, 1, 1)
+    assert _counters(bob) == (2, 0, 2)
+    with players_engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(Game)).scalar() == 4
+        assert conn.execute(select(func.count(Game.match_id.distinct()))).scalar() == 2
+
+
+def test_anonymous_results_leave_registered_players_alone(players_engine):
+    ann = _add_player("ann")
+    write_game_results([GameResult({"ann": 5, "guest": 1}, "Hard", "Timed", anonymous=True)])
+
+    assert _counters(ann) == (0, 0, 0)
+    with players_engine.connect() as conn:
+        rows = conn.execute(select(Game.player_id, Game.score).order_by(Game.score)).all()
+    assert rows == [(None, 1), (None, 5)]
+
+
+def test_server_saves_anonymous_results():
+    from gameServer import GameServer
+
+    class Writer:
+        def __init__(self):
+            self.results = []
+
+        def submit(self, result):
+            from concurrent.futures import Future
+            self.results.append(result)
+            future = Future()
+            future.set_result(1)
+            return future
+
+    writer = Writer()
+    GameServer(result_writer=writer).save_results({"ann": 2}, "Easy", "To mistake")
+    assert [result.anonymous for result in writer.results] == [True]
+
+
+def test_closing_the_writer_commits_results_queued_behind_other_jobs(players_engine):
+    worker = DatabaseWorker()
+    worker.submit(time.sleep, 0.3)
+    writer = ResultWriter(worker)
+    writer.submit(GameResult({"ann": 2}, "Easy", "To mistake", anonymous=True))
+    writer.close()
+
+    assert worker._thread is None
+    with players_engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(Game)).scalar() == 1
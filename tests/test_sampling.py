@@ -0,0 +1,87 @@
+from collections import namedtuple
+
+import pytest
+
+from samplingLogic import SEEN_REDRAWS_PER_QUESTION, QuestionPoolCache
+from seenQuestions import SeenFilter, unseen_by_all
+
+Question = namedtuple("Question", ["id"])
+
+
+def _cache(size):
+    questions = [Question(i) for i in range(size)]
+    return QuestionPoolCache(lambda language, difficulty: questions)
+
+
+def test_sample_is_distinct_and_reproducible():
+    cache = _cache(100)
+    draw = cache.sample("en", "Easy", 10, seed=7)
+    assert len({question.id for question in draw}) == 10
+    assert cache.sample("en", "Easy", 10, seed=7) == draw
+    assert len(cache.sample("en", "Easy", 500)) == 100
+
+
+def test_pools_are_reloaded_after_bump_version():
+    loads = []
+    cache = QuestionPoolCache(lambda language, difficulty: loads.append(language) or [Question(1)])
+    cache.pool("en", "Easy")
+    cache.pool("en", "Easy")
+    cache.bump_version()
+    cache.pool("en", "Easy")
+    assert loads == ["en", "en"]
+
+
+def test_excluded_questions_are_avoided_while_others_are_left():
+    cache = _cache(1000)
+    seen = set(range(0, 1000, 2))
+    draw = cache.sample("en", "Easy", 10, seed=1, exclude=lambda question: question.id in seen)
+    assert len(draw) == 10
+    assert not seen & {question.id for question in draw}
+
+
+@pytest.mark.parametrize("size", [10, 200, 100_000])
+def test_a_fully_seen_bucket_costs_a_bounded_number_of_checks(size):
+    cache = _cache(size)
+    checks = []
+
+    def exclude(question):
+        checks.append(question.id)
+        return True
+
+    draw = cache.sample("en", "Easy", 10, seed=3, exclude=exclude)
+    assert len({question.id for question in draw}) == min(10, size)
+    assert len(checks) <= (1 + SEEN_REDRAWS_PER_QUESTION) * 10
+
+
+def test_seen_filter_has_no_false_negatives_and_few_false_positives():
+    seen = SeenFilter(capacity=500)
+    seen.update(range(500))
+    assert all(question_id in seen for question_id in range(500))
+    false_positives = sum(question_id in seen for question_id in range(10_000, 30_000))
+    assert false_positives / 20_000 < 0.03
+
+
+def test_seen_filter_forgets_the_oldest_generation():
+    seen = SeenFilter(capacity=100)
+    seen.update(range(100))
+    seen.update(range(100, 201))
+    assert seen.previous is not None and 150 in seen and 200 in seen
+    seen.update(range(300, 400))
+    assert sum(question_id in seen for question_id in range(100)) < 10
+
+
+def test_seen_filter_round_trips_through_bytes():
+    seen = SeenFilter(capacity=50)
+    seen.update(range(80))
+    restored = SeenFilter.from_bytes(seen.to_bytes())
+    assert restored.to_bytes() == seen.to_bytes()
+    assert all(question_id in restored for question_id in range(50, 80))
+
+
+def test_unseen_by_all_rejects_questions_any_player_has_seen():
+    ann, bob = SeenFilter(), SeenFilter()
+    ann.add(1)
+    bob.add(2)
+    exclude = unseen_by_all([ann, bob])
+    assert exclude(Question(1)) and exclude(Question(2))
+    assert not exclude(Question(3)) and not exclude(Question(None))
@@ -0,0 +1,62 @@
+from sqlalchemy import text
+
+from storage import (DEFAULT_PRAGMAS, LEGACY_PRAGMAS, LazySessionFactory, WORDS_SCHEMA, connection_pragmas,
+                     create_combined_engine, create_sqlite_engine)
+
+
+def test_every_pooled_connection_gets_the_storage_pragmas(tmp_path):
+    engine = create_sqlite_engine(str(tmp_path / "tuned.db"))
+    with engine.connect() as first, engine.connect() as second:
+        for conn in (first, second):
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == DEFAULT_PRAGMAS["cache_size"]
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == DEFAULT_PRAGMAS["busy_timeout"]
+    engine.dispose()
+
+
+def test_legacy_pragmas_keep_sqlites_defaults(tmp_path):
+    engine = create_sqlite_engine(str(tmp_path / "legacy.db"), pragmas=LEGACY_PRAGMAS)
+    pragmas = connection_pragmas(engine)
+    assert pragmas["journal_mode"] == "delete"
+    assert pragmas["synchronous"] == 2
+    engine.dispose()
+
+
+def test_combined_engine_joins_tables_of_both_files(tmp_path):
+    words = create_sqlite_engine(str(tmp_path / "words.db"))
+    with words.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE clues (id INTEGER PRIMARY KEY, answer TEXT)")
+        conn.exec_driver_sql("INSERT INTO clues VALUES (1, 'castle')")
+    words.dispose()
+
+    engine = create_combined_engine(str(tmp_path / "players.db"), str(tmp_path / "words.db"))
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE picks (clue_id INTEGER)")
+        conn.exec_driver_sql("INSERT INTO picks VALUES (1)")
+        answer = conn.execute(text(f"SELECT answer FROM picks JOIN {WORDS_SCHEMA}.clues ON clues.id = clue_id"))
+        assert answer.scalar() == "castle"
+        assert conn.exec_driver_sql(f"PRAGMA {WORDS_SCHEMA}.journal_mode").scalar() == "wal"
+    engine.dispose()
+
+
+def test_lazy_factory_builds_its_engine_once_on_first_use(tmp_path):
+    made = []
+
+    def make_engine():
+        made.append(create_sqlite_engine(str(tmp_path / "lazy.db")))
+        return made[-1]
+
+    factory = LazySessionFactory(make_engine)
+    assert made == []
+    session = factory()
+    assert session.execute(text("SELECT 1")).scalar() == 1
+    session.close()
+    assert factory.engine is made[0] and len(made) == 1
+
+    other = create_sqlite_engine(str(tmp_path / "other.db"))
+    factory.use_engine(other)
+    session = factory()
+    assert session.get_bind() is other
+    session.close()
+    for engine in made + [other]:
+        engine.dispose()
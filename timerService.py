@@ -0,0 +1,184 @@
+"""
+Deadline-driven countdown timers sharing one scheduler.
+
+A GameTimer stores the time left at the moment it was (re)started and derives everything else
+from time.monotonic(), so a late wakeup never loses or adds time and pausing freezes the exact
+fractional remainder. TimerService keeps the timers' next deadlines in a heap and only asks the
+event loop (Tk `after` or asyncio `call_later`) for the earliest one.
+"""
+import heapq
+import itertools
+import math
+import time
+
+EPSILON = 1e-6
+
+
+class GameTimer:
+    """A pausable countdown owned by a TimerService; create it with TimerService.start."""
+    def __init__(self, service, duration, on_tick, on_expire, interval):
+        self._service = service
+        self._left_at_start = float(duration)
+        self._started_at = service.clock()
+        self._on_tick = on_tick
+        self._on_expire = on_expire
+        self.interval = interval
+        self.finished = False
+        self._entry = None
+        self._reported = self.seconds_left()
+
+    @property
+    def paused(self):
+        return self._started_at is None and not self.finished
+
+    def remaining(self):
+        """Returns the time left in seconds, as a float."""
+        if self._started_at is None:
+            return self._left_at_start
+        return max(0.0, self._left_at_start - (self._service.clock() - self._started_at))
+
+    def seconds_left(self):
+        """Returns the time left rounded up to whole ticks, as shown to players."""
+        return int(math.ceil(self.remaining() / self.interval - EPSILON) * self.interval)
+
+    def pause(self):
+        """Freezes the countdown; the exact remainder is kept for `resume`."""
+        if self._started_at is None or self.finished:
+            return
+        self._left_at_start = self.remaining()
+        self._started_at = None
+        self._service._unschedule(self)
+
+    def resume(self):
+        """Continues a paused countdown."""
+        if self._started_at is not None or self.finished:
+            return
+        self._started_at = self._service.clock()
+        self._service._schedule(self)
+
+    def cancel(self):
+        """Stops the timer without calling `on_expire`."""
+        if not self.finished:
+            self._left_at_start = self.remaining()
+            self._started_at = None
+            self.finished = True
+            self._service._unschedule(self)
+
+    def _next_deadline(self):
+        """Monotonic time at which the shown seconds next change, or the timer expires."""
+        left = self.remaining()
+        boundary = max(0.0, (math.ceil(left / self.interval - EPSILON) - 1) * self.interval)
+        return self._service.clock() + max(EPSILON, left - boundary)
+
+    def _fire(self):
+        shown = self.seconds_left()
+        if shown != self._reported:
+            self._reported = shown
+            if self._on_tick:
+                self._on_tick(shown)
+        if self._started_at is None:
+            return
+        if self.remaining() <= EPSILON:
+            self.finished = True
+            self._left_at_start = 0.0
+            self._started_at = None
+            if self._on_expire:
+                self._on_expire()
+        else:
+            self._service._schedule(self)
+
+
+class TimerService:
+    """
+    Runs any number of GameTimers from a single wakeup.
+
+    `call_later(delay_seconds, fn)` must schedule fn on the owning event loop and return a handle
+    that `cancel_call(handle)` accepts; see `for_tk` and `for_asyncio`.
+    """
+    def __init__(self, call_later, cancel_call, clock=time.monotonic):
+        self.clock = clock
+        self._call_later = call_later
+        self._cancel_call = cancel_call
+        self._heap = []
+        self._counter = itertools.count()
+        self._wakeup = None
+        self._wakeup_at = None
+        self.wakeups = 0
+
+    @classmethod
+    def for_tk(cls, widget):
+        """Returns the shared service of a Tk application, creating it on first use."""
+        root = widget.nametowidget('.')
+        service = getattr(root, '_timer_service', None)
+        if service is None:
+            service = root._timer_service = cls(
+                lambda delay, fn: root.after(max(0, math.ceil(delay * 1000)), fn), root.after_cancel)
+        return service
+
+    @classmethod
+    def for_asyncio(cls, loop):
+        """Returns a service scheduling its wakeups on an asyncio event loop."""
+        return cls(loop.call_later, lambda handle: handle.cancel(), clock=loop.time)
+
+    def start(self, duration, on_tick=None, on_expire=None, interval=1):
+        """
+        Starts a countdown.
+
+        Args:
+            duration (float): Seconds to count down from.
+            on_tick (callable, optional): Called with the whole seconds left each time they change;
+                after a stall it is called once with the current value, not once per missed second.
+            on_expire (callable, optional): Called once when the countdown reaches zero.
+            interval (float): Granularity of `on_tick`, in seconds.
+        Returns:
+            GameTimer: The running timer.
+        """
+        timer = GameTimer(self, duration, on_tick, on_expire, interval)
+        self._schedule(timer)
+        return timer
+
+    @property
+    def active(self):
+        """Number of running (not paused or finished) timers."""
+        return sum(1 for entry in self._heap if entry[2]._entry is entry)
+
+    def _schedule(self, timer):
+        entry = [timer._next_deadline(), next(self._counter), timer]
+        timer._entry = entry
+        heapq.heappush(self._heap, entry)
+        self._arm()
+
+    def _unschedule(self, timer):
+        timer._entry = None
+        self._arm()
+
+    def _arm(self):
+        """Makes sure exactly one wakeup is pending, at the earliest live deadline."""
+        heap = self._heap
+        while heap and heap[0][2]._entry is not heap[0]:
+            heapq.heappop(heap)
+        if not heap:
+            if self._wakeup is not None:
+                self._cancel_call(self._wakeup)
+                self._wakeup = self._wakeup_at = None
+            return
+        deadline = heap[0][0]
+        if self._wakeup is not None:
+            if self._wakeup_at <= deadline:
+                return
+            self._cancel_call(self._wakeup)
+        self._wakeup_at = deadline
+        self._wakeup = self._call_later(max(0.0, deadline - self.clock()), self._run)
+
+    def _run(self):
+        self._wakeup = self._wakeup_at = None
+        self.wakeups += 1
+        now = self.clock()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            timer = entry[2]
+            if timer._entry is entry:
+                timer._entry = None
+                timer._fire()
+        self._arm()